@@ -9,19 +9,21 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 
 from utils.calculations import format_currency, format_percentage, format_multiple
+from utils.data_store import load_datasets
+from utils.timing import start_page, section, diagnostics_panel
+from utils.profiling import start_profile, profile_panel
 
 st.set_page_config(page_title="Dashboard Overview", page_icon="📊", layout="wide")
+start_page("Overview")
+start_profile("Overview")
 
 # Load data
-@st.cache_data
-def load_data():
-    data_path = Path(__file__).parent.parent / "data"
-    roi_summary = pd.read_csv(data_path / "investor_roi_summary.csv")
-    financials = pd.read_csv(data_path / "financial_projections_2015_2030.csv")
-    operational = pd.read_csv(data_path / "operational_metrics.csv")
-    return roi_summary, financials, operational
-
-roi_summary, financials, operational = load_data()
+with section("data load"):
+    roi_summary, financials, operational = load_datasets(
+        'investor_roi_summary',
+        'financial_projections_2015_2030',
+        'operational_metrics'
+    )
 
 # Header
 st.title("📊 Dashboard Overview")
@@ -142,43 +144,44 @@ st.header("🎯 Why Invest Now vs Waiting for Series C?")
 
 series_c = roi_summary[roi_summary['Round'] == 'Series C'].iloc[0]
 
-comparison_metrics = pd.DataFrame({
-    'Metric': [
-        'Investment Timing',
-        'Entry Valuation',
-        'Minimum Check Size',
-        'Ownership % (for $8M)',
-        'MOIC at IPO',
-        'IRR',
-        'Holding Period',
-        'Early Exit Option',
-        'Entry Price Advantage'
-    ],
-    'Series B (Now)': [
-        '2026',
-        format_currency(series_b['Entry_Valuation']),
-        format_currency(500000),
-        f"{(8000000/33000000)*100:.2f}%",
-        format_multiple(series_b['MOIC']),
-        format_percentage(series_b['IRR_%']),
-        '4 years to IPO',
-        'Yes - 2.42x in 2 years',
-        '67% lower valuation'
-    ],
-    'Series C (Later)': [
-        '2028',
-        format_currency(series_c['Entry_Valuation']),
-        format_currency(1000000),
-        f"{(8000000/100000000)*100:.2f}%",
-        format_multiple(series_c['MOIC']),
-        format_percentage(series_c['IRR_%']),
-        '2 years to IPO',
-        'No - must hold to IPO',
-        'Baseline'
-    ]
-})
-
-st.dataframe(comparison_metrics, use_container_width=True, hide_index=True)
+with section("comparison table"):
+    comparison_metrics = pd.DataFrame({
+        'Metric': [
+            'Investment Timing',
+            'Entry Valuation',
+            'Minimum Check Size',
+            'Ownership % (for $8M)',
+            'MOIC at IPO',
+            'IRR',
+            'Holding Period',
+            'Early Exit Option',
+            'Entry Price Advantage'
+        ],
+        'Series B (Now)': [
+            '2026',
+            format_currency(series_b['Entry_Valuation']),
+            format_currency(500000),
+            f"{(8000000/33000000)*100:.2f}%",
+            format_multiple(series_b['MOIC']),
+            format_percentage(series_b['IRR_%']),
+            '4 years to IPO',
+            'Yes - 2.42x in 2 years',
+            '67% lower valuation'
+        ],
+        'Series C (Later)': [
+            '2028',
+            format_currency(series_c['Entry_Valuation']),
+            format_currency(1000000),
+            f"{(8000000/100000000)*100:.2f}%",
+            format_multiple(series_c['MOIC']),
+            format_percentage(series_c['IRR_%']),
+            '2 years to IPO',
+            'No - must hold to IPO',
+            'Baseline'
+        ]
+    })
+
+    st.dataframe(comparison_metrics, use_container_width=True, hide_index=True)
 
 st.success(f"""
 **Bottom Line:** Investing in Series B delivers **{series_b['MOIC']:.2f}x returns** compared to 
@@ -341,3 +344,6 @@ This dashboard contains forward-looking statements that are subject to risks and
 Actual results may differ materially. For complete disclaimers, see the Private Placement Memorandum.  
 AI Datacenter Vancouver | Confidential Investor Materials | 2025
 """)
+
+profile_panel()
+diagnostics_panel()
@@ -8,21 +8,53 @@ from pathlib import Path
 
 sys.path.append(str(Path(__file__).parent.parent))
 
-from utils.calculations import format_currency, format_percentage, format_multiple
-from utils.visualizations import create_roi_comparison_chart, create_irr_comparison_chart
+from utils.calculations import format_currency, format_percentage, format_multiple, calculate_exit_year_returns
+from utils.visualizations import (
+    create_roi_comparison_chart,
+    create_irr_comparison_chart,
+    create_exit_year_chart,
+    create_follow_on_chart
+)
+from utils.cap_table import CapTable
+from utils.follow_on import enumerate_follow_ons
+from utils.waterfall import Waterfall
+from utils.data_store import load_datasets
+from utils.xirr import xirr_batch, pad_cash_flows, quarter_midpoint, STATUS_LABELS
+from utils.tables import format_table
+from utils.timing import start_page, section, diagnostics_panel
+from utils.profiling import start_profile, profile_panel
 
 st.set_page_config(page_title="ROI Analysis", page_icon="💰", layout="wide")
+start_page("ROI Analysis")
+start_profile("ROI Analysis")
 
 # Load data
-@st.cache_data
-def load_data():
-    data_path = Path(__file__).parent.parent / "data"
-    roi_summary = pd.read_csv(data_path / "investor_roi_summary.csv")
-    series_b_scenarios = pd.read_csv(data_path / "series_b_exit_scenarios.csv")
-    series_c_scenarios = pd.read_csv(data_path / "series_c_exit_scenarios.csv")
-    return roi_summary, series_b_scenarios, series_c_scenarios
-
-roi_summary, series_b_scenarios, series_c_scenarios = load_data()
+with section("data load"):
+    roi_summary, funding_rounds, financials = load_datasets(
+        'investor_roi_summary',
+        'funding_rounds_overview',
+        'financial_projections_2015_2030'
+    )
+
+# Returns for every round and every exit year on the valuation curve, at each round's check size
+with section("exit year returns"):
+    cap_table = CapTable.from_funding_rounds(funding_rounds)
+    exit_returns = calculate_exit_year_returns(
+        roi_summary['Investment_Amount'].to_numpy(),
+        financials['Year'].to_numpy(),
+        financials['Company_Valuation'].to_numpy(),
+        rounds=roi_summary['Round'].tolist(),
+        cap_table=cap_table
+    )
+    # Each round is evaluated at its own check size (the diagonal of rounds x amounts)
+    exit_position = dict(zip(roi_summary['Round'], range(len(roi_summary))))
+
+# Dated entry and IPO exit for each round, used for XIRR
+round_dates = {
+    round_key.replace('_', ' '): quarter_midpoint(date)
+    for round_key, date in zip(funding_rounds['Round'], funding_rounds['Date'])
+}
+ipo_date = round_dates['IPO']
 
 # Header
 st.title("💰 Investor ROI Analysis")
@@ -48,10 +80,12 @@ if selected_round == 'All Rounds':
     col1, col2 = st.columns(2)
 
     with col1:
-        st.plotly_chart(create_roi_comparison_chart(display_roi), use_container_width=True)
+        with section("chart: ROI comparison"):
+            st.plotly_chart(create_roi_comparison_chart(display_roi), use_container_width=True)
 
     with col2:
-        st.plotly_chart(create_irr_comparison_chart(display_roi), use_container_width=True)
+        with section("chart: IRR comparison"):
+            st.plotly_chart(create_irr_comparison_chart(display_roi), use_container_width=True)
 
     # Data table
     st.subheader("Detailed Returns Data")
@@ -61,13 +95,43 @@ if selected_round == 'All Rounds':
         'Entry_Valuation', 'MOIC', 'IRR_%', 'Holding_Period_Years'
     ]].copy()
 
+    # Dated IRR from the round's closing quarter to the IPO quarter
+    with section("XIRR: all rounds"):
+        amounts, dates = pad_cash_flows([
+            [(round_dates[row['Round']], -row['Investment_Amount']), (ipo_date, row['Exit_Value_at_IPO'])]
+            for _, row in display_roi.iterrows()
+        ])
+        display_df.insert(display_df.columns.get_loc('IRR_%') + 1, 'XIRR_%', xirr_batch(amounts, dates)['irr'])
+
     # Format columns
-    display_df['Investment_Amount'] = display_df['Investment_Amount'].apply(lambda x: format_currency(x))
-    display_df['Entry_Valuation'] = display_df['Entry_Valuation'].apply(lambda x: format_currency(x))
-    display_df['MOIC'] = display_df['MOIC'].apply(lambda x: format_multiple(x))
-    display_df['IRR_%'] = display_df['IRR_%'].apply(lambda x: f"{x:.1f}%")
+    with section("returns table"):
+        display_df, column_config = format_table(display_df, {
+            'Investment_Amount': 'currency',
+            'Entry_Valuation': 'currency',
+            'MOIC': 'multiple',
+            'IRR_%': 'percentage',
+            'XIRR_%': 'percentage'
+        })
 
-    st.dataframe(display_df, use_container_width=True, hide_index=True)
+        st.dataframe(display_df, column_config=column_config, use_container_width=True, hide_index=True)
+
+    st.subheader("Optimal Exit Year by Round")
+
+    with section("exit year table"):
+        positions = [exit_position[name] for name in display_roi['Round']]
+        exit_df = pd.DataFrame({
+            'Round': display_roi['Round'],
+            'Best IRR Exit': pd.array(exit_returns['best_irr_year'][positions, positions], dtype='Int64'),
+            'Best IRR': exit_returns['best_irr'][positions, positions],
+            'Best MOIC Exit': pd.array(exit_returns['best_moic_year'][positions, positions], dtype='Int64'),
+            'Best MOIC': exit_returns['best_moic'][positions, positions]
+        }).dropna(subset=['Best IRR Exit'])  # Rounds after every year of the valuation curve have no exit
+        exit_df, column_config = format_table(exit_df, {
+            'Best IRR': 'percentage',
+            'Best MOIC': 'multiple'
+        })
+
+        st.dataframe(exit_df, column_config=column_config, use_container_width=True, hide_index=True)
 
 # Individual round analysis
 else:
@@ -133,39 +197,199 @@ else:
         - **Holding Period:** {round_data['Holding_Period_Years']} years
         """)
 
-    # Series B specific: show exit scenarios
-    if selected_round == 'Series B':
-        st.markdown("---")
-        st.subheader("🎯 Multiple Exit Scenarios for Series B")
+    # Dated cash flows: follow-on checks, partial sales, fractional holding periods
+    st.markdown("---")
+    st.subheader("📅 Dated Cash Flow Returns (XIRR)")
+
+    st.markdown("""
+    Add follow-on investments (negative amounts) or partial secondary sales (positive amounts)
+    to see the annualized return on the actual dates money moves.
+    """)
+
+    default_flows = pd.DataFrame({
+        'Date': [round_dates[selected_round], ipo_date],
+        'Amount': [-float(round_data['Investment_Amount']), float(round_data['Exit_Value_at_IPO'])],
+        'Description': [f"{selected_round} investment", 'IPO exit']
+    })
+
+    cash_flows = st.data_editor(
+        default_flows,
+        num_rows="dynamic",
+        use_container_width=True,
+        hide_index=True,
+        key=f"cash_flows_{selected_round}",
+        column_config={
+            'Date': st.column_config.DateColumn("Date", required=True),
+            'Amount': st.column_config.NumberColumn("Amount ($)", format="%.0f", required=True)
+        }
+    ).dropna(subset=['Date', 'Amount'])
+
+    if cash_flows.empty:
+        st.info("Add at least one dated cash flow to compute XIRR")
+    else:
+        with section("XIRR: cash flows"):
+            amounts, dates = pad_cash_flows([list(zip(cash_flows['Date'], cash_flows['Amount']))])
+            result = xirr_batch(amounts, dates)
+
+        invested = -cash_flows.loc[cash_flows['Amount'] < 0, 'Amount'].sum()
+        returned = cash_flows.loc[cash_flows['Amount'] > 0, 'Amount'].sum()
+
+        col1, col2, col3 = st.columns(3)
 
-        st.info("""
-        Series B investors have the flexibility to exit at Series C (2028) or hold until IPO (2030).
-        This optionality provides downside protection with early exit while maintaining upside potential.
-        """)
+        with col1:
+            st.metric(
+                "XIRR",
+                format_percentage(result['irr'][0]) if result['converged'][0] else "n/a",
+                delta=STATUS_LABELS[result['status'][0]],
+                delta_color="off"
+            )
 
-        col1, col2 = st.columns(2)
+        with col2:
+            st.metric("Capital Deployed", format_currency(invested))
 
-        with col1:
-            st.markdown("### Option 1: Early Exit at Series C")
-            early_exit = series_b_scenarios[series_b_scenarios['Exit_Scenario'].str.contains('Early')].iloc[0]
+        with col3:
+            st.metric(
+                "Cash-on-Cash Multiple",
+                format_multiple(returned / invested) if invested > 0 else "n/a"
+            )
 
-            st.metric("Holding Period", f"{early_exit['Holding_Period']} years")
-            st.metric("MOIC", format_multiple(early_exit['MOIC']))
-            st.metric("IRR", format_percentage(early_exit['IRR_%']))
-            st.metric("Exit Value", format_currency(early_exit['Exit_Value']))
+    # Pro-rata rights in the rounds between entry and the IPO
+    st.markdown("---")
+    st.subheader("🔁 Pro-Rata Follow-On Strategies")
+
+    st.markdown("""
+    Existing investors may buy into later rounds in proportion to their stake. Every combination of
+    no, partial or full participation in each later round is evaluated, with XIRR on the round dates
+    and an IPO exit. Each check is paid its slice of its round's class in the liquidation preference
+    waterfall.
+    """)
+
+    partial = st.slider("Partial Participation (% of pro-rata allocation)", 10, 90, 50, 10)
+
+    with section("follow-on strategies"):
+        strategies = enumerate_follow_ons(
+            cap_table,
+            selected_round,
+            float(round_data['Investment_Amount']),
+            {name.replace(' ', '_'): date for name, date in round_dates.items()},
+            exit_valuation=float(funding_rounds.loc[funding_rounds['Round'] == 'IPO', 'Post_Money_Valuation'].iloc[0]),
+            levels=(0.0, partial / 100, 1.0),
+            waterfall=Waterfall.from_funding_rounds(funding_rounds, cap_table)
+        )
 
-            st.success("✅ Lower risk: Earlier exit, less dilution, quick liquidity")
+    if not strategies['rounds']:
+        st.info(f"No private rounds follow {selected_round} before the IPO, so there are no pro-rata rights to exercise.")
+    else:
+        level_names = {0.0: 'None', partial / 100: f"Partial ({partial}%)", 1.0: 'Full'}
+        follow_on_rounds = [name.replace('_', ' ') for name in strategies['rounds']]
+        labels = [
+            ", ".join(f"{name}: {level_names[level]}" for name, level in zip(follow_on_rounds, row))
+            for row in strategies['participation']
+        ]
+        best = strategies['best']
+
+        col1, col2, col3, col4 = st.columns(4)
+
+        with col1:
+            st.metric(
+                "Best XIRR",
+                format_percentage(strategies['irr'][best]),
+                delta=f"{strategies['irr'][best] - strategies['irr'][0]:+.1f}pp vs no follow-on"
+            )
 
         with col2:
-            st.markdown("### Option 2: Hold to IPO")
-            ipo_exit = series_b_scenarios[series_b_scenarios['Exit_Scenario'].str.contains('IPO')].iloc[0]
+            st.metric(
+                "Capital Deployed",
+                format_currency(strategies['deployed'][best]),
+                delta=format_currency(strategies['deployed'][best] - strategies['deployed'][0]) + " in follow-ons",
+                delta_color="off"
+            )
+
+        with col3:
+            st.metric(
+                "Ownership at IPO",
+                f"{strategies['ownership'][best]:.2f}%",
+                delta=f"{strategies['ownership'][best] - strategies['ownership'][0]:+.2f}pp",
+                delta_color="off"
+            )
+
+        with col4:
+            st.metric("MOIC", format_multiple(strategies['moic'][best]), delta=format_currency(strategies['exit_value'][best]) + " at exit", delta_color="off")
+
+        st.success(f"**Best-XIRR strategy:** {labels[best]}")
+
+        with section("chart: follow-on strategies"):
+            st.plotly_chart(create_follow_on_chart(
+                strategies['deployed'], strategies['irr'], strategies['moic'], labels, best
+            ), use_container_width=True)
+
+        with st.expander(f"All {len(labels)} Strategies"):
+            strategy_df = pd.DataFrame({
+                **{name: [level_names[level] for level in column]
+                   for name, column in zip(follow_on_rounds, strategies['participation'].T)},
+                'Deployed': strategies['deployed'],
+                'Ownership_at_IPO_%': strategies['ownership'],
+                'Exit_Value': strategies['exit_value'],
+                'MOIC': strategies['moic'],
+                'XIRR_%': strategies['irr']
+            }).sort_values('XIRR_%', ascending=False)
+            strategy_df, column_config = format_table(strategy_df, {
+                'Deployed': 'currency',
+                'Ownership_at_IPO_%': ('percentage', 2),
+                'Exit_Value': 'currency',
+                'MOIC': 'multiple',
+                'XIRR_%': 'percentage'
+            })
+            st.dataframe(strategy_df, column_config=column_config, use_container_width=True, hide_index=True)
+
+    # Returns for every exit year on the valuation curve
+    st.markdown("---")
+    st.subheader("⏱️ Returns by Exit Year")
+
+    st.markdown("""
+    MOIC and IRR if the stake were sold in each year at that year's company valuation,
+    diluted by every round that has closed by then.
+    """)
+
+    i = exit_position[selected_round]
+    best_irr_year = exit_returns['best_irr_year'][i, i]
+    best_moic_year = exit_returns['best_moic_year'][i, i]
+
+    # A round after every year of the valuation curve has no exit to evaluate
+    if pd.isna(best_irr_year):
+        st.info(f"The valuation curve has no exit year after {selected_round}")
+    else:
+        with section("chart: exit years"):
+            st.plotly_chart(create_exit_year_chart(
+                exit_returns['exit_years'], exit_returns['moic'][i, i], exit_returns['irr'][i, i],
+                best_irr_year, best_moic_year, f"{selected_round} Returns by Exit Year"
+            ), use_container_width=True)
 
-            st.metric("Holding Period", f"{ipo_exit['Holding_Period']} years")
-            st.metric("MOIC", format_multiple(ipo_exit['MOIC']))
-            st.metric("IRR", format_percentage(ipo_exit['IRR_%']))
-            st.metric("Exit Value", format_currency(ipo_exit['Exit_Value']))
+        col1, col2 = st.columns(2)
 
-            st.success("✅ Higher returns: 2x more value, full upside capture")
+        with col1:
+            st.markdown(f"### Highest IRR: Exit in {best_irr_year:.0f}")
+            year = list(exit_returns['exit_years']).index(best_irr_year)
+            held = best_irr_year - round_data['Investment_Year']
+            st.metric("Holding Period", f"{held:.0f} year{'s' if held != 1 else ''}")
+            st.metric("MOIC", format_multiple(exit_returns['moic'][i, i, year]))
+            st.metric("IRR", format_percentage(exit_returns['best_irr'][i, i]))
+            st.metric("Exit Value", format_currency(exit_returns['exit_value'][i, i, year]))
+
+        with col2:
+            st.markdown(f"### Highest MOIC: Exit in {best_moic_year:.0f}")
+            year = list(exit_returns['exit_years']).index(best_moic_year)
+            held = best_moic_year - round_data['Investment_Year']
+            st.metric("Holding Period", f"{held:.0f} year{'s' if held != 1 else ''}")
+            st.metric("MOIC", format_multiple(exit_returns['best_moic'][i, i]))
+            st.metric("IRR", format_percentage(exit_returns['irr'][i, i, year]))
+            st.metric("Exit Value", format_currency(exit_returns['exit_value'][i, i, year]))
+
+        if best_irr_year < best_moic_year:
+            st.info(f"""
+            Selling in {best_irr_year:.0f} returns capital fastest; holding to {best_moic_year:.0f}
+            captures the full multiple. The choice trades annualized return against total value.
+            """)
 
     # Series B vs Series C comparison
     if selected_round in ['Series B', 'Series C']:
@@ -175,37 +399,38 @@ else:
         series_b = roi_summary[roi_summary['Round'] == 'Series B'].iloc[0]
         series_c = roi_summary[roi_summary['Round'] == 'Series C'].iloc[0]
 
-        comparison_df = pd.DataFrame({
-            'Metric': [
-                'Investment Amount',
-                'Entry Valuation',
-                'Investment Year',
-                'MOIC at IPO',
-                'IRR',
-                'Holding Period',
-                'Entry Price Advantage'
-            ],
-            'Series B (2026)': [
-                format_currency(series_b['Investment_Amount']),
-                format_currency(series_b['Entry_Valuation']),
-                '2026',
-                format_multiple(series_b['MOIC']),
-                format_percentage(series_b['IRR_%']),
-                f"{series_b['Holding_Period_Years']} years",
-                '-67% vs Series C'
-            ],
-            'Series C (2028)': [
-                format_currency(series_c['Investment_Amount']),
-                format_currency(series_c['Entry_Valuation']),
-                '2028',
-                format_multiple(series_c['MOIC']),
-                format_percentage(series_c['IRR_%']),
-                f"{series_c['Holding_Period_Years']} years",
-                'Baseline'
-            ]
-        })
-
-        st.dataframe(comparison_df, use_container_width=True, hide_index=True)
+        with section("comparison table"):
+            comparison_df = pd.DataFrame({
+                'Metric': [
+                    'Investment Amount',
+                    'Entry Valuation',
+                    'Investment Year',
+                    'MOIC at IPO',
+                    'IRR',
+                    'Holding Period',
+                    'Entry Price Advantage'
+                ],
+                'Series B (2026)': [
+                    format_currency(series_b['Investment_Amount']),
+                    format_currency(series_b['Entry_Valuation']),
+                    '2026',
+                    format_multiple(series_b['MOIC']),
+                    format_percentage(series_b['IRR_%']),
+                    f"{series_b['Holding_Period_Years']} years",
+                    '-67% vs Series C'
+                ],
+                'Series C (2028)': [
+                    format_currency(series_c['Investment_Amount']),
+                    format_currency(series_c['Entry_Valuation']),
+                    '2028',
+                    format_multiple(series_c['MOIC']),
+                    format_percentage(series_c['IRR_%']),
+                    f"{series_c['Holding_Period_Years']} years",
+                    'Baseline'
+                ]
+            })
+
+            st.dataframe(comparison_df, use_container_width=True, hide_index=True)
 
         st.warning(f"""
         **Key Insight:** Series B investors achieve {series_b['MOIC']:.2f}x returns compared to 
@@ -216,3 +441,6 @@ else:
 # Footer
 st.markdown("---")
 st.caption("All projections based on IPO exit at $240M valuation in 2030")
+
+profile_panel({'round': selected_round, 'partial': partial if selected_round != 'All Rounds' else None})
+diagnostics_panel()
@@ -3,26 +3,38 @@ Financial Projections Page - Revenue, profitability, and growth forecasts
 """
 import streamlit as st
 import pandas as pd
+import numpy as np
 import sys
 from pathlib import Path
 
 sys.path.append(str(Path(__file__).parent.parent))
 
-from utils.calculations import format_currency, format_percentage
-from utils.visualizations import create_valuation_revenue_chart
+from utils.calculations import format_currency, format_percentage, format_multiple
+from utils.visualizations import create_valuation_revenue_chart, create_projection_fan_chart
+from utils.projections import (
+    baseline_drivers,
+    adjust_drivers,
+    project_financials,
+    projection_frame,
+    sample_assumptions
+)
+from utils.forecasting import forecast_revenue, growth_rate
+from utils.data_store import load_datasets
+from utils.tables import format_table
+from utils.timing import start_page, section, diagnostics_panel
+from utils.profiling import start_profile, profile_panel
 
 st.set_page_config(page_title="Financial Projections", page_icon="📈", layout="wide")
+start_page("Financial Projections")
+start_profile("Financial Projections")
 
 # Load data
-@st.cache_data
-def load_data():
-    data_path = Path(__file__).parent.parent / "data"
-    financials = pd.read_csv(data_path / "financial_projections_2015_2030.csv")
-    income_stmt = pd.read_csv(data_path / "income_statement.csv")
-    key_metrics = pd.read_csv(data_path / "key_metrics.csv")
-    return financials, income_stmt, key_metrics
-
-financials, income_stmt, key_metrics = load_data()
+with section("data load"):
+    planned_financials, income_stmt, key_metrics = load_datasets(
+        'financial_projections_2015_2030',
+        'income_statement',
+        'key_metrics'
+    )
 
 # Header
 st.title("📈 Financial Projections")
@@ -37,6 +49,32 @@ view_mode = st.sidebar.radio(
     options=['Historical & Projected', 'Historical Only', 'Projected Only']
 )
 
+# Projection drivers, relative to the plan in the projections dataset
+st.sidebar.header("Projection Assumptions")
+growth_shift = st.sidebar.slider("Revenue Growth Adjustment (pp per year)", -15.0, 15.0, 0.0, 0.5)
+margin_shift = st.sidebar.slider("Net Margin Adjustment (pp)", -10.0, 10.0, 0.0, 0.5)
+multiple_pct = st.sidebar.slider("Revenue Multiple (% of plan)", 50, 150, 100, 5)
+n_scenarios = st.sidebar.select_slider("Scenarios in Range", options=[100, 250, 500, 1000, 2500], value=500)
+
+# Projected years are derived from growth, margin and multiple drivers;
+# with no adjustments they reproduce the plan
+with section("projections"):
+    drivers = baseline_drivers(planned_financials)
+    projection = project_financials(
+        drivers['base_revenue'],
+        *adjust_drivers(drivers, growth_shift, margin_shift, multiple_pct / 100)
+    )
+    financials = pd.concat([
+        planned_financials[planned_financials['Status'] == 'Historical'],
+        projection_frame(drivers['years'], projection)
+    ], ignore_index=True)
+
+    # A batch of assumption sets around the selected one, projected in one pass
+    scenario_range = project_financials(
+        drivers['base_revenue'],
+        *adjust_drivers(drivers, *sample_assumptions(n_scenarios, growth_shift, margin_shift, multiple_pct / 100))
+    )
+
 # Filter data based on selection
 if view_mode == 'Historical Only':
     display_financials = financials[financials['Status'] == 'Historical']
@@ -53,13 +91,17 @@ col1, col2, col3, col4 = st.columns(4)
 latest_historical = financials[financials['Status'] == 'Historical'].iloc[-1]
 latest_projected = financials[financials['Status'] == 'Projected'].iloc[-1]
 
+# Compounding periods come from the data, not a fixed 2015-2024 / 2024-2030 span
+historical_years = latest_historical['Year'] - financials.iloc[0]['Year']
+projected_years = latest_projected['Year'] - latest_historical['Year']
+historical_cagr = growth_rate([financials.iloc[0]['Revenue'], latest_historical['Revenue']], historical_years)
+projected_cagr = growth_rate([latest_historical['Revenue'], latest_projected['Revenue']], projected_years)
+
 with col1:
     st.metric(
         "2024 Revenue",
         format_currency(latest_historical['Revenue']),
-        delta=format_percentage(
-            ((latest_historical['Revenue'] / financials.iloc[0]['Revenue']) ** (1/9) - 1) * 100
-        ) + " CAGR"
+        delta=format_percentage(historical_cagr) + " CAGR"
     )
 
 with col2:
@@ -80,14 +122,126 @@ with col4:
     st.metric(
         "2030 Valuation",
         format_currency(latest_projected['Company_Valuation']),
-        delta=format_multiple(latest_projected['Revenue_Multiple']) + " revenue multiple"
+        delta=format_multiple(latest_projected['Revenue_Multiple'], 1) + " revenue multiple"
     )
 
 # Valuation & Revenue Chart
 st.markdown("---")
 st.header("Valuation & Revenue Growth Trajectory")
 
-st.plotly_chart(create_valuation_revenue_chart(financials), use_container_width=True)
+with section("chart: valuation & revenue"):
+    st.plotly_chart(create_valuation_revenue_chart(financials), use_container_width=True)
+
+# Scenario Range
+st.markdown("---")
+st.header("Scenario Range")
+
+st.markdown(f"""
+{n_scenarios:,} assumption sets drawn around the selected ones: growth ±5pp per year,
+net margin ±3pp and revenue multiple ±25%.
+""")
+
+percentiles = [10, 25, 50, 75, 90]
+
+with section("scenario range"):
+    revenue_bands = dict(zip(percentiles, np.percentile(scenario_range['revenue'] / 1_000_000, percentiles, axis=0)))
+    valuation_bands = dict(zip(percentiles, np.percentile(scenario_range['valuation'] / 1_000_000, percentiles, axis=0)))
+
+col1, col2 = st.columns(2)
+
+with col1:
+    with section("chart: revenue range"):
+        st.plotly_chart(create_projection_fan_chart(
+            drivers['years'], revenue_bands, projection['revenue'] / 1_000_000,
+            "Projected Revenue Range", "Revenue ($M CAD)"
+        ), use_container_width=True)
+
+with col2:
+    with section("chart: valuation range"):
+        st.plotly_chart(create_projection_fan_chart(
+            drivers['years'], valuation_bands, projection['valuation'] / 1_000_000,
+            "Projected Valuation Range", "Valuation ($M CAD)"
+        ), use_container_width=True)
+
+col1, col2, col3 = st.columns(3)
+
+with col1:
+    st.metric("2030 Valuation (P10)", format_currency(valuation_bands[10][-1] * 1_000_000))
+
+with col2:
+    st.metric("2030 Valuation (Median)", format_currency(valuation_bands[50][-1] * 1_000_000))
+
+with col3:
+    st.metric("2030 Valuation (P90)", format_currency(valuation_bands[90][-1] * 1_000_000))
+
+# Revenue Forecast
+st.markdown("---")
+st.header("Revenue Forecast")
+
+st.markdown("""
+Statistical forecasts fitted to the historical revenue alone, as a check on the plan: constant growth
+(log-linear), growth fading each year (damped trend) and growth saturating at a market size (logistic).
+Best Fit picks the model with the lowest AICc. Bands are approximate 80% and 95% prediction intervals.
+""")
+
+MODEL_LABELS = {'Log-Linear': 'log_linear', 'Damped Trend': 'damped_trend', 'Logistic': 'logistic'}
+
+forecast_choice = st.radio(
+    "Forecast Model:",
+    options=['Best Fit', *MODEL_LABELS],
+    horizontal=True
+)
+
+with section("revenue forecast"):
+    history = planned_financials[planned_financials['Status'] == 'Historical']
+    fits = forecast_revenue(history['Revenue'].to_numpy(dtype=float), len(drivers['years']), (80, 95))
+    model = fits['best'][0] if forecast_choice == 'Best Fit' else MODEL_LABELS[forecast_choice]
+    forecast = fits[model]
+
+    forecast_bands = {
+        2.5: forecast['lower'][95][0], 10: forecast['lower'][80][0], 50: forecast['mean'][0],
+        90: forecast['upper'][80][0], 97.5: forecast['upper'][95][0]
+    }
+    forecast_bands = {level: values / 1_000_000 for level, values in forecast_bands.items()}
+
+col1, col2 = st.columns([2, 1])
+
+with col1:
+    with section("chart: revenue forecast"):
+        st.plotly_chart(create_projection_fan_chart(
+            drivers['years'], forecast_bands, projection['revenue'] / 1_000_000,
+            f"Revenue Forecast ({forecast_choice})", "Revenue ($M CAD)",
+            selected_name="Plan (Selected Assumptions)",
+            history=(history['Year'], history['Revenue'] / 1_000_000)
+        ), use_container_width=True)
+
+with col2:
+    model_names = {value: label for label, value in MODEL_LABELS.items()}
+    st.metric(
+        f"{latest_projected['Year']:.0f} Revenue ({model_names[model]})",
+        format_currency(forecast['mean'][0][-1]),
+        delta=format_currency(forecast['mean'][0][-1] - latest_projected['Revenue']) + " vs plan"
+    )
+    st.metric(
+        "95% Interval",
+        f"{format_currency(forecast['lower'][95][0][-1])} – {format_currency(forecast['upper'][95][0][-1])}"
+    )
+
+    comparison = pd.DataFrame({
+        'Model': list(MODEL_LABELS),
+        'AICc': [round(fits[name]['aicc'][0], 1) for name in MODEL_LABELS.values()],
+        f"{latest_projected['Year']:.0f} Revenue": [fits[name]['mean'][0][-1] for name in MODEL_LABELS.values()],
+        'Damping / Saturation': [
+            '—' if name == 'log_linear'
+            else f"φ = {fits[name]['param'][0]:.2f}" if name == 'damped_trend'
+            else format_currency(fits[name]['param'][0])
+            for name in MODEL_LABELS.values()
+        ]
+    })
+    comparison, column_config = format_table(comparison, {
+        f"{latest_projected['Year']:.0f} Revenue": 'currency'
+    })
+    st.dataframe(comparison, column_config=column_config, use_container_width=True, hide_index=True)
 
 # Growth Analysis
 st.markdown("---")
@@ -98,8 +252,6 @@ col1, col2 = st.columns(2)
 with col1:
     st.subheader("Historical Performance (2015-2024)")
 
-    historical_cagr = ((latest_historical['Revenue'] / financials.iloc[0]['Revenue']) ** (1/9) - 1) * 100
-
     st.markdown(f"""
     - **Revenue CAGR:** {historical_cagr:.1f}%
     - **Starting Revenue (2015):** {format_currency(financials.iloc[0]['Revenue'])}
@@ -113,8 +265,6 @@ with col1:
 with col2:
     st.subheader("Projected Performance (2024-2030)")
 
-    projected_cagr = ((latest_projected['Revenue'] / latest_historical['Revenue']) ** (1/6) - 1) * 100
-
     st.markdown(f"""
     - **Revenue CAGR:** {projected_cagr:.1f}%
     - **Starting Revenue (2024):** {format_currency(latest_historical['Revenue'])}
@@ -130,16 +280,19 @@ st.markdown("---")
 st.header("Detailed Financial Projections")
 
 # Create displayable table
-display_df = display_financials[['Year', 'Revenue', 'Net_Income', 'Net_Margin_%', 
-                                  'Company_Valuation', 'Revenue_Multiple', 'Status']].copy()
+with section("projections table"):
+    display_df = display_financials[['Year', 'Revenue', 'Net_Income', 'Net_Margin_%', 
+                                      'Company_Valuation', 'Revenue_Multiple', 'Status']].copy()
 
-display_df['Revenue'] = display_df['Revenue'].apply(lambda x: format_currency(x))
-display_df['Net_Income'] = display_df['Net_Income'].apply(lambda x: format_currency(x))
-display_df['Net_Margin_%'] = display_df['Net_Margin_%'].apply(lambda x: f"{x:.1f}%")
-display_df['Company_Valuation'] = display_df['Company_Valuation'].apply(lambda x: format_currency(x))
-display_df['Revenue_Multiple'] = display_df['Revenue_Multiple'].apply(lambda x: f"{x:.1f}x")
+    display_df, column_config = format_table(display_df, {
+        'Revenue': 'currency',
+        'Net_Income': 'currency',
+        'Net_Margin_%': 'percentage',
+        'Company_Valuation': 'currency',
+        'Revenue_Multiple': ('multiple', 1)
+    })
 
-st.dataframe(display_df, use_container_width=True, hide_index=True)
+    st.dataframe(display_df, column_config=column_config, use_container_width=True, hide_index=True)
 
 # Margin Analysis
 st.markdown("---")
@@ -148,45 +301,46 @@ st.header("Profitability Margins Evolution")
 # Create margin chart
 import plotly.graph_objects as go
 
-margin_fig = go.Figure()
-
-historical_income = income_stmt.copy()
-historical_income['Year'] = range(2015, 2015 + len(historical_income))
-
-margin_fig.add_trace(go.Scatter(
-    x=historical_income['Year'],
-    y=historical_income['Gross_Margin_%'],
-    name='Gross Margin',
-    line=dict(color='#00CC66', width=3),
-    mode='lines+markers'
-))
-
-margin_fig.add_trace(go.Scatter(
-    x=historical_income['Year'],
-    y=historical_income['Operating_Margin_%'],
-    name='Operating Margin',
-    line=dict(color='#0066CC', width=3),
-    mode='lines+markers'
-))
-
-margin_fig.add_trace(go.Scatter(
-    x=historical_income['Year'],
-    y=historical_income['Net_Margin_%'],
-    name='Net Margin',
-    line=dict(color='#CC0066', width=3),
-    mode='lines+markers'
-))
-
-margin_fig.update_layout(
-    title="Profitability Margins (2015-2024)",
-    xaxis_title="Year",
-    yaxis_title="Margin %",
-    height=400,
-    hovermode='x unified',
-    legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
-)
+with section("chart: margins"):
+    margin_fig = go.Figure()
+
+    historical_income = income_stmt.copy()
+    historical_income['Year'] = range(2015, 2015 + len(historical_income))
+
+    margin_fig.add_trace(go.Scatter(
+        x=historical_income['Year'],
+        y=historical_income['Gross_Margin_%'],
+        name='Gross Margin',
+        line=dict(color='#00CC66', width=3),
+        mode='lines+markers'
+    ))
+
+    margin_fig.add_trace(go.Scatter(
+        x=historical_income['Year'],
+        y=historical_income['Operating_Margin_%'],
+        name='Operating Margin',
+        line=dict(color='#0066CC', width=3),
+        mode='lines+markers'
+    ))
+
+    margin_fig.add_trace(go.Scatter(
+        x=historical_income['Year'],
+        y=historical_income['Net_Margin_%'],
+        name='Net Margin',
+        line=dict(color='#CC0066', width=3),
+        mode='lines+markers'
+    ))
+
+    margin_fig.update_layout(
+        title="Profitability Margins (2015-2024)",
+        xaxis_title="Year",
+        yaxis_title="Margin %",
+        height=400,
+        hovermode='x unified',
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+    )
 
-st.plotly_chart(margin_fig, use_container_width=True)
+    st.plotly_chart(margin_fig, use_container_width=True)
 
 col1, col2, col3 = st.columns(3)
 
@@ -216,10 +370,16 @@ st.success("""
 As the datacenter scales, fixed infrastructure costs are spread across growing revenue, driving profitability.
 """)
 
-# Helper for multiple formatting
-def format_multiple(value):
-    return f"{value:.1f}x"
-
 # Footer
 st.markdown("---")
 st.caption("All financial projections are forward-looking statements subject to risks and uncertainties")
+
+profile_panel({
+    'view': view_mode,
+    'growth': growth_shift,
+    'margin': margin_shift,
+    'multiple': multiple_pct,
+    'scenarios': n_scenarios,
+    'forecast': forecast_choice
+})
+diagnostics_panel()
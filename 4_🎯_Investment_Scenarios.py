@@ -3,29 +3,115 @@ Investment Scenarios Page - Interactive calculator for custom investment amounts
 """
 import streamlit as st
 import pandas as pd
+import numpy as np
 import sys
 from pathlib import Path
 
 sys.path.append(str(Path(__file__).parent.parent))
 
 from utils.calculations import (
-    calculate_custom_investment_roi, 
+    calculate_sensitivity_surface,
     format_currency, 
     format_percentage, 
     format_multiple
 )
+from utils.cap_table import CapTable
+from utils.data_store import load_dataset
+from utils.memory_cache import memory_cached
+from utils.result_cache import disk_cached
+from utils.scenario_table import (
+    ScenarioTable, SLIDER_DOMAINS, AMOUNT_STEP, EXIT_SCENARIOS, EXIT_YEAR, SENSITIVITY_VALUATIONS
+)
+from utils.simulation import simulate_exit_returns, lognormal, discrete, uniform
+from utils.visualizations import (
+    create_check_size_chart,
+    create_moic_distribution_chart,
+    create_reserve_heatmap,
+    create_sensitivity_heatmap,
+    create_waterfall_chart
+)
+from utils.tables import format_table
+from utils.timing import start_page, section, diagnostics_panel, instrumented_fragment
+from utils.profiling import start_profile, profile_panel
+from utils.reserves import optimize_reserves, payout_multiples
+from utils.waterfall import Waterfall
 import plotly.graph_objects as go
 
 st.set_page_config(page_title="Investment Scenarios", page_icon="🎯", layout="wide")
+start_page("Investment Scenarios")
+start_profile("Investment Scenarios")
 
 # Load data
-@st.cache_data
-def load_data():
-    data_path = Path(__file__).parent.parent / "data"
-    funding_rounds = pd.read_csv(data_path / "funding_rounds_overview.csv")
-    return funding_rounds
+with section("data load"):
+    funding_rounds = load_dataset('funding_rounds_overview')
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def load_scenario_table(funding_rounds):
+    """Every calculator state, computed once per process and shared by all sessions"""
+    return ScenarioTable(funding_rounds, CapTable.from_funding_rounds(funding_rounds))
+
+with section("scenario table"):
+    scenario_table = load_scenario_table(funding_rounds)
+
+# Simulated and surface MOIC and IRR do not depend on the check size, so every
+# slider position shares one run on a nominal check
+NOMINAL_CHECK = 1_000_000
+
+# Surfaces and simulations are cached in memory within the process-wide budget,
+# and on disk for every worker process
+@memory_cached
+@disk_cached(depends_on=('utils.calculations', 'utils.cap_table', 'utils.waterfall'))
+def compute_sensitivity_surface(round_name, round_year, round_post_money_val,
+                                valuation_range, n_valuations, exit_years, funding_rounds):
+    surface_cap_table = CapTable.from_funding_rounds(funding_rounds)
+    return calculate_sensitivity_surface(
+        investment_amount=NOMINAL_CHECK,
+        round_name=round_name,
+        round_year=round_year,
+        round_post_money_val=round_post_money_val,
+        exit_valuations=np.linspace(valuation_range[0], valuation_range[1], n_valuations) * 1_000_000,
+        exit_years=np.arange(exit_years[0], exit_years[1] + 1),
+        cap_table=surface_cap_table,
+        waterfall=Waterfall.from_funding_rounds(funding_rounds, surface_cap_table)
+    )
+
+@memory_cached
+@disk_cached(depends_on=('utils.simulation', 'utils.calculations', 'utils.cap_table', 'utils.waterfall'))
+def run_simulation(round_name, round_post_money_val, round_year,
+                   median_exit, volatility, exit_years, dilution_spread, n_paths, seed, funding_rounds):
+    # Proceeds follow the waterfall at each simulated exit; the dilution
+    # uncertainty scales the round's payout around its planned value
+    simulation_cap_table = CapTable.from_funding_rounds(funding_rounds)
+    waterfall = Waterfall.from_funding_rounds(funding_rounds, simulation_cap_table)
+    entry_stake = simulation_cap_table.equity_sold[simulation_cap_table.round_index(round_name)]
+    return simulate_exit_returns(
+        investment_amount=NOMINAL_CHECK,
+        round_post_money_val=round_post_money_val,
+        round_year=round_year,
+        exit_valuation=lognormal(median_exit, volatility),
+        exit_year=discrete(range(exit_years[0], exit_years[1] + 1)),
+        dilution_factor=uniform(1 - dilution_spread, 1 + dilution_spread),
+        n_paths=n_paths,
+        seed=seed,
+        payout=lambda valuations: waterfall.payout_factor(round_name, entry_stake, valuations)
+    )
 
-funding_rounds = load_data()
+@memory_cached
+def compute_reserve_allocation(budget, probabilities, objective, n_steps, funding_rounds):
+    # The rounds a fund can still write checks into are the calculator's rounds
+    rounds = list(SLIDER_DOMAINS)
+    terms = funding_rounds.set_index('Round').loc[[name.replace(' ', '_') for name in rounds]]
+    amount_raised = terms['Amount_Raised'].to_numpy(dtype=float)
+    waterfall = Waterfall.from_funding_rounds(funding_rounds, CapTable.from_funding_rounds(funding_rounds))
+    return optimize_reserves(
+        budget=budget,
+        multiples=payout_multiples(waterfall, rounds, amount_raised, list(EXIT_SCENARIOS.values())),
+        years_held=EXIT_YEAR - terms['Year'].to_numpy(dtype=float),
+        probabilities=probabilities,
+        max_checks=amount_raised,
+        n_steps=n_steps,
+        objective=objective
+    )
 
 # Header
 st.title("🎯 Investment Scenario Calculator")
@@ -44,108 +130,196 @@ selected_round = st.sidebar.selectbox(
 )
 
 # Get round details
-if selected_round == 'Series B':
-    round_info = funding_rounds[funding_rounds['Round'] == 'Series_B'].iloc[0]
-    min_investment = 500000
-    max_investment = 8000000
-    default_investment = 2000000
-else:
-    round_info = funding_rounds[funding_rounds['Round'] == 'Series_C'].iloc[0]
-    min_investment = 1000000
-    max_investment = 20000000
-    default_investment = 5000000
-
-# Investment amount slider
-investment_amount = st.sidebar.slider(
-    "Investment Amount ($)",
-    min_value=min_investment,
-    max_value=max_investment,
-    value=default_investment,
-    step=100000,
-    format="$%d"
-)
-
-# Exit scenario
-exit_scenario = st.sidebar.radio(
-    "Exit Scenario:",
-    options=['IPO (2030)', 'Conservative (80% of IPO)', 'Optimistic (120% of IPO)']
-)
-
-if exit_scenario == 'IPO (2030)':
-    exit_valuation = 240000000
-elif exit_scenario == 'Conservative (80% of IPO)':
-    exit_valuation = 192000000
-else:
-    exit_valuation = 288000000
-
-# Calculate ROI
-roi = calculate_custom_investment_roi(
-    investment_amount=investment_amount,
-    round_name=selected_round.replace(' ', '_'),
-    round_year=round_info['Year'],
-    round_post_money_val=round_info['Post_Money_Valuation'],
-    exit_year=2030,
-    exit_valuation=exit_valuation
-)
-
-# Display Results
-st.header(f"Your {selected_round} Investment Analysis")
-
-col1, col2, col3, col4 = st.columns(4)
-
-with col1:
-    st.metric(
-        "Investment Amount",
-        format_currency(investment_amount),
-        delta=f"{round_info['Year']}"
+round_info = funding_rounds[funding_rounds['Round'] == selected_round.replace(' ', '_')].iloc[0]
+min_investment, max_investment, default_investment = SLIDER_DOMAINS[selected_round]
+
+# Everything below the round selector is split into fragments whose inputs are
+# their arguments. A widget inside a fragment reruns only that fragment (and the
+# fragments it calls), so moving the investment slider redraws the results,
+# comparison and sensitivity sections but not the surface or the simulation,
+# and switching the exit scenario leaves the investment details alone.
+# Fragments cannot write to the sidebar, so their widgets sit in the page body.
+
+# Widget values for the profiler. Each fragment records its own as it runs; a
+# fragment rerun is timed and profiled on its own by @instrumented_fragment and
+# saves this dict with its profile, so it holds the values the rerun used.
+profile_state = {'round': selected_round}
+
+@st.fragment
+@instrumented_fragment("Investment Scenarios", profile_state)
+def investment_section(selected_round, round_info, min_investment, max_investment, default_investment):
+    # Investment amount slider
+    investment_amount = st.slider(
+        "Investment Amount ($)",
+        min_value=min_investment,
+        max_value=max_investment,
+        value=default_investment,
+        step=AMOUNT_STEP,
+        format="$%d"
     )
+    profile_state['amount'] = investment_amount
 
-with col2:
-    st.metric(
-        "Exit Value",
-        format_currency(roi['exit_value']),
-        delta=format_currency(roi['absolute_return']) + " profit"
-    )
+    # Display Results
+    st.header(f"Your {selected_round} Investment Analysis")
 
-with col3:
-    st.metric(
-        "Return Multiple",
-        format_multiple(roi['moic']),
-        delta="MOIC"
-    )
-
-with col4:
-    st.metric(
-        "Annualized Return",
-        format_percentage(roi['irr']),
-        delta=f"{roi['years_held']} year hold"
-    )
-
-# Detailed breakdown
-st.markdown("---")
-
-col1, col2 = st.columns(2)
-
-with col1:
     st.subheader("Investment Details")
 
     ownership_pct = (investment_amount / round_info['Post_Money_Valuation']) * 100
 
-    st.markdown(f"""
-    **Funding Round:** {selected_round}  
-    **Investment Year:** {round_info['Year']}  
-    **Your Investment:** {format_currency(investment_amount)}  
-
-    **Entry Valuation:**  
-    - Pre-money: {format_currency(round_info['Pre_Money_Valuation'])}  
-    - Post-money: {format_currency(round_info['Post_Money_Valuation'])}  
-
-    **Ownership:**  
-    - Initial: {ownership_pct:.3f}%  
-    - At Exit (post-dilution): {roi['ownership_at_exit']:.3f}%  
-    """)
+    # Dilution to exit does not depend on the exit valuation
+    ownership_at_exit = scenario_table.lookup(selected_round, investment_amount, 'IPO (2030)')['ownership_at_exit']
+
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        st.markdown(f"""
+        **Funding Round:** {selected_round}  
+        **Investment Year:** {round_info['Year']}  
+        **Your Investment:** {format_currency(investment_amount)}  
+        """)
+
+    with col2:
+        st.markdown(f"""
+        **Entry Valuation:**  
+        - Pre-money: {format_currency(round_info['Pre_Money_Valuation'])}  
+        - Post-money: {format_currency(round_info['Post_Money_Valuation'])}  
+        """)
+
+    with col3:
+        st.markdown(f"""
+        **Ownership:**  
+        - Initial: {ownership_pct:.3f}%  
+        - At Exit (post-dilution): {ownership_at_exit:.3f}%  
+        """)
+
+    st.markdown("---")
+
+    returns_section(selected_round, round_info, investment_amount)
+
+    # Sensitivity Analysis
+    st.markdown("---")
+    st.header("Sensitivity Analysis")
+
+    st.markdown("How do returns change with different exit valuations?")
+
+    # Generate sensitivity data
+    exit_labels = ['$160M', '$200M', '$240M (Base)', '$280M', '$320M']
+
+    with section("sensitivity"):
+        roi_sens = scenario_table.sensitivity(selected_round, investment_amount)
+
+        sensitivity_df = pd.DataFrame({
+            'Exit_Valuation': SENSITIVITY_VALUATIONS,
+            'MOIC': roi_sens['moic'],
+            'IRR_%': roi_sens['irr']
+        })
+
+    # Create sensitivity chart
+    with section("chart: sensitivity"):
+        fig_sens = go.Figure()
+
+        fig_sens.add_trace(go.Scatter(
+            x=exit_labels,
+            y=sensitivity_df['MOIC'],
+            mode='lines+markers',
+            name='MOIC',
+            line=dict(color='#0066CC', width=3),
+            marker=dict(size=10)
+        ))
+
+        fig_sens.update_layout(
+            title=f"Return Sensitivity to Exit Valuation ({selected_round})",
+            xaxis_title="Exit Valuation",
+            yaxis_title="Multiple on Invested Capital (MOIC)",
+            height=400,
+            showlegend=False
+        )
+
+        st.plotly_chart(fig_sens, use_container_width=True)
+
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        st.metric(
+            "Conservative Case ($160M)",
+            format_multiple(sensitivity_df.iloc[0]['MOIC']),
+            delta=format_percentage(sensitivity_df.iloc[0]['IRR_%'])
+        )
+
+    with col2:
+        st.metric(
+            "Base Case ($240M)",
+            format_multiple(sensitivity_df.iloc[2]['MOIC']),
+            delta=format_percentage(sensitivity_df.iloc[2]['IRR_%'])
+        )
+
+    with col3:
+        st.metric(
+            "Optimistic Case ($320M)",
+            format_multiple(sensitivity_df.iloc[4]['MOIC']),
+            delta=format_percentage(sensitivity_df.iloc[4]['IRR_%'])
+        )
+
+    # Returns across the whole slider range, read from the precomputed table
+    st.subheader("Returns by Investment Amount")
+
+    with section("chart: check size"):
+        st.plotly_chart(
+            create_check_size_chart(
+                scenario_table.amounts(selected_round),
+                scenario_table.curves(selected_round),
+                investment_amount
+            ),
+            use_container_width=True
+        )
+
+@st.fragment
+@instrumented_fragment("Investment Scenarios", profile_state)
+def returns_section(selected_round, round_info, investment_amount):
+    # Exit scenario
+    exit_scenario = st.radio(
+        "Exit Scenario:",
+        options=list(EXIT_SCENARIOS),
+        horizontal=True
+    )
+    profile_state['exit'] = exit_scenario
+
+    exit_valuation = EXIT_SCENARIOS[exit_scenario]
+
+    # Calculate ROI
+    with section("ROI"):
+        roi = scenario_table.lookup(selected_round, investment_amount, exit_scenario)
+
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        st.metric(
+            "Investment Amount",
+            format_currency(investment_amount),
+            delta=f"{round_info['Year']}"
+        )
+
+    with col2:
+        st.metric(
+            "Exit Value",
+            format_currency(roi['exit_value']),
+            delta=format_currency(roi['absolute_return']) + " profit"
+        )
+
+    with col3:
+        st.metric(
+            "Return Multiple",
+            format_multiple(roi['moic']),
+            delta="MOIC"
+        )
+
+    with col4:
+        st.metric(
+            "Annualized Return",
+            format_percentage(roi['irr']),
+            delta=f"{roi['years_held']} year hold"
+        )
 
-with col2:
     st.subheader("Return Analysis")
 
     st.markdown(f"""
@@ -154,167 +328,413 @@ with col2:
     **Exit Valuation:** {format_currency(exit_valuation)}  
 
     **Your Returns:**  
-    - Exit Value: {format_currency(roi['exit_value'])}  
+    - Exit Value: {format_currency(roi['exit_value'])} (pro-rata split: {format_currency(exit_valuation * roi['ownership_at_exit'] / 100)})  
     - Absolute Return: {format_currency(roi['absolute_return'])}  
     - Multiple (MOIC): {format_multiple(roi['moic'])}  
     - IRR: {format_percentage(roi['irr'])}  
     - Holding Period: {roi['years_held']} years  
     """)
 
-# Comparison with other rounds
-st.markdown("---")
-st.header("Compare with Other Funding Rounds")
-
-# Calculate ROI for same investment amount in different rounds
-comparison_data = []
-
-for round_name in ['Series B', 'Series C']:
-    round_key = round_name.replace(' ', '_')
-    round_data = funding_rounds[funding_rounds['Round'] == round_key].iloc[0]
-
-    # Use smaller of investment amount or round size
-    compare_investment = min(investment_amount, round_data['Amount_Raised'])
-
-    compare_roi = calculate_custom_investment_roi(
-        investment_amount=compare_investment,
-        round_name=round_key,
-        round_year=round_data['Year'],
-        round_post_money_val=round_data['Post_Money_Valuation'],
-        exit_year=2030,
-        exit_valuation=exit_valuation
-    )
+    # Comparison with other rounds
+    st.markdown("---")
+    st.header("Compare with Other Funding Rounds")
+
+    # Calculate ROI for same investment amount in different rounds
+    with section("round comparison"):
+        # Uses the smaller of investment amount or round size
+        compare_roi = scenario_table.comparison(selected_round, investment_amount, exit_scenario)
+
+        comparison_df = pd.DataFrame({
+            'Round': compare_roi['round'],
+            'Investment': compare_roi['investment'],
+            'Entry_Valuation': compare_roi['entry_valuation'],
+            'Exit_Value': compare_roi['exit_value'],
+            'MOIC': compare_roi['moic'],
+            'IRR_%': compare_roi['irr'],
+            'Years': compare_roi['years_held']
+        })
+
+    # Visualization
+    with section("chart: exit value comparison"):
+        fig = go.Figure()
+
+        fig.add_trace(go.Bar(
+            name='Exit Value',
+            x=comparison_df['Round'],
+            y=comparison_df['Exit_Value'],
+            text=[format_currency(x) for x in comparison_df['Exit_Value']],
+            textposition='outside',
+            marker_color=['#0066CC', '#CC0066']
+        ))
+
+        fig.update_layout(
+            title=f"Exit Value Comparison for {format_currency(min(investment_amount, comparison_df['Investment'].min()))} Investment",
+            xaxis_title="Funding Round",
+            yaxis_title="Exit Value ($)",
+            height=400,
+            showlegend=False
+        )
+
+        st.plotly_chart(fig, use_container_width=True)
+
+    # Comparison table
+    st.subheader("Detailed Comparison")
+
+    with section("comparison table"):
+        display_comparison, column_config = format_table(comparison_df, {
+            'Investment': 'currency',
+            'Entry_Valuation': 'currency',
+            'Exit_Value': 'currency',
+            'MOIC': 'multiple',
+            'IRR_%': 'percentage'
+        })
+
+        st.dataframe(display_comparison, column_config=column_config, use_container_width=True, hide_index=True)
+
+    # Key insights
+    best_round = comparison_df.loc[comparison_df['MOIC'].idxmax(), 'Round']
+    best_moic = comparison_df.loc[comparison_df['MOIC'].idxmax(), 'MOIC']
+    best_irr = comparison_df.loc[comparison_df['MOIC'].idxmax(), 'IRR_%']
+
+    st.success(f"""
+    **Best Return:** {best_round} offers the highest returns with {format_multiple(best_moic)} MOIC 
+    and {format_percentage(best_irr)} IRR under the {exit_scenario} scenario.
+    """)
 
-    comparison_data.append({
-        'Round': round_name,
-        'Investment': compare_investment,
-        'Entry_Valuation': round_data['Post_Money_Valuation'],
-        'Exit_Value': compare_roi['exit_value'],
-        'MOIC': compare_roi['moic'],
-        'IRR_%': compare_roi['irr'],
-        'Years': compare_roi['years_held']
+@st.fragment
+@instrumented_fragment("Investment Scenarios", profile_state)
+def surface_section(selected_round, round_info):
+    # Sensitivity surface: exit valuation x exit year
+    st.subheader("Sensitivity Surface")
+
+    st.markdown("Returns across a grid of exit valuations and exit years (multiples and IRR are the same for any check size)")
+
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        surface_valuation_range = st.slider(
+            "Exit Valuation Range ($M)",
+            min_value=50,
+            max_value=600,
+            value=(100, 400),
+            step=10
+        )
+
+    with col2:
+        surface_resolution = st.select_slider(
+            "Valuation Grid Points",
+            options=[25, 50, 100, 200, 400],
+            value=200
+        )
+
+    with col3:
+        surface_exit_years = st.slider(
+            "Exit Year Range",
+            min_value=int(round_info['Year']) + 1,
+            max_value=2040,
+            value=(int(round_info['Year']) + 1, int(round_info['Year']) + 10),
+            key="surface_exit_years"
+        )
+
+    with col4:
+        surface_metric = st.radio("Layer", options=['MOIC', 'IRR'], horizontal=True)
+        surface_style = st.radio("Style", options=['Heatmap', 'Contour'], horizontal=True)
+
+    profile_state.update({
+        'surface_valuations': surface_valuation_range,
+        'surface_points': surface_resolution,
+        'surface_years': surface_exit_years,
+        'layer': surface_metric,
+        'style': surface_style
     })
 
-comparison_df = pd.DataFrame(comparison_data)
-
-# Visualization
-fig = go.Figure()
-
-fig.add_trace(go.Bar(
-    name='Exit Value',
-    x=comparison_df['Round'],
-    y=comparison_df['Exit_Value'],
-    text=[format_currency(x) for x in comparison_df['Exit_Value']],
-    textposition='outside',
-    marker_color=['#0066CC', '#CC0066']
-))
-
-fig.update_layout(
-    title=f"Exit Value Comparison for {format_currency(min(investment_amount, comparison_df['Investment'].min()))} Investment",
-    xaxis_title="Funding Round",
-    yaxis_title="Exit Value ($)",
-    height=400,
-    showlegend=False
-)
-
-st.plotly_chart(fig, use_container_width=True)
-
-# Comparison table
-st.subheader("Detailed Comparison")
-
-display_comparison = comparison_df.copy()
-display_comparison['Investment'] = display_comparison['Investment'].apply(format_currency)
-display_comparison['Entry_Valuation'] = display_comparison['Entry_Valuation'].apply(format_currency)
-display_comparison['Exit_Value'] = display_comparison['Exit_Value'].apply(format_currency)
-display_comparison['MOIC'] = display_comparison['MOIC'].apply(format_multiple)
-display_comparison['IRR_%'] = display_comparison['IRR_%'].apply(lambda x: f"{x:.1f}%")
-
-st.dataframe(display_comparison, use_container_width=True, hide_index=True)
-
-# Key insights
-best_round = comparison_df.loc[comparison_df['MOIC'].idxmax(), 'Round']
-best_moic = comparison_df.loc[comparison_df['MOIC'].idxmax(), 'MOIC']
-best_irr = comparison_df.loc[comparison_df['MOIC'].idxmax(), 'IRR_%']
-
-st.success(f"""
-**Best Return:** {best_round} offers the highest returns with {format_multiple(best_moic)} MOIC 
-and {format_percentage(best_irr)} IRR under the {exit_scenario} scenario.
-""")
-
-# Sensitivity Analysis
-st.markdown("---")
-st.header("Sensitivity Analysis")
-
-st.markdown("How do returns change with different exit valuations?")
-
-# Generate sensitivity data
-exit_valuations = [160000000, 200000000, 240000000, 280000000, 320000000]
-exit_labels = ['$160M', '$200M', '$240M (Base)', '$280M', '$320M']
+    with section("sensitivity surface"):
+        surface = compute_sensitivity_surface(
+            round_name=selected_round,
+            round_year=int(round_info['Year']),
+            round_post_money_val=float(round_info['Post_Money_Valuation']),
+            valuation_range=surface_valuation_range,
+            n_valuations=surface_resolution,
+            exit_years=surface_exit_years,
+            funding_rounds=funding_rounds
+        )
+
+    with section("chart: sensitivity surface"):
+        st.plotly_chart(
+            create_sensitivity_heatmap(surface, metric=surface_metric.lower(), style=surface_style.lower()),
+            use_container_width=True
+        )
+
+@st.fragment
+@instrumented_fragment("Investment Scenarios", profile_state)
+def waterfall_section(selected_round):
+    # Liquidation preferences: payout of every share class by exit value
+    st.markdown("---")
+    st.header("Liquidation Preference Waterfall")
+
+    st.markdown("""
+    Exit proceeds pay each round's liquidation preference first, most senior round first, and the
+    rest is split per share. Preferred rounds convert to common once that pays more.
+    """)
 
-sensitivity_data = []
+    waterfall = scenario_table.waterfall
 
-for exit_val in exit_valuations:
-    roi_sens = calculate_custom_investment_roi(
-        investment_amount=investment_amount,
-        round_name=selected_round.replace(' ', '_'),
-        round_year=round_info['Year'],
-        round_post_money_val=round_info['Post_Money_Valuation'],
-        exit_year=2030,
-        exit_valuation=exit_val
+    waterfall_range = st.slider(
+        "Exit Value Range ($M)",
+        min_value=0,
+        max_value=1000,
+        value=(0, 320),
+        step=10
     )
+    profile_state['waterfall_range'] = waterfall_range
+
+    with section("waterfall"):
+        low, high = (value * 1_000_000 for value in waterfall_range)
+        breakpoints = waterfall.breakpoints[(waterfall.breakpoints > low) & (waterfall.breakpoints < high)]
+        # Evaluated exactly at the kinks, so the curves bend where the terms do
+        exit_values = np.union1d(np.linspace(low, high, 1001), breakpoints)
+        payouts = waterfall.payouts(exit_values)
+
+    with section("chart: waterfall"):
+        st.plotly_chart(
+            create_waterfall_chart(
+                exit_values, payouts, waterfall.classes, selected_round,
+                {label.split(' (')[0]: value for label, value in EXIT_SCENARIOS.items() if low <= value <= high}
+            ),
+            use_container_width=True
+        )
+
+    with st.expander("Waterfall Breakpoints"):
+        table = waterfall.breakpoint_table()
+        breakpoint_df = pd.DataFrame({
+            'Exit Value': table['exit_value'],
+            **{name.replace('_', ' '): payout for name, payout in zip(waterfall.classes, table['payouts'])}
+        })
+        breakpoint_df, column_config = format_table(
+            breakpoint_df, {column: 'currency' for column in breakpoint_df.columns}
+        )
+        st.dataframe(breakpoint_df, column_config=column_config, use_container_width=True, hide_index=True)
+
+@st.fragment
+@instrumented_fragment("Investment Scenarios", profile_state)
+def reserve_section():
+    # Split of a fixed budget between the open rounds
+    st.markdown("---")
+    st.header("Reserve Allocation")
+
+    rounds = list(SLIDER_DOMAINS)
+    st.markdown(f"""
+    How much of a fixed budget should go into the {rounds[0]} check, and how much should be held in
+    reserve for {rounds[-1]}? Every split on the grid is priced through the waterfall under each exit
+    scenario; budget left unallocated is returned unused at exit.
+    """)
 
-    sensitivity_data.append({
-        'Exit_Valuation': exit_val,
-        'MOIC': roi_sens['moic'],
-        'IRR_%': roi_sens['irr']
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        reserve_budget = st.number_input(
+            "Fund Budget ($M)",
+            min_value=0.5,
+            max_value=50.0,
+            value=10.0,
+            step=0.5
+        )
+
+    with col2:
+        reserve_objective = st.radio(
+            "Optimize For:",
+            options=["Expected MOIC", "Expected IRR"],
+            horizontal=True
+        )
+
+    with col3:
+        reserve_steps = st.select_slider(
+            "Grid Points per Round",
+            options=[101, 251, 501, 1001],
+            value=1001
+        )
+
+    with st.expander("Exit Scenario Weights"):
+        weight_columns = st.columns(len(EXIT_SCENARIOS))
+        default_weights = {'IPO (2030)': 50}
+        reserve_weights = tuple(
+            column.slider(f"{scenario} (%)", 0, 100, default_weights.get(scenario, 25), 5)
+            for column, scenario in zip(weight_columns, EXIT_SCENARIOS)
+        )
+
+    profile_state.update({
+        'reserve_budget': reserve_budget,
+        'reserve_objective': reserve_objective,
+        'reserve_steps': reserve_steps,
+        'reserve_weights': reserve_weights
     })
 
-sensitivity_df = pd.DataFrame(sensitivity_data)
-
-# Create sensitivity chart
-fig_sens = go.Figure()
-
-fig_sens.add_trace(go.Scatter(
-    x=exit_labels,
-    y=sensitivity_df['MOIC'],
-    mode='lines+markers',
-    name='MOIC',
-    line=dict(color='#0066CC', width=3),
-    marker=dict(size=10)
-))
-
-fig_sens.update_layout(
-    title=f"Return Sensitivity to Exit Valuation ({selected_round})",
-    xaxis_title="Exit Valuation",
-    yaxis_title="Multiple on Invested Capital (MOIC)",
-    height=400,
-    showlegend=False
-)
-
-st.plotly_chart(fig_sens, use_container_width=True)
-
-col1, col2, col3 = st.columns(3)
-
-with col1:
-    st.metric(
-        "Conservative Case ($160M)",
-        format_multiple(sensitivity_df.iloc[0]['MOIC']),
-        delta=format_percentage(sensitivity_df.iloc[0]['IRR_%'])
-    )
-
-with col2:
-    st.metric(
-        "Base Case ($240M)",
-        format_multiple(sensitivity_df.iloc[2]['MOIC']),
-        delta=format_percentage(sensitivity_df.iloc[2]['IRR_%'])
+    if sum(reserve_weights) == 0:
+        st.warning("Give at least one exit scenario a positive weight")
+        return
+
+    metric = 'moic' if reserve_objective == "Expected MOIC" else 'irr'
+    with section("reserve allocation"):
+        allocation = compute_reserve_allocation(
+            budget=reserve_budget * 1_000_000,
+            probabilities=reserve_weights,
+            objective=metric,
+            n_steps=reserve_steps,
+            funding_rounds=funding_rounds
+        )
+
+    col1, col2, col3, col4, col5 = st.columns(5)
+
+    with col1:
+        st.metric(f"{rounds[0]} Check", format_currency(allocation['allocation'][0]))
+
+    with col2:
+        st.metric(f"{rounds[-1]} Reserve", format_currency(allocation['allocation'][-1]))
+
+    with col3:
+        st.metric("Unallocated", format_currency(allocation['reserve']))
+
+    with col4:
+        st.metric("Expected MOIC", format_multiple(allocation['expected_moic']))
+
+    with col5:
+        st.metric("Expected IRR", format_percentage(allocation['expected_irr']))
+
+    with section("chart: reserve allocation"):
+        st.plotly_chart(
+            create_reserve_heatmap(allocation['amounts'], allocation[metric], allocation['best'], rounds, metric),
+            use_container_width=True
+        )
+
+    scenario_df = pd.DataFrame({
+        'Exit Scenario': list(EXIT_SCENARIOS),
+        'Exit Valuation': list(EXIT_SCENARIOS.values()),
+        'Weight': np.asarray(reserve_weights) / sum(reserve_weights) * 100,
+        'MOIC': allocation['scenario_moic'],
+        'IRR': allocation['scenario_irr']
+    })
+    scenario_df, column_config = format_table(
+        scenario_df,
+        {'Exit Valuation': 'currency', 'Weight': 'percentage', 'MOIC': 'multiple', 'IRR': 'percentage'}
     )
+    st.dataframe(scenario_df, column_config=column_config, use_container_width=True, hide_index=True)
+
+@st.fragment
+@instrumented_fragment("Investment Scenarios", profile_state)
+def simulation_section(selected_round, round_info):
+    # Monte Carlo Simulation
+    st.markdown("---")
+    st.header("Monte Carlo Exit Simulation")
+
+    st.markdown("How are returns distributed when exit valuation, exit year and dilution are uncertain?")
+
+    with st.expander("Simulation Settings"):
+        col1, col2, col3 = st.columns(3)
+
+        with col1:
+            sim_median = st.number_input(
+                "Median Exit Valuation ($M)",
+                min_value=10.0,
+                value=EXIT_SCENARIOS['IPO (2030)'] / 1_000_000,
+                step=10.0
+            )
+            sim_volatility = st.slider("Exit Valuation Volatility (log σ)", 0.05, 1.50, 0.50, 0.05)
+
+        with col2:
+            sim_exit_years = st.slider(
+                "Exit Year Range",
+                min_value=int(round_info['Year']) + 1,
+                max_value=2035,
+                value=(2029, 2031)
+            )
+            sim_dilution_spread = st.slider("Dilution Uncertainty (±%)", 0, 50, 10, 5)
+
+        with col3:
+            sim_paths = st.select_slider(
+                "Simulated Paths",
+                options=[10_000, 100_000, 1_000_000, 10_000_000],
+                value=1_000_000
+            )
+            sim_seed = st.number_input("Random Seed", min_value=0, value=42, step=1)
+
+    profile_state.update({
+        'sim_median': sim_median,
+        'sim_volatility': sim_volatility,
+        'sim_years': sim_exit_years,
+        'sim_dilution': sim_dilution_spread,
+        'sim_paths': sim_paths,
+        'sim_seed': sim_seed
+    })
 
-with col3:
-    st.metric(
-        "Optimistic Case ($320M)",
-        format_multiple(sensitivity_df.iloc[4]['MOIC']),
-        delta=format_percentage(sensitivity_df.iloc[4]['IRR_%'])
-    )
+    with section("simulation"):
+        simulation = run_simulation(
+            round_name=selected_round,
+            round_post_money_val=float(round_info['Post_Money_Valuation']),
+            round_year=int(round_info['Year']),
+            median_exit=sim_median * 1_000_000,
+            volatility=sim_volatility,
+            exit_years=sim_exit_years,
+            dilution_spread=sim_dilution_spread / 100,
+            n_paths=sim_paths,
+            seed=int(sim_seed),
+            funding_rounds=funding_rounds
+        )
+
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        st.metric(
+            "Median MOIC",
+            format_multiple(simulation['moic_percentiles'][50]),
+            delta=f"P10–P90: {format_multiple(simulation['moic_percentiles'][10])}–{format_multiple(simulation['moic_percentiles'][90])}",
+            delta_color="off"
+        )
+
+    with col2:
+        st.metric(
+            "Median IRR",
+            format_percentage(simulation['irr_percentiles'][50]),
+            delta=f"Mean: {format_percentage(simulation['mean_irr'])}",
+            delta_color="off"
+        )
+
+    with col3:
+        st.metric(
+            "Probability of Loss",
+            format_percentage(simulation['prob_loss'] * 100),
+            delta="MOIC below 1x",
+            delta_color="off"
+        )
+
+    with col4:
+        st.metric(
+            f"Probability of Beating {simulation['benchmark_moic']:g}x",
+            format_percentage(simulation['prob_beat_benchmark'] * 100),
+            delta="VC benchmark",
+            delta_color="off"
+        )
+
+    with section("chart: MOIC distribution"):
+        st.plotly_chart(create_moic_distribution_chart(simulation), use_container_width=True)
+
+    with section("percentile table"):
+        percentile_df = pd.DataFrame({
+            'Percentile': [f"P{p}" for p in simulation['moic_percentiles']],
+            'MOIC': [format_multiple(v) for v in simulation['moic_percentiles'].values()],
+            'IRR': [format_percentage(v) for v in simulation['irr_percentiles'].values()]
+        })
+
+        st.dataframe(percentile_df, use_container_width=True, hide_index=True)
+
+investment_section(selected_round, round_info, min_investment, max_investment, default_investment)
+surface_section(selected_round, round_info)
+waterfall_section(selected_round)
+reserve_section()
+simulation_section(selected_round, round_info)
 
 # Footer
 st.markdown("---")
-st.caption("All calculations assume proportional ownership based on investment amount and standard dilution patterns")
+st.caption("Every return on this page follows the liquidation preferences in the funding rounds data, with stakes diluted through later rounds as planned")
+
+profile_panel(profile_state)
+diagnostics_panel()
@@ -2,7 +2,6 @@
 Company Details Page - Operational metrics and business fundamentals
 """
 import streamlit as st
-import pandas as pd
 import sys
 from pathlib import Path
 
@@ -10,21 +9,23 @@ sys.path.append(str(Path(__file__).parent.parent))
 
 from utils.calculations import format_currency, format_percentage
 from utils.visualizations import create_ownership_chart
+from utils.data_store import load_datasets
+from utils.timing import start_page, section, diagnostics_panel
+from utils.profiling import start_profile, profile_panel
 import plotly.graph_objects as go
 
 st.set_page_config(page_title="Company Details", page_icon="📑", layout="wide")
+start_page("Company Details")
+start_profile("Company Details")
 
 # Load data
-@st.cache_data
-def load_data():
-    data_path = Path(__file__).parent.parent / "data"
-    operational = pd.read_csv(data_path / "operational_metrics.csv")
-    ownership = pd.read_csv(data_path / "ownership_evolution.csv")
-    balance_sheet = pd.read_csv(data_path / "balance_sheet.csv")
-    income_stmt = pd.read_csv(data_path / "income_statement.csv")
-    return operational, ownership, balance_sheet, income_stmt
-
-operational, ownership, balance_sheet, income_stmt = load_data()
+with section("data load"):
+    operational, ownership, balance_sheet, income_stmt = load_datasets(
+        'operational_metrics',
+        'ownership_evolution',
+        'balance_sheet',
+        'income_statement'
+    )
 
 # Header
 st.title("📑 Company Details")
@@ -74,40 +75,41 @@ st.markdown("---")
 st.header("Operational Growth (2015-2024)")
 
 # Create operational growth charts
-fig_ops = go.Figure()
-
-fig_ops.add_trace(go.Scatter(
-    x=operational['Year'],
-    y=operational['Server_Count'],
-    name='Servers',
-    line=dict(color='#0066CC', width=3),
-    mode='lines+markers'
-))
-
-fig_ops.add_trace(go.Scatter(
-    x=operational['Year'],
-    y=operational['Number_of_Customers'],
-    name='Customers',
-    line=dict(color='#00CC66', width=3),
-    mode='lines+markers',
-    yaxis='y2'
-))
-
-fig_ops.update_layout(
-    title="Server Count & Customer Growth",
-    xaxis_title="Year",
-    yaxis_title="Number of Servers",
-    yaxis2=dict(
-        title="Number of Customers",
-        overlaying='y',
-        side='right'
-    ),
-    height=400,
-    hovermode='x unified',
-    legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
-)
-
-st.plotly_chart(fig_ops, use_container_width=True)
+with section("chart: servers & customers"):
+    fig_ops = go.Figure()
+
+    fig_ops.add_trace(go.Scatter(
+        x=operational['Year'],
+        y=operational['Server_Count'],
+        name='Servers',
+        line=dict(color='#0066CC', width=3),
+        mode='lines+markers'
+    ))
+
+    fig_ops.add_trace(go.Scatter(
+        x=operational['Year'],
+        y=operational['Number_of_Customers'],
+        name='Customers',
+        line=dict(color='#00CC66', width=3),
+        mode='lines+markers',
+        yaxis='y2'
+    ))
+
+    fig_ops.update_layout(
+        title="Server Count & Customer Growth",
+        xaxis_title="Year",
+        yaxis_title="Number of Servers",
+        yaxis2=dict(
+            title="Number of Customers",
+            overlaying='y',
+            side='right'
+        ),
+        height=400,
+        hovermode='x unified',
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+    )
+
+    st.plotly_chart(fig_ops, use_container_width=True)
 
 col1, col2, col3, col4 = st.columns(4)
 
@@ -149,25 +151,26 @@ with col1:
     st.subheader("Operational Excellence")
 
     # Uptime trend
-    fig_uptime = go.Figure()
-    fig_uptime.add_trace(go.Scatter(
-        x=operational['Year'],
-        y=operational['Uptime_%'],
-        mode='lines+markers',
-        line=dict(color='#00CC66', width=3),
-        fill='tozeroy',
-        fillcolor='rgba(0, 204, 102, 0.2)'
-    ))
-
-    fig_uptime.update_layout(
-        title="Uptime Performance",
-        xaxis_title="Year",
-        yaxis_title="Uptime %",
-        height=300,
-        yaxis=dict(range=[99, 100])
-    )
-
-    st.plotly_chart(fig_uptime, use_container_width=True)
+    with section("chart: uptime"):
+        fig_uptime = go.Figure()
+        fig_uptime.add_trace(go.Scatter(
+            x=operational['Year'],
+            y=operational['Uptime_%'],
+            mode='lines+markers',
+            line=dict(color='#00CC66', width=3),
+            fill='tozeroy',
+            fillcolor='rgba(0, 204, 102, 0.2)'
+        ))
+
+        fig_uptime.update_layout(
+            title="Uptime Performance",
+            xaxis_title="Year",
+            yaxis_title="Uptime %",
+            height=300,
+            yaxis=dict(range=[99, 100])
+        )
+
+        st.plotly_chart(fig_uptime, use_container_width=True)
 
     st.success(f"✅ World-class uptime: {operational.iloc[-1]['Uptime_%']}% in 2024")
 
@@ -175,24 +178,25 @@ with col2:
     st.subheader("Energy Efficiency")
 
     # PUE trend
-    fig_pue = go.Figure()
-    fig_pue.add_trace(go.Scatter(
-        x=operational['Year'],
-        y=operational['Power_Usage_Effectiveness_PUE'],
-        mode='lines+markers',
-        line=dict(color='#0066CC', width=3),
-        fill='tozeroy',
-        fillcolor='rgba(0, 102, 204, 0.2)'
-    ))
-
-    fig_pue.update_layout(
-        title="Power Usage Effectiveness (PUE)",
-        xaxis_title="Year",
-        yaxis_title="PUE (lower is better)",
-        height=300
-    )
-
-    st.plotly_chart(fig_pue, use_container_width=True)
+    with section("chart: PUE"):
+        fig_pue = go.Figure()
+        fig_pue.add_trace(go.Scatter(
+            x=operational['Year'],
+            y=operational['Power_Usage_Effectiveness_PUE'],
+            mode='lines+markers',
+            line=dict(color='#0066CC', width=3),
+            fill='tozeroy',
+            fillcolor='rgba(0, 102, 204, 0.2)'
+        ))
+
+        fig_pue.update_layout(
+            title="Power Usage Effectiveness (PUE)",
+            xaxis_title="Year",
+            yaxis_title="PUE (lower is better)",
+            height=300
+        )
+
+        st.plotly_chart(fig_pue, use_container_width=True)
 
     st.success(f"✅ Industry-leading PUE: {operational.iloc[-1]['Power_Usage_Effectiveness_PUE']} in 2024")
 
@@ -205,50 +209,53 @@ col1, col2 = st.columns(2)
 with col1:
     st.subheader("Average Revenue Per Customer (ARPC)")
 
-    fig_arpc = go.Figure()
-    fig_arpc.add_trace(go.Bar(
-        x=operational['Year'],
-        y=operational['Avg_Revenue_Per_Customer'],
-        marker_color='#0066CC',
-        text=[format_currency(x, 0) for x in operational['Avg_Revenue_Per_Customer']],
-        textposition='outside'
-    ))
-
-    fig_arpc.update_layout(
-        title="ARPC Growth Over Time",
-        xaxis_title="Year",
-        yaxis_title="ARPC ($)",
-        height=350
-    )
-
-    st.plotly_chart(fig_arpc, use_container_width=True)
+    with section("chart: ARPC"):
+        fig_arpc = go.Figure()
+        fig_arpc.add_trace(go.Bar(
+            x=operational['Year'],
+            y=operational['Avg_Revenue_Per_Customer'],
+            marker_color='#0066CC',
+            text=[format_currency(x, 0) for x in operational['Avg_Revenue_Per_Customer']],
+            textposition='outside'
+        ))
+
+        fig_arpc.update_layout(
+            title="ARPC Growth Over Time",
+            xaxis_title="Year",
+            yaxis_title="ARPC ($)",
+            height=350
+        )
+
+        st.plotly_chart(fig_arpc, use_container_width=True)
 
 with col2:
     st.subheader("Revenue Per Employee")
 
-    fig_rpe = go.Figure()
-    fig_rpe.add_trace(go.Bar(
-        x=operational['Year'],
-        y=operational['Revenue_Per_Employee'],
-        marker_color='#00CC66',
-        text=[format_currency(x, 0) for x in operational['Revenue_Per_Employee']],
-        textposition='outside'
-    ))
-
-    fig_rpe.update_layout(
-        title="Revenue Per Employee",
-        xaxis_title="Year",
-        yaxis_title="Revenue/Employee ($)",
-        height=350
-    )
-
-    st.plotly_chart(fig_rpe, use_container_width=True)
+    with section("chart: revenue per employee"):
+        fig_rpe = go.Figure()
+        fig_rpe.add_trace(go.Bar(
+            x=operational['Year'],
+            y=operational['Revenue_Per_Employee'],
+            marker_color='#00CC66',
+            text=[format_currency(x, 0) for x in operational['Revenue_Per_Employee']],
+            textposition='outside'
+        ))
+
+        fig_rpe.update_layout(
+            title="Revenue Per Employee",
+            xaxis_title="Year",
+            yaxis_title="Revenue/Employee ($)",
+            height=350
+        )
+
+        st.plotly_chart(fig_rpe, use_container_width=True)
 
 # Ownership Structure
 st.markdown("---")
 st.header("Ownership Structure & Cap Table")
 
-st.plotly_chart(create_ownership_chart(ownership), use_container_width=True)
+with section("chart: ownership"):
+    st.plotly_chart(create_ownership_chart(ownership), use_container_width=True)
 
 # Current cap table
 st.subheader("Current Ownership (Post-Series A)")
@@ -347,3 +354,6 @@ with col2:
 # Footer
 st.markdown("---")
 st.caption("AI Datacenter Vancouver | Confidential Information | 2025")
+
+profile_panel()
+diagnostics_panel()
@@ -4,8 +4,11 @@ Main entry point for the Streamlit application
 """
 import streamlit as st
 import pandas as pd
-from pathlib import Path
-import plotly.graph_objects as go
+
+from utils.calculations import format_currency, format_multiple
+from utils.data_store import load_datasets
+from utils.timing import start_page, section, diagnostics_panel
+from utils.profiling import start_profile, profile_panel
 
 # Page configuration - MUST be first Streamlit command
 st.set_page_config(
@@ -14,27 +17,8 @@ st.set_page_config(
     layout="wide",
     initial_sidebar_state="expanded"
 )
-
-# ============================================================================
-# HELPER FUNCTIONS
-# ============================================================================
-
-def format_currency(value, decimals=0):
-    """Format value as currency"""
-    if abs(value) >= 1_000_000:
-        return f"${value/1_000_000:.{decimals}f}M"
-    elif abs(value) >= 1_000:
-        return f"${value/1_000:.{decimals}f}K"
-    else:
-        return f"${value:,.{decimals}f}"
-
-def format_percentage(value, decimals=1):
-    """Format value as percentage"""
-    return f"{value:.{decimals}f}%"
-
-def format_multiple(value, decimals=2):
-    """Format value as multiple (e.g., 4.5x)"""
-    return f"{value:.{decimals}f}x"
+start_page("Home")
+start_profile("Home")
 
 # ============================================================================
 # CUSTOM CSS - COMPACT LAYOUT
@@ -122,17 +106,14 @@ st.markdown("""
 # DATA LOADING
 # ============================================================================
 
-@st.cache_data
 def load_data():
     """Load all CSV data files"""
     try:
-        data_path = Path(__file__).parent / "data"
-
-        roi_summary = pd.read_csv(data_path / "investor_roi_summary.csv")
-        financials = pd.read_csv(data_path / "financial_projections_2015_2030.csv")
-        funding_rounds = pd.read_csv(data_path / "funding_rounds_overview.csv")
-
-        return roi_summary, financials, funding_rounds
+        return load_datasets(
+            'investor_roi_summary',
+            'financial_projections_2015_2030',
+            'funding_rounds_overview'
+        )
     except FileNotFoundError as e:
         st.error(f"⚠️ Data file not found: {e}")
         st.info("Please ensure all CSV files are in the 'data' directory.")
@@ -142,7 +123,8 @@ def load_data():
         st.stop()
 
 # Load data
-roi_summary, financials, funding_rounds = load_data()
+with section("data load"):
+    roi_summary, financials, funding_rounds = load_data()
 
 # ============================================================================
 # SIDEBAR - NAVIGATION & FILTERS
@@ -250,32 +232,33 @@ with col2:
 st.markdown("---")
 st.subheader("Series B vs Series C Comparison")
 
-comparison_df = pd.DataFrame({
-    'Metric': ['Investment', 'Entry Valuation', 'MOIC', 'IRR', 'Hold Period'],
-    'Series B (2026)': [
-        format_currency(8000000),
-        format_currency(33000000),
-        '4.85x',
-        '48.4%',
-        '4 years'
-    ],
-    'Series C (2028)': [
-        format_currency(20000000),
-        format_currency(100000000),
-        '2.00x',
-        '41.4%',
-        '2 years'
-    ],
-    'Series B Advantage': [
-        '60% less capital',
-        '67% lower',
-        '2.85x higher',
-        '+7.0%',
-        'More time to exit'
-    ]
-})
-
-st.dataframe(comparison_df, use_container_width=True, hide_index=True)
+with section("comparison table"):
+    comparison_df = pd.DataFrame({
+        'Metric': ['Investment', 'Entry Valuation', 'MOIC', 'IRR', 'Hold Period'],
+        'Series B (2026)': [
+            format_currency(8000000),
+            format_currency(33000000),
+            '4.85x',
+            '48.4%',
+            '4 years'
+        ],
+        'Series C (2028)': [
+            format_currency(20000000),
+            format_currency(100000000),
+            '2.00x',
+            '41.4%',
+            '2 years'
+        ],
+        'Series B Advantage': [
+            '60% less capital',
+            '67% lower',
+            '2.85x higher',
+            '+7.0%',
+            'More time to exit'
+        ]
+    })
+
+    st.dataframe(comparison_df, use_container_width=True, hide_index=True)
 
 # ============================================================================
 # PAST INVESTOR RETURNS - COMPACT
@@ -369,3 +352,6 @@ st.success("""
 
 st.markdown("---")
 st.caption("AI Datacenter Vancouver | Confidential Investor Materials | 2025 | This dashboard contains forward-looking statements subject to risks and uncertainties.")
+
+profile_panel()
+diagnostics_panel()
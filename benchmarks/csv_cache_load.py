@@ -0,0 +1,69 @@
+"""
+Measure cold-start dataset load time: pd.read_csv vs the Arrow CSV cache
+
+A cold start is what every new server process (and every edit to a CSV) pays
+before the shared data store is populated. For each row count the projections
+dataset is repeated to size, then loaded with pd.read_csv, through a cache miss
+(parse + write) and through a cache hit (memory-mapped read).
+
+Usage:
+    python benchmarks/csv_cache_load.py --rows 10000 100000 1000000
+"""
+import argparse
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import pandas as pd
+
+from utils import csv_cache
+from utils.data_store import DATA_PATH
+
+DATASET = 'financial_projections_2015_2030'
+
+def best_of(func, repeat):
+    """Median wall time of func over repeat runs"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    source = pd.read_csv(DATA_PATH / f"{DATASET}.csv")
+    target = Path(tempfile.mkdtemp(prefix="pitchdash_csv_cache_"))
+
+    try:
+        print(f"{'rows':>10} {'read_csv':>12} {'cache miss':>12} {'cache hit':>12} {'speedup':>9}")
+        for rows in args.rows:
+            csv_path = target / f"{DATASET}_{rows}.csv"
+            repeats = -(-rows // len(source))
+            pd.concat([source] * repeats, ignore_index=True).head(rows).to_csv(csv_path, index=False)
+
+            def miss():
+                shutil.rmtree(target / csv_cache.CACHE_DIR_NAME, ignore_errors=True)
+                csv_cache.read_csv_cached(csv_path)
+
+            parse = best_of(lambda: pd.read_csv(csv_path), args.repeat)
+            cold = best_of(miss, args.repeat)
+            csv_cache.read_csv_cached(csv_path)
+            warm = best_of(lambda: csv_cache.read_csv_cached(csv_path), args.repeat)
+
+            print(f"{rows:>10,} {parse * 1000:>9.2f} ms {cold * 1000:>9.2f} ms "
+                  f"{warm * 1000:>9.2f} ms {parse / warm:>8.1f}x")
+    finally:
+        shutil.rmtree(target, ignore_errors=True)
+
+if __name__ == '__main__':
+    main()
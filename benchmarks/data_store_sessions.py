@@ -0,0 +1,112 @@
+"""
+Measure per-rerun load cost of st.cache_data copies vs the shared data store
+
+Simulates concurrent sessions that each load the datasets used by the app on
+every rerun, once through a per-page st.cache_data loader (a deserialized copy
+per hit) and once through utils.data_store (shared read-only frames).
+
+Usage:
+    python benchmarks/data_store_sessions.py --sessions 50 --reruns 20 --scale 1000
+"""
+import argparse
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import pandas as pd
+import streamlit as st
+
+from utils import data_store
+
+DATASETS = ['investor_roi_summary', 'funding_rounds_overview', 'financial_projections_2015_2030']
+
+def make_scaled_data(scale):
+    """Copy the datasets into a temp directory with every row repeated scale times"""
+    target = Path(tempfile.mkdtemp(prefix="pitchdash_bench_"))
+    for name in DATASETS:
+        frame = pd.read_csv(data_store.DATA_PATH / f"{name}.csv")
+        pd.concat([frame] * scale, ignore_index=True).to_csv(target / f"{name}.csv", index=False)
+    return target
+
+def run_sessions(load, sessions, reruns, trace_memory=False):
+    """Run sessions concurrently; return per-rerun latencies and peak traced memory"""
+    latencies = []
+    lock = threading.Lock()
+    # Every session holds its frames until all sessions have loaded, as overlapping reruns do
+    barrier = threading.Barrier(sessions)
+
+    def session():
+        for _ in range(reruns):
+            start = time.perf_counter()
+            frames = load()
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+            barrier.wait()
+            del frames
+
+    load()  # warm the cache so only hits are measured
+    if trace_memory:
+        tracemalloc.start()
+    threads = [threading.Thread(target=session) for _ in range(sessions)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    peak = 0
+    if trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return latencies, peak
+
+def summarize(label, latencies, peak):
+    latencies = sorted(latencies)
+    p95 = latencies[int(0.95 * (len(latencies) - 1))]
+    print(f"{label:<22} mean {statistics.mean(latencies) * 1000:8.3f} ms   "
+          f"p95 {p95 * 1000:8.3f} ms   peak {peak / 1_048_576:8.2f} MiB")
+    return statistics.mean(latencies), peak
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sessions', type=int, default=50)
+    parser.add_argument('--reruns', type=int, default=20)
+    parser.add_argument('--scale', type=int, default=1000, help="row multiplier for the sample CSVs")
+    args = parser.parse_args()
+
+    data_path = make_scaled_data(args.scale)
+    data_store.DATA_PATH = data_path
+
+    try:
+        @st.cache_data
+        def load_copies():
+            return tuple(pd.read_csv(data_path / f"{name}.csv") for name in DATASETS)
+
+        def load_shared():
+            return data_store.load_datasets(*DATASETS)
+
+        rows = sum(len(frame) for frame in load_shared())
+        print(f"{args.sessions} sessions x {args.reruns} reruns, {rows:,} rows across {len(DATASETS)} datasets")
+
+        # Time without tracemalloc (it slows allocation-heavy code), then trace one rerun per session
+        results = {}
+        for label, load in [("st.cache_data copies", load_copies), ("shared data store", load_shared)]:
+            latencies, _ = run_sessions(load, args.sessions, args.reruns)
+            _, peak = run_sessions(load, args.sessions, 1, trace_memory=True)
+            results[label] = summarize(label, latencies, peak)
+        before, after = results.values()
+
+        print(f"saved per rerun: {(before[0] - after[0]) * 1000:.3f} ms, "
+              f"peak memory saved: {(before[1] - after[1]) / 1_048_576:.2f} MiB")
+    finally:
+        shutil.rmtree(data_path, ignore_errors=True)
+
+if __name__ == '__main__':
+    main()
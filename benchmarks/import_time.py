@@ -0,0 +1,136 @@
+"""
+Report the import cost of app.py and each page
+
+Each script's module-level import statements are run in a fresh interpreter
+under `python -X importtime`, repeated to take the median, and the cumulative
+cost is grouped per top-level package (and per utils module). Imports inside
+functions - the lazy chart-drawing paths - are not part of startup and are
+not counted.
+
+Usage:
+    python benchmarks/import_time.py --repeat 5 --top 12 --json import_time.json
+    python benchmarks/import_time.py --baseline import_time.json --threshold 0.2
+"""
+import argparse
+import ast
+import json
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+def find_scripts():
+    """app.py plus the pages, from pages/ if present, else the repository root"""
+    pages_dir = ROOT / "pages" if (ROOT / "pages").is_dir() else ROOT
+    return [ROOT / "app.py"] + sorted(pages_dir.glob("[0-9]_*.py"))
+
+def module_level_imports(script):
+    """Source of the import statements a script runs at module level"""
+    tree = ast.parse(script.read_text(encoding='utf-8'))
+    imports = []
+
+    def visit(statements):
+        for node in statements:
+            if isinstance(node, (ast.Import, ast.ImportFrom)):
+                imports.append(ast.unparse(node))
+            elif isinstance(node, (ast.If, ast.Try, ast.With, ast.For, ast.While)):
+                for field in ('body', 'orelse', 'finalbody', 'handlers'):
+                    for child in getattr(node, field, []):
+                        visit(child.body if isinstance(child, ast.ExceptHandler) else [child])
+
+    visit(tree.body)
+    return "\n".join(imports)
+
+def group_name(module):
+    """Group key for a module: utils modules individually, others by top-level package"""
+    parts = module.split('.')
+    return '.'.join(parts[:2]) if parts[0] == 'utils' else parts[0]
+
+def _run_importtime(code):
+    """stderr of running code under -X importtime from the repository root"""
+    setup = f"import sys; sys.path.insert(0, {str(ROOT)!r})\n"
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', setup + code],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    return result.stderr
+
+def _top_level_modules(stderr):
+    """(module, cumulative us) for imports not nested in another import"""
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # Nested imports are indented two spaces per level; count top-level ones only
+        if not name[1:].startswith(' '):
+            yield name.strip(), int(cumulative)
+
+def profile_imports(code, startup=frozenset()):
+    """Run code under -X importtime; return ({group: cumulative ms}, total ms)"""
+    groups = defaultdict(float)
+    for module, cumulative in _top_level_modules(_run_importtime(code)):
+        if module not in startup:
+            groups[group_name(module)] += cumulative / 1000
+    return dict(groups), sum(groups.values())
+
+def profile_script(script, repeat, startup=frozenset()):
+    """Median per-group and total import time of a script over repeat runs"""
+    code = module_level_imports(script)
+    runs = [profile_imports(code, startup) for _ in range(repeat)]
+    names = set().union(*(groups for groups, _ in runs))
+    modules = {name: statistics.median(groups.get(name, 0.0) for groups, _ in runs) for name in names}
+    return {
+        'total_ms': statistics.median(total for _, total in runs),
+        'modules': dict(sorted(modules.items(), key=lambda item: -item[1]))
+    }
+
+def compare(report, baseline, threshold):
+    """Print scripts whose total import time grew by more than threshold; return them"""
+    regressions = []
+    for script, result in report.items():
+        if script not in baseline:
+            continue
+        before, after = baseline[script]['total_ms'], result['total_ms']
+        change = (after - before) / before if before else 0.0
+        flag = "REGRESSION" if change > threshold else ""
+        print(f"{script:<36} {before:9.1f} ms -> {after:9.1f} ms  {change:+7.1%}  {flag}")
+        if change > threshold:
+            regressions.append(script)
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--top', type=int, default=10, help="modules listed per script")
+    parser.add_argument('--json', type=Path, help="write the report to this file")
+    parser.add_argument('--baseline', type=Path, help="report to compare against")
+    parser.add_argument('--threshold', type=float, default=0.2, help="allowed relative slowdown")
+    args = parser.parse_args()
+
+    # Warm the bytecode cache so the first script is not charged for compilation
+    _run_importtime("import streamlit, pandas, numpy, plotly.graph_objects")
+    # Modules the interpreter loads before running any code (site, encodings, ...)
+    startup = frozenset(module for module, _ in _top_level_modules(_run_importtime("pass")))
+
+    report = {}
+    for script in find_scripts():
+        result = profile_script(script, args.repeat, startup)
+        report[script.name] = result
+        print(f"\n{script.name}: {result['total_ms']:.1f} ms")
+        for name, ms in list(result['modules'].items())[:args.top]:
+            print(f"  {name:<32} {ms:9.1f} ms")
+
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2, ensure_ascii=False))
+
+    if args.baseline:
+        print()
+        regressions = compare(report, json.loads(args.baseline.read_text()), args.threshold)
+        if regressions:
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
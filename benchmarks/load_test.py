@@ -0,0 +1,292 @@
+"""
+Multi-session load test against a locally started Streamlit server
+
+Starts `streamlit run app.py` headless, then drives N concurrent sessions
+over the same websocket protocol the browser uses. Every session walks a
+scripted journey through the dashboard (page visits plus widget changes such
+as sweeping the Investment Scenarios slider) and times each rerun from the
+request to the server's script_finished message.
+
+For every session count it reports p50/p95/p99 rerun latency, throughput in
+reruns per second and the server's resident memory (idle and peak), so the
+point where sessions start contending - for the GIL, or for memory through
+per-session copies of the loaded data - shows up as latency or RSS growing
+faster than N. The server is restarted for each session count so RSS starts
+from the same baseline.
+
+Usage:
+    python benchmarks/load_test.py
+    python benchmarks/load_test.py --sessions 1 10 50 100 --journeys 3 --json load_test.json
+    python benchmarks/load_test.py --url ws://127.0.0.1:8501 --sessions 5
+"""
+import argparse
+import asyncio
+import json
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState, WidgetStates
+
+ROOT = Path(__file__).parent.parent
+
+# Page visits per journey: (url path, widget changes); '' is the app.py landing page
+JOURNEY = [
+    ('', []),
+    ('Overview', []),
+    ('ROI_Analysis', [('Choose a round', name) for name in ['Seed', 'Series A', 'Series B', 'Series C']]),
+    ('Financial_Projections', [('Select View', view) for view in ['Historical Only', 'Projected Only']]),
+    ('Investment_Scenarios', (
+        [('Investment Amount', amount) for amount in range(500_000, 8_000_001, 2_500_000)]
+        + [('Exit Scenario', 'Optimistic (120% of IPO)'), ('Select Funding Round', 'Series C')]
+    )),
+    ('Company_Details', []),
+]
+
+# How each widget kind's value goes over the wire
+WIDGET_VALUES = {
+    'slider': lambda state, value: state.double_array_value.data.extend(
+        value if isinstance(value, (list, tuple)) else [value]),
+    'radio': lambda state, value: setattr(state, 'string_value', value),
+    'selectbox': lambda state, value: setattr(state, 'string_value', value),
+}
+
+FINISHED_EARLY_FOR_RERUN = 2
+
+def percentile(values, q):
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+def rss_mib(pid):
+    """Resident set size of a process in MiB, from /proc"""
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+class Server:
+    """`streamlit run app.py` in a subprocess, for use as a context manager"""
+
+    def __init__(self, port, timeout=60):
+        self.port = port
+        self.timeout = timeout
+        self.process = None
+        self.log = None
+
+    @property
+    def url(self):
+        return f"ws://127.0.0.1:{self.port}"
+
+    def __enter__(self):
+        # Log to a file: an unread pipe fills up and blocks the server mid-run
+        self.log = tempfile.TemporaryFile(mode='w+')
+        self.process = subprocess.Popen(
+            [sys.executable, '-m', 'streamlit', 'run', 'app.py',
+             '--server.headless', 'true', '--server.port', str(self.port),
+             '--server.fileWatcherType', 'none', '--browser.gatherUsageStats', 'false'],
+            cwd=ROOT, stdout=self.log, stderr=subprocess.STDOUT
+        )
+        deadline = time.monotonic() + self.timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                self.log.seek(0)
+                raise RuntimeError(f"streamlit exited: {self.log.read()}")
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{self.port}/_stcore/health", timeout=1):
+                    return self
+            except OSError:
+                time.sleep(0.2)
+        self.__exit__()
+        raise TimeoutError(f"streamlit did not start within {self.timeout}s")
+
+    def __exit__(self, *exc):
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+        self.log.close()
+
+class Session:
+    """One browser session: a websocket plus the widgets of the current page"""
+
+    def __init__(self, ws):
+        self.ws = ws
+        self.pages = {}
+        self.widgets = {}
+        self.states = {}
+        self.reruns = []
+        self.errors = []
+
+    async def rerun(self, page_hash, fragment_id=''):
+        """
+        Request a rerun with the current widget states; record its latency and payload
+
+        With fragment_id only that st.fragment reruns, as when the browser
+        reports a change to a widget inside it.
+        """
+        msg = BackMsg()
+        msg.rerun_script.page_script_hash = page_hash
+        msg.rerun_script.fragment_id = fragment_id
+        msg.rerun_script.widget_states.CopyFrom(WidgetStates(widgets=list(self.states.values())))
+
+        start = time.perf_counter()
+        await self.ws.send(msg.SerializeToString())
+        widgets, nbytes = {}, 0
+        while True:
+            raw = await self.ws.recv()
+            nbytes += len(raw)
+            forward = ForwardMsg()
+            forward.ParseFromString(raw)
+            kind = forward.WhichOneof('type')
+
+            if kind == 'navigation' and not self.pages:
+                self.pages = {page.url_pathname: page.page_script_hash for page in forward.navigation.app_pages}
+            elif kind == 'delta' and forward.delta.WhichOneof('type') == 'new_element':
+                element = forward.delta.new_element
+                element_kind = element.WhichOneof('type')
+                if element_kind == 'exception':
+                    self.errors.append(element.exception.message)
+                elif element_kind in WIDGET_VALUES:
+                    widget = getattr(element, element_kind)
+                    widgets[widget.label] = (element_kind, widget.id, forward.delta.fragment_id)
+            elif kind == 'script_finished' and forward.script_finished != FINISHED_EARLY_FOR_RERUN:
+                break
+
+        self.reruns.append({'latency_s': time.perf_counter() - start, 'bytes': nbytes, 'fragment': bool(fragment_id)})
+        # A fragment run only redraws the fragment's own widgets
+        self.widgets = {**self.widgets, **widgets} if fragment_id else widgets
+
+    def _widget_state(self, label, value):
+        """Set a widget's value; return the id of the fragment it belongs to ('' for none)"""
+        for name, (kind, widget_id, fragment_id) in self.widgets.items():
+            if name.startswith(label):
+                state = self.states.get(widget_id)
+                if state is None:
+                    state = self.states[widget_id] = WidgetState(id=widget_id)
+                state.ClearField('value')
+                WIDGET_VALUES[kind](state, value)
+                return fragment_id
+        raise LookupError(f"No widget labelled {label!r}")
+
+    async def visit(self, page, changes):
+        """Open a page, then apply each widget change as one rerun"""
+        self.states = {}
+        await self.rerun(self.pages.get(page, ''))
+        for label, value in changes:
+            fragment_id = self._widget_state(label, value)
+            await self.rerun(self.pages.get(page, ''), fragment_id)
+
+async def run_session(url, journeys, think_time):
+    """Connect one session and walk the journey; return the Session"""
+    async with websockets.connect(f"{url}/_stcore/stream", subprotocols=['streamlit'], max_size=None) as ws:
+        session = Session(ws)
+        await session.rerun('')  # first contact: receives the page list
+        for _ in range(journeys):
+            for page, changes in JOURNEY:
+                await asyncio.sleep(random.uniform(0, think_time))
+                await session.visit(page, changes)
+        return session
+
+async def sample_rss(pid, samples, interval=0.1):
+    while True:
+        samples.append(rss_mib(pid))
+        await asyncio.sleep(interval)
+
+async def load(url, sessions, journeys, think_time, pid=None):
+    """Run sessions concurrently; return the measurements of one load level"""
+    rss = []
+    sampler = asyncio.create_task(sample_rss(pid, rss)) if pid else None
+    start = time.perf_counter()
+    try:
+        results = await asyncio.gather(*(run_session(url, journeys, think_time) for _ in range(sessions)))
+    finally:
+        if sampler:
+            sampler.cancel()
+    elapsed = time.perf_counter() - start
+
+    latencies = [run['latency_s'] for session in results for run in session.reruns]
+    return {
+        'sessions': sessions,
+        'reruns': len(latencies),
+        'errors': sum(len(session.errors) for session in results),
+        'p50_s': percentile(latencies, 0.50),
+        'p95_s': percentile(latencies, 0.95),
+        'p99_s': percentile(latencies, 0.99),
+        'max_s': max(latencies),
+        'mean_bytes': statistics.mean(run['bytes'] for session in results for run in session.reruns),
+        'elapsed_s': elapsed,
+        'throughput_rps': len(latencies) / elapsed,
+        'peak_rss_mib': max(rss) if rss else None,
+    }
+
+def run_level(args, sessions):
+    """One load level, against args.url or a freshly started server"""
+    if args.url:
+        return asyncio.run(load(args.url, sessions, args.journeys, args.think_time))
+
+    with Server(free_port()) as server:
+        # One warm-up journey so imports and shared caches are not charged to the sessions
+        asyncio.run(run_session(server.url, 1, 0))
+        idle = rss_mib(server.process.pid)
+        result = asyncio.run(load(server.url, sessions, args.journeys, args.think_time, server.process.pid))
+    result['idle_rss_mib'] = idle
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sessions', type=int, nargs='+', default=[1, 5, 10, 25, 50],
+                        help="concurrent session counts to sweep")
+    parser.add_argument('--journeys', type=int, default=2, help="journeys per session")
+    parser.add_argument('--think-time', type=float, default=0.5,
+                        help="max random pause (s) before each page visit")
+    parser.add_argument('--url', help="use an already running server (no RSS figures)")
+    parser.add_argument('--json', type=Path, help="write the results to this file")
+    args = parser.parse_args()
+
+    reruns_per_journey = sum(1 + len(changes) for _, changes in JOURNEY)
+    print(f"{reruns_per_journey * args.journeys + 1} reruns per session\n")
+    print(f"{'sessions':>8} {'reruns':>7} {'errors':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+          f"{'reruns/s':>9} {'idle MiB':>9} {'peak MiB':>9} {'MiB/sess':>9}")
+
+    results = []
+    for sessions in args.sessions:
+        result = run_level(args, sessions)
+        results.append(result)
+        if args.url:
+            memory = f"{'-':>9} {'-':>9} {'-':>9}"
+        else:
+            idle, peak = result['idle_rss_mib'], result['peak_rss_mib']
+            memory = f"{idle:9.1f} {peak:9.1f} {(peak - idle) / sessions:9.1f}"
+        print(f"{sessions:>8} {result['reruns']:>7} {result['errors']:>6} "
+              f"{result['p50_s'] * 1000:9.1f} {result['p95_s'] * 1000:9.1f} {result['p99_s'] * 1000:9.1f} "
+              f"{result['throughput_rps']:9.2f} {memory}", flush=True)
+
+    # Flag the first level whose p95 is more than twice the single-session p95
+    base = results[0]['p95_s']
+    for result in results[1:]:
+        if result['p95_s'] > 2 * base:
+            print(f"\np95 more than doubled from {results[0]['sessions']} to {result['sessions']} sessions")
+            break
+
+    if args.json:
+        args.json.write_text(json.dumps({'journey': JOURNEY, 'results': results}, indent=2))
+
+if __name__ == '__main__':
+    main()
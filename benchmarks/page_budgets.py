@@ -0,0 +1,171 @@
+"""
+Per-page rerun latency budgets, measured headlessly with streamlit AppTest
+
+Each script (app.py and every page) is driven through a typical interaction
+sequence: sweeping the Investment Scenarios slider from $500K to $8M,
+cycling the ROI Analysis round radio, and so on. For every rerun it records
+wall time, the ForwardMsg bytes the script emitted for the frontend, and
+(in a second, traced pass) peak Python heap. A page fails when its first
+run, slowest rerun, peak memory or largest rerun payload exceeds its budget.
+
+Usage:
+    python benchmarks/page_budgets.py
+    python benchmarks/page_budgets.py --pages 4 --json page_budgets.json
+    python benchmarks/page_budgets.py --budgets my_budgets.json --no-memory
+"""
+import argparse
+import json
+import logging
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+from streamlit.runtime.forward_msg_queue import ForwardMsgQueue
+from streamlit.testing.v1 import AppTest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from import_time import find_scripts
+
+# Budget per script, keyed by 'app' or the page number
+DEFAULT_BUDGET = {'first_run_s': 5.0, 'rerun_s': 1.0, 'peak_mib': 128, 'rerun_bytes': 1_000_000}
+BUDGETS = {
+    '4': {'first_run_s': 10.0, 'rerun_s': 2.0, 'peak_mib': 256, 'rerun_bytes': 2_000_000},
+}
+
+def _widget(at, kind, label):
+    """First widget of a kind whose label starts with label"""
+    for widget in at.get(kind):
+        if widget.label.startswith(label):
+            return widget
+    raise LookupError(f"No {kind} labelled {label!r}")
+
+def _set(kind, label, value):
+    return lambda at: _widget(at, kind, label).set_value(value)
+
+def _rerun(at):
+    return at
+
+# Interaction steps per script; each step updates a widget and triggers one rerun
+SCENARIOS = {
+    'app': [_rerun],
+    '1': [_rerun],
+    '2': [_set('radio', "Choose a round", name)
+          for name in ['All Rounds', 'Seed', 'Series A', 'Series B', 'Series C', 'All Rounds']],
+    '3': [_set('radio', "Select View", view)
+          for view in ['Historical Only', 'Projected Only', 'Historical & Projected']],
+    '4': (
+        [_set('slider', "Investment Amount", amount) for amount in range(500_000, 8_000_001, 1_500_000)]
+        + [_set('radio', "Exit Scenario", scenario)
+           for scenario in ['Conservative (80% of IPO)', 'Optimistic (120% of IPO)', 'IPO (2030)']]
+        + [_set('selectbox', "Select Funding Round", 'Series C')]
+    ),
+    '5': [_rerun],
+}
+
+def script_key(script):
+    return 'app' if script.name == 'app.py' else script.name.split('_')[0]
+
+class _ByteCounter:
+    """Count the bytes of every ForwardMsg enqueued while active"""
+
+    def __init__(self):
+        self.total = 0
+        self._enqueue = ForwardMsgQueue.enqueue
+
+    def __enter__(self):
+        counter = self
+
+        def enqueue(queue, msg):
+            counter.total += msg.ByteSize()
+            return counter._enqueue(queue, msg)
+
+        ForwardMsgQueue.enqueue = enqueue
+        return self
+
+    def __exit__(self, *exc):
+        ForwardMsgQueue.enqueue = self._enqueue
+
+def drive(script, steps, timeout, trace_memory=False):
+    """Run a script and its interaction steps; return one measurement dict per run"""
+    at = AppTest.from_file(str(script), default_timeout=timeout)
+    runs = []
+
+    for step in [None] + steps:
+        target = at if step is None else step(at)
+        if trace_memory:
+            tracemalloc.start()
+        with _ByteCounter() as counter:
+            start = time.perf_counter()
+            target.run()
+            elapsed = time.perf_counter() - start
+        peak = 0
+        if trace_memory:
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+        if at.exception:
+            raise RuntimeError(f"{script.name} raised: {at.exception[0].message}")
+        runs.append({'wall_s': elapsed, 'bytes': counter.total, 'peak_mib': peak / 1_048_576})
+
+    return runs
+
+def check(key, runs, memory):
+    """Summarize runs and compare them against the script's budget"""
+    budget = {**DEFAULT_BUDGET, **BUDGETS.get(key, {})}
+    reruns = runs[1:] or runs
+    summary = {
+        'first_run_s': runs[0]['wall_s'],
+        'rerun_s': max(run['wall_s'] for run in reruns),
+        'rerun_bytes': max(run['bytes'] for run in reruns),
+    }
+    if memory:
+        summary['peak_mib'] = max(run['peak_mib'] for run in memory)
+
+    over = [metric for metric, value in summary.items() if value > budget[metric]]
+    return summary, budget, over
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', nargs='+', help="only these scripts ('app' or page numbers)")
+    parser.add_argument('--budgets', type=Path, help="JSON file of per-script budget overrides")
+    parser.add_argument('--timeout', type=float, default=120, help="seconds allowed per rerun")
+    parser.add_argument('--no-memory', action='store_true', help="skip the traced peak-memory pass")
+    parser.add_argument('--json', type=Path, help="write per-run measurements to this file")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    if args.budgets:
+        for key, overrides in json.loads(args.budgets.read_text()).items():
+            BUDGETS.setdefault(key, {}).update(overrides)
+
+    report = {}
+    failures = []
+    for script in find_scripts():
+        key = script_key(script)
+        if args.pages and key not in args.pages:
+            continue
+
+        steps = SCENARIOS.get(key, [_rerun])
+        runs = drive(script, steps, args.timeout)
+        memory = None if args.no_memory else drive(script, steps, args.timeout, trace_memory=True)
+        summary, budget, over = check(key, runs, memory)
+
+        report[script.name] = {'summary': summary, 'budget': budget, 'runs': runs, 'memory_runs': memory}
+        print(f"\n{script.name} ({len(runs) - 1} reruns)")
+        for metric, value in summary.items():
+            flag = "  OVER BUDGET" if metric in over else ""
+            print(f"  {metric:<12} {value:14,.3f}   budget {budget[metric]:>12,}{flag}")
+        if over:
+            failures.append(script.name)
+
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2, ensure_ascii=False))
+
+    if failures:
+        print(f"\nOver budget: {', '.join(failures)}")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,414 @@
+"""
+Micro-benchmarks for utils.calculations and utils.visualizations
+
+Every benchmark runs on fixed synthetic inputs (seeded) at the sizes it
+supports out of 4 (one per funding round), 1k, 100k and 10M scenarios.
+Chart builders are timed twice: building the figure (uncached) and
+serializing it to JSON, which is what st.plotly_chart sends to the browser.
+
+Results are written as JSON and can be compared against a stored baseline;
+the run fails when a benchmark slows down by more than its threshold.
+benchmarks/baseline.json holds a full run (its 'meta' records the machine and
+library versions); regenerate it with --output when the reference changes.
+
+Usage:
+    python benchmarks/suite.py --baseline benchmarks/baseline.json
+    python benchmarks/suite.py --output benchmarks/baseline.json
+    python benchmarks/suite.py --sizes 4 1k 100k --baseline baseline.json --threshold 0.25
+    python benchmarks/suite.py --filter format --threshold-for format_currency_array@10M=0.5
+"""
+import argparse
+import inspect
+import json
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import numpy as np
+import pandas as pd
+import plotly
+import plotly.io as pio
+
+from utils import calculations, visualizations
+from utils.cap_table import CapTable, DATA_PATH
+from utils.follow_on import enumerate_follow_ons
+from utils.forecasting import forecast_revenue
+from utils.projections import baseline_drivers, adjust_drivers, project_financials, sample_assumptions
+from utils.reserves import optimize_reserves, payout_multiples
+from utils.scenario_table import ScenarioTable, EXIT_SCENARIOS, EXIT_YEAR
+from utils.simulation import simulate_exit_returns, constant, lognormal, discrete
+from utils.waterfall import Waterfall
+from utils.xirr import quarter_midpoint
+
+SIZES = {'4': 4, '1k': 1_000, '100k': 100_000, '10M': 10_000_000}
+
+ROUNDS = ['Seed', 'Series A', 'Series B', 'Series C']
+
+BENCHMARKS = {}
+
+def benchmark(name, sizes):
+    """Register a benchmark; the decorated function takes n and returns a zero-argument callable"""
+    def register(setup):
+        BENCHMARKS[name] = (setup, sizes)
+        return setup
+    return register
+
+def _rng():
+    return np.random.default_rng(20240101)
+
+def _round_frame(n):
+    """roi_summary-like frame with n rounds"""
+    rng = _rng()
+    return pd.DataFrame({
+        'Round': [ROUNDS[i] if n <= len(ROUNDS) else f"Round {i}" for i in range(n)],
+        'MOIC': rng.uniform(1, 40, n),
+        'IRR_%': rng.uniform(10, 80, n)
+    })
+
+def _financials_frame(n):
+    """financial_projections-like frame with n years"""
+    rng = _rng()
+    year = 2015 + np.arange(n)
+    revenue = 1e6 * (1 + 0.5 * np.arange(n)) * rng.uniform(0.9, 1.1, n)
+    return pd.DataFrame({
+        'Year': year,
+        'Revenue': revenue,
+        'Company_Valuation': revenue * rng.uniform(5, 15, n),
+        'Status': np.where(year <= 2024, 'Historical', 'Projected')
+    })
+
+def _ownership_frame(n):
+    """ownership_evolution-like frame with n milestones"""
+    rng = _rng()
+    shares = rng.dirichlet(np.ones(4), n) * 100
+    return pd.DataFrame({
+        'Milestone': [f"Milestone {i}" for i in range(n)],
+        'Founders': shares[:, 0],
+        'Seed_Investors': shares[:, 1],
+        'Series_A_Investors': shares[:, 2],
+        'Series_B_Investors': shares[:, 3]
+    })
+
+def _surface(n):
+    """Sensitivity surface with n cells over 10 exit years"""
+    exit_years = np.arange(2027, 2037)
+    exit_valuations = np.linspace(50e6, 1e9, max(n // len(exit_years), 1))
+    return calculations.calculate_sensitivity_surface(
+        investment_amount=500_000, round_name='Series B', round_year=2026,
+        round_post_money_val=33_000_000, exit_valuations=exit_valuations, exit_years=exit_years
+    )
+
+# ROI functions
+
+@benchmark('calculate_roi', ['4', '1k'])
+def _(n):
+    rng = _rng()
+    inputs = list(zip(rng.uniform(1e5, 1e7, n), rng.uniform(1e6, 1e8, n), rng.uniform(1e8, 1e9, n),
+                      rng.uniform(1, 30, n), rng.uniform(0.5, 20, n), rng.integers(1, 15, n)))
+    return lambda: [calculations.calculate_roi(*args) for args in inputs]
+
+@benchmark('calculate_custom_investment_roi', ['4', '1k'])
+def _(n):
+    rng = _rng()
+    rounds = [ROUNDS[i % len(ROUNDS)] for i in range(n)]
+    amounts = rng.uniform(1e5, 1e7, n)
+    calculations.default_cap_table()  # load the cap table outside the timed loop
+    return lambda: [
+        calculations.calculate_custom_investment_roi(amount, name, 2015 + 2 * (i % 4), 33e6)
+        for i, (amount, name) in enumerate(zip(amounts, rounds))
+    ]
+
+@benchmark('calculate_roi_batch', ['4', '1k', '100k', '10M'])
+def _(n):
+    rng = _rng()
+    exit_valuation = rng.lognormal(np.log(240e6), 0.6, n)
+    years_held = rng.integers(1, 12, n)
+    dilution = rng.uniform(0.4, 1.0, n)
+    return lambda: calculations.calculate_roi_batch(500_000, 33e6, exit_valuation, years_held, dilution)
+
+@benchmark('calculate_sensitivity_surface', ['1k', '100k'])
+def _(n):
+    return lambda: _surface(n)
+
+@benchmark('simulate_exit_returns', ['1k', '100k', '10M'])
+def _(n):
+    return lambda: simulate_exit_returns(
+        500_000, 33e6, 2026,
+        exit_valuation=lognormal(240e6, 0.6), exit_year=discrete([2029, 2030, 2031]),
+        dilution_factor=constant(0.67), n_paths=n
+    )
+
+@benchmark('calculate_exit_year_returns', ['4', '1k', '100k'])
+def _(n):
+    # Every round and exit year of the valuation curve for n check sizes
+    financials = pd.read_csv(DATA_PATH / "financial_projections_2015_2030.csv")
+    cap_table = CapTable.from_funding_rounds(pd.read_csv(DATA_PATH / "funding_rounds_overview.csv"))
+    amounts = _rng().uniform(1e5, 2e7, n)
+    return lambda: calculations.calculate_exit_year_returns(
+        amounts, financials['Year'].to_numpy(), financials['Company_Valuation'].to_numpy(), cap_table=cap_table
+    )
+
+@benchmark('project_financials', ['4', '1k', '100k'])
+def _(n):
+    drivers = baseline_drivers(pd.read_csv(DATA_PATH / "financial_projections_2015_2030.csv"))
+    assumptions = sample_assumptions(n, seed=20240101)
+    return lambda: project_financials(drivers['base_revenue'], *adjust_drivers(drivers, *assumptions))
+
+@benchmark('forecast_revenue', ['4', '1k'])
+def _(n):
+    # n business units with ten years of monthly history, fitted uncached
+    rng = _rng()
+    history = np.exp(np.log(1e6) + np.cumsum(rng.normal(0.02, 0.03, (n, 120)), axis=1))
+    return lambda: forecast_revenue.uncached(history, 72)
+
+@benchmark('enumerate_follow_ons', ['4', '1k', '100k'])
+def _(n):
+    # A Seed check with about n strategies: round(n ** (1/3)) levels in each of the three later private rounds
+    funding_rounds = pd.read_csv(DATA_PATH / "funding_rounds_overview.csv")
+    cap_table = CapTable.from_funding_rounds(funding_rounds)
+    dates = dict(zip(funding_rounds['Round'], funding_rounds['Date'].map(quarter_midpoint)))
+    waterfall = Waterfall.from_funding_rounds(funding_rounds, cap_table)
+    levels = np.linspace(0, 1, max(2, round(n ** (1 / 3))))
+    return lambda: enumerate_follow_ons(cap_table, 'Seed', 250_000, dates, 240e6, levels=levels, waterfall=waterfall)
+
+@benchmark('optimize_reserves', ['4', '1k'])
+def _(n):
+    # A $10M budget split over Series B and Series C on n grid points per round
+    # (n ** 2 allocations), maximizing expected IRR over the exit scenarios
+    funding_rounds = pd.read_csv(DATA_PATH / "funding_rounds_overview.csv")
+    waterfall = Waterfall.from_funding_rounds(funding_rounds, CapTable.from_funding_rounds(funding_rounds))
+    terms = funding_rounds.set_index('Round').loc[['Series_B', 'Series_C']]
+    raised = terms['Amount_Raised'].to_numpy(dtype=float)
+    multiples = payout_multiples(waterfall, ['Series B', 'Series C'], raised, list(EXIT_SCENARIOS.values()))
+    years_held = EXIT_YEAR - terms['Year'].to_numpy(dtype=float)
+    return lambda: optimize_reserves(10e6, multiples, years_held, [2, 1, 1], raised, n_steps=n, objective='irr')
+
+@benchmark('waterfall_payouts', ['1k', '100k', '10M'])
+def _(n):
+    # Every share class at n exit values; the breakpoints are built outside the timed loop
+    funding_rounds = pd.read_csv(DATA_PATH / "funding_rounds_overview.csv")
+    waterfall = Waterfall.from_funding_rounds(funding_rounds, CapTable.from_funding_rounds(funding_rounds))
+    exit_values = _rng().uniform(0, 5e8, n)
+    return lambda: waterfall.payouts(exit_values)
+
+@benchmark('ScenarioTable', ['4'])
+def _(n):
+    funding_rounds = pd.read_csv(DATA_PATH / "funding_rounds_overview.csv")
+    cap_table = CapTable.from_funding_rounds(funding_rounds)
+    return lambda: ScenarioTable(funding_rounds, cap_table)
+
+@benchmark('scenario_table_lookup', ['4', '1k'])
+def _(n):
+    funding_rounds = pd.read_csv(DATA_PATH / "funding_rounds_overview.csv")
+    table = ScenarioTable(funding_rounds, CapTable.from_funding_rounds(funding_rounds))
+    rng = _rng()
+    states = [('Series B', int(amount) * 100_000, scenario)
+              for amount, scenario in zip(rng.integers(5, 81, n), rng.choice(list(EXIT_SCENARIOS), n))]
+    return lambda: [
+        (table.lookup(*state), table.comparison(*state), table.sensitivity(*state[:2]))
+        for state in states
+    ]
+
+# Formatting helpers
+
+# Typical values per kind: signed amounts from $1 to $1B, percentages, multiples
+FORMAT_INPUTS = {
+    'currency': lambda rng, n: rng.lognormal(12, 3, n) * rng.choice([-1, 1], n),
+    'percentage': lambda rng, n: rng.normal(30, 40, n),
+    'multiple': lambda rng, n: rng.lognormal(1, 1, n),
+}
+
+for _name, _make_values in FORMAT_INPUTS.items():
+    _scalar = getattr(calculations, f"format_{_name}")
+    _vector = getattr(calculations, f"format_{_name}_array")
+
+    @benchmark(f"format_{_name}", ['4', '1k', '100k'])
+    def _(n, scalar=_scalar, make_values=_make_values):
+        values = make_values(_rng(), n).tolist()
+        return lambda: [scalar(value) for value in values]
+
+    @benchmark(f"format_{_name}_array", ['4', '1k', '100k', '10M'])
+    def _(n, vector=_vector, make_values=_make_values):
+        values = make_values(_rng(), n)
+        return lambda: vector(values)
+
+# Chart builders: construction and JSON serialization
+
+def _check_size_curves(n):
+    """Net return curves of the three exit scenarios over n check sizes"""
+    amounts = np.linspace(500_000, 8_000_000, n)
+    curves = {scenario: amounts * (valuation / 33e6 * 0.67 - 1) for scenario, valuation in EXIT_SCENARIOS.items()}
+    return amounts, curves, amounts[n // 2]
+
+def _fan_bands(n):
+    """Projection bands and history with n years each"""
+    rng = _rng()
+    years = 2025 + np.arange(n)
+    paths = np.cumprod(1 + rng.normal(0.3, 0.1, (200, n)), axis=1) * 1e7
+    bands = {p: np.percentile(paths, p, axis=0) for p in (10, 25, 50, 75, 90)}
+    history = (years - n, np.linspace(1e6, 1e7, n))
+    return years, bands, bands[50] * 1.1, "Revenue", "Revenue ($)", "Selected Assumptions", history
+
+def _exit_year_curves(n):
+    """MOIC and IRR of one stake over n exit years"""
+    exit_years = 2027 + np.arange(n)
+    moic = np.linspace(1.2, 6.0, n)
+    irr = (moic ** (1 / np.arange(1, n + 1)) - 1) * 100
+    return exit_years, moic, irr, exit_years[int(irr.argmax())], exit_years[-1], "Series B Returns by Exit Year"
+
+def _waterfall_payouts(n):
+    """Payouts of every share class at n exit values"""
+    funding_rounds = pd.read_csv(DATA_PATH / "funding_rounds_overview.csv")
+    waterfall = Waterfall.from_funding_rounds(funding_rounds, CapTable.from_funding_rounds(funding_rounds))
+    exit_values = np.linspace(0, 5e8, n)
+    markers = {label.split(' (')[0]: value for label, value in EXIT_SCENARIOS.items()}
+    return exit_values, waterfall.payouts(exit_values), waterfall.classes, 'Series B', markers
+
+def _follow_on_strategies(n):
+    """n follow-on strategies with their capital deployed, XIRR and MOIC"""
+    rng = _rng()
+    deployed = rng.uniform(250_000, 5_000_000, n)
+    irr = rng.uniform(30, 60, n)
+    return deployed, irr, rng.uniform(2, 20, n), [f"Strategy {i}" for i in range(n)], int(irr.argmax())
+
+def _reserve_surface(n):
+    """Expected MOIC over a two-round allocation grid of about n cells"""
+    steps = max(int(np.sqrt(n)), 2)
+    amounts = np.linspace(0, 10e6, steps)
+    surface = 1 + amounts[:, None] / 4e6 + amounts[None, :] / 1e7
+    surface[amounts[:, None] + amounts[None, :] > 10e6] = np.nan
+    return amounts, surface, np.unravel_index(np.nanargmax(surface), surface.shape), ['Series B', 'Series C']
+
+# Every chart builder in visualizations, with a function of n returning its positional arguments
+CHARTS = {
+    'create_roi_comparison_chart': (lambda n: (_round_frame(n),), ['4', '1k']),
+    'create_irr_comparison_chart': (lambda n: (_round_frame(n),), ['4', '1k']),
+    'create_valuation_revenue_chart': (lambda n: (_financials_frame(n),), ['4', '1k', '100k']),
+    'create_ownership_chart': (lambda n: (_ownership_frame(n),), ['4', '1k']),
+    'create_metric_card_figure': (lambda n: (4.85, "MOIC", 0.35, "", "x"), ['4']),
+    'create_sensitivity_heatmap': (lambda n: (_surface(n),), ['1k', '100k']),
+    'create_moic_distribution_chart': (
+        lambda n: (simulate_exit_returns(500_000, 33e6, 2026, lognormal(240e6, 0.6), constant(2030),
+                                         constant(0.67), n_paths=n),),
+        ['1k', '100k']
+    ),
+    'create_check_size_chart': (_check_size_curves, ['4', '1k']),
+    'create_projection_fan_chart': (_fan_bands, ['4', '1k']),
+    'create_exit_year_chart': (_exit_year_curves, ['4', '1k']),
+    'create_waterfall_chart': (_waterfall_payouts, ['1k', '100k']),
+    'create_follow_on_chart': (_follow_on_strategies, ['4', '1k']),
+    'create_reserve_heatmap': (_reserve_surface, ['1k', '100k']),
+}
+
+# A new builder needs an input here before the suite runs
+_unregistered = sorted(
+    name for name, member in inspect.getmembers(visualizations, inspect.isfunction)
+    if name.startswith('create_') and member.__module__ == visualizations.__name__ and name not in CHARTS
+)
+if _unregistered:
+    raise RuntimeError(f"Chart builders without benchmark inputs in CHARTS: {', '.join(_unregistered)}")
+
+for _name, (_make_args, _sizes) in CHARTS.items():
+    # Time the builder itself, not the figure cache in front of it
+    _builder = getattr(getattr(visualizations, _name), 'uncached', getattr(visualizations, _name))
+
+    @benchmark(f"{_name}.build", _sizes)
+    def _(n, builder=_builder, make_args=_make_args):
+        args = make_args(n)
+        return lambda: builder(*args)
+
+    @benchmark(f"{_name}.to_json", _sizes)
+    def _(n, builder=_builder, make_args=_make_args):
+        fig = builder(*make_args(n))
+        return lambda: pio.to_json(fig, validate=False)
+
+def measure(func, min_time=0.2, max_repeat=50, min_repeat=3):
+    """Per-call timings: repeat until min_time has elapsed (at least min_repeat runs)"""
+    func()  # warm-up
+    timings = []
+    started = time.perf_counter()
+    while len(timings) < min_repeat or (time.perf_counter() - started < min_time and len(timings) < max_repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return {
+        'median_s': statistics.median(timings),
+        'min_s': min(timings),
+        'repeats': len(timings)
+    }
+
+def run(sizes, name_filter=None, min_time=0.2):
+    """Run the selected benchmarks; return {'name@size': timings}"""
+    results = {}
+    for name, (setup, supported) in BENCHMARKS.items():
+        if name_filter and name_filter not in name:
+            continue
+        for size in supported:
+            if size not in sizes:
+                continue
+            key = f"{name}@{size}"
+            results[key] = measure(setup(SIZES[size]), min_time=min_time)
+            print(f"{key:<52} {results[key]['median_s'] * 1000:12.3f} ms  (x{results[key]['repeats']})", flush=True)
+    return results
+
+def compare(results, baseline, threshold, overrides):
+    """Print the change per benchmark against baseline; return keys over their threshold"""
+    regressions = []
+    print(f"\n{'benchmark':<52} {'baseline':>12} {'current':>12} {'change':>8}")
+    for key, result in results.items():
+        if key not in baseline:
+            continue
+        before, after = baseline[key]['median_s'], result['median_s']
+        change = after / before - 1 if before else 0.0
+        limit = overrides.get(key, overrides.get(key.split('@')[0], threshold))
+        flag = "  REGRESSION" if change > limit else ""
+        print(f"{key:<52} {before * 1000:9.3f} ms {after * 1000:9.3f} ms {change:+8.1%}{flag}")
+        if change > limit:
+            regressions.append(key)
+    return regressions
+
+def _parse_override(text):
+    name, _, value = text.partition('=')
+    return name, float(value)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', nargs='+', choices=list(SIZES), default=list(SIZES))
+    parser.add_argument('--filter', help="only run benchmarks whose name contains this")
+    parser.add_argument('--min-time', type=float, default=0.2, help="seconds to spend per benchmark")
+    parser.add_argument('--output', type=Path, help="write results to this JSON file")
+    parser.add_argument('--baseline', type=Path, help="results file to compare against")
+    parser.add_argument('--threshold', type=float, default=0.25, help="allowed relative slowdown")
+    parser.add_argument('--threshold-for', type=_parse_override, action='append', default=[],
+                        metavar='NAME=VALUE', help="threshold for one benchmark (name or name@size)")
+    args = parser.parse_args()
+
+    results = run(set(args.sizes), args.filter, args.min_time)
+
+    if args.output:
+        args.output.write_text(json.dumps({
+            'meta': {
+                'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                'python': platform.python_version(),
+                'numpy': np.__version__,
+                'pandas': pd.__version__,
+                'plotly': plotly.__version__,
+                'machine': platform.machine()
+            },
+            'results': results
+        }, indent=2))
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())['results']
+        regressions = compare(results, baseline, args.threshold, dict(args.threshold_for))
+        if regressions:
+            print(f"\n{len(regressions)} regression(s)")
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
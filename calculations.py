@@ -4,6 +4,86 @@ Utility functions for investor ROI calculations and financial analysis
 import pandas as pd
 import numpy as np
 
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    pa = None
+
+from utils.cap_table import default_cap_table
+
+def _roi_columns(investment_amount, exit_value, years_held):
+    """
+    Compute return metrics column-wise for broadcast arrays
+
+    Args:
+        investment_amount: Array of amounts invested
+        exit_value: Array of investor proceeds at exit
+        years_held: Array of holding periods in years
+
+    Returns:
+        Tuple of (absolute_return, moic, irr) arrays
+    """
+    investment_amount = np.asarray(investment_amount, dtype=float)
+    exit_value = np.asarray(exit_value, dtype=float)
+    years_held = np.asarray(years_held, dtype=float)
+
+    absolute_return = exit_value - investment_amount
+
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        moic = np.where(investment_amount > 0, exit_value / investment_amount, 0.0)
+        has_irr = (years_held > 0) & (moic > 0)
+        exponent = np.divide(1.0, years_held, out=np.zeros_like(years_held), where=years_held > 0)
+        irr = np.where(has_irr, (np.power(moic, exponent) - 1) * 100, 0.0)
+
+    return absolute_return, moic, irr
+
+def calculate_roi_batch(investment_amount, round_post_money_val, exit_valuation,
+                        years_held, dilution_factor=1.0):
+    """
+    Calculate ROI metrics for many investment scenarios in one vectorized pass
+
+    All arguments accept scalars, NumPy arrays or pandas Series and are
+    broadcast against each other, so a full scenario grid can be evaluated
+    without building a dictionary per scenario.
+
+    Args:
+        investment_amount: Amounts invested
+        round_post_money_val: Post-money valuations at entry
+        exit_valuation: Company valuations at exit
+        years_held: Holding periods in years (exit year - round year)
+        dilution_factor: Ratio of exit ownership to entry ownership
+
+    Returns:
+        Dictionary of equally shaped arrays with the same keys as calculate_roi
+    """
+    investment_amount, round_post_money_val, exit_valuation, years_held, dilution_factor = (
+        np.broadcast_arrays(
+            np.asarray(investment_amount, dtype=float),
+            np.asarray(round_post_money_val, dtype=float),
+            np.asarray(exit_valuation, dtype=float),
+            np.asarray(years_held, dtype=float),
+            np.asarray(dilution_factor, dtype=float),
+        )
+    )
+
+    ownership_pct = (investment_amount / round_post_money_val) * 100
+    final_ownership = ownership_pct * dilution_factor
+    exit_value = exit_valuation * (final_ownership / 100)
+
+    absolute_return, moic, irr = _roi_columns(investment_amount, exit_value, years_held)
+
+    return {
+        'investment': investment_amount,
+        'exit_value': exit_value,
+        'absolute_return': absolute_return,
+        'moic': moic,
+        'irr': irr,
+        'years_held': years_held,
+        'ownership_at_entry': ownership_pct,
+        'ownership_at_exit': final_ownership
+    }
+
 def calculate_roi(investment_amount, entry_valuation, exit_valuation, 
                   initial_ownership_pct, final_ownership_pct, years_held):
     """
@@ -21,27 +101,21 @@ def calculate_roi(investment_amount, entry_valuation, exit_valuation,
         Dictionary with ROI metrics
     """
     exit_value = exit_valuation * (final_ownership_pct / 100)
-    absolute_return = exit_value - investment_amount
-    moic = exit_value / investment_amount if investment_amount > 0 else 0
-
-    if years_held > 0 and moic > 0:
-        irr = (moic ** (1/years_held) - 1) * 100
-    else:
-        irr = 0
+    absolute_return, moic, irr = _roi_columns(investment_amount, exit_value, years_held)
 
     return {
         'investment': investment_amount,
         'exit_value': exit_value,
-        'absolute_return': absolute_return,
-        'moic': moic,
-        'irr': irr,
+        'absolute_return': absolute_return.item(),
+        'moic': moic.item(),
+        'irr': irr.item(),
         'years_held': years_held,
         'ownership_at_exit': final_ownership_pct
     }
 
 def calculate_custom_investment_roi(investment_amount, round_name, round_year, 
                                      round_post_money_val, exit_year=2030, 
-                                     exit_valuation=240000000):
+                                     exit_valuation=240000000, cap_table=None):
     """
     Calculate ROI for a custom investment amount in a specific round
 
@@ -52,35 +126,150 @@ def calculate_custom_investment_roi(investment_amount, round_name, round_year,
         round_post_money_val: Post-money valuation of the round
         exit_year: Year of exit (default 2030)
         exit_valuation: Exit valuation (default $240M)
+        cap_table: CapTable used to dilute the stake through later rounds
+            (default: built from data/funding_rounds_overview.csv)
 
     Returns:
         Dictionary with ROI metrics
     """
-    # Calculate ownership percentage based on investment amount
-    ownership_pct = (investment_amount / round_post_money_val) * 100
+    if cap_table is None:
+        cap_table = default_cap_table()
 
-    # Estimate dilution based on future rounds
-    dilution_factors = {
-        'Seed': 0.0902 / 25.0,  # Dilutes to 9.02% from 25%
-        'Series_A': 0.1443 / 28.57,  # Dilutes to 14.43% from 28.57%
-        'Series_B': 0.1616 / 24.24,  # Dilutes to 16.16% from 24.24%
-        'Series_C': 0.1667 / 20.0,  # Dilutes to 16.67% from 20%
+    years_held = exit_year - round_year
+
+    batch = calculate_roi_batch(
+        investment_amount=investment_amount,
+        round_post_money_val=round_post_money_val,
+        exit_valuation=exit_valuation,
+        years_held=years_held,
+        dilution_factor=cap_table.dilution_factor(round_name)
+    )
+
+    return {
+        'investment': investment_amount,
+        'exit_value': batch['exit_value'].item(),
+        'absolute_return': batch['absolute_return'].item(),
+        'moic': batch['moic'].item(),
+        'irr': batch['irr'].item(),
+        'years_held': years_held,
+        'ownership_at_exit': batch['ownership_at_exit'].item()
     }
 
-    dilution_factor = dilution_factors.get(round_name, 1.0)
-    final_ownership = ownership_pct * dilution_factor
+def calculate_sensitivity_surface(investment_amount, round_name, round_year,
+                                  round_post_money_val, exit_valuations, exit_years,
+                                  cap_table=None, waterfall=None):
+    """
+    Calculate returns over a grid of exit valuations and exit years
 
-    years_held = exit_year - round_year
+    The grid is evaluated in a single broadcast call to calculate_roi_batch.
+    Proceeds are the pro-rata split of the diluted stake, or the round's
+    waterfall payout when a waterfall is given.
 
-    return calculate_roi(
+    Args:
+        investment_amount: Investment amount
+        round_name: Name of funding round
+        round_year: Year of investment
+        round_post_money_val: Post-money valuation of the round
+        exit_valuations: 1-D array of exit valuations (rows of the surface)
+        exit_years: 1-D array of exit years (columns of the surface)
+        cap_table: CapTable used for dilution (default: built from the data directory)
+        waterfall: Waterfall of the cap table; its payout_factor replaces the
+            pro-rata dilution factor
+
+    Returns:
+        Dictionary with the grid axes and 2-D 'moic', 'irr' and 'exit_value' arrays
+        of shape (len(exit_valuations), len(exit_years))
+    """
+    if cap_table is None:
+        cap_table = default_cap_table()
+
+    exit_valuations = np.asarray(exit_valuations, dtype=float)
+    exit_years = np.asarray(exit_years)
+
+    if waterfall is None:
+        dilution_factor = cap_table.dilution_factor(round_name)
+    else:
+        entry_stake = cap_table.equity_sold[cap_table.round_index(round_name)]
+        dilution_factor = waterfall.payout_factor(round_name, entry_stake, exit_valuations)[:, None]
+
+    surface = calculate_roi_batch(
         investment_amount=investment_amount,
-        entry_valuation=round_post_money_val,
-        exit_valuation=exit_valuation,
-        initial_ownership_pct=ownership_pct,
-        final_ownership_pct=final_ownership,
-        years_held=years_held
+        round_post_money_val=round_post_money_val,
+        exit_valuation=exit_valuations[:, None],
+        years_held=(exit_years - round_year)[None, :],
+        dilution_factor=dilution_factor
     )
 
+    return {
+        'exit_valuations': exit_valuations,
+        'exit_years': exit_years,
+        'moic': surface['moic'],
+        'irr': surface['irr'],
+        'exit_value': surface['exit_value']
+    }
+
+def calculate_exit_year_returns(investment_amounts, exit_years, exit_valuations,
+                                rounds=None, cap_table=None):
+    """
+    Calculate returns for every round, check size and exit year at once
+
+    The valuation curve (e.g. Company_Valuation of the projections dataset)
+    gives the exit valuation of each year, and each stake is diluted by the
+    rounds that close before it exits. The grid is evaluated in a single
+    broadcast call to calculate_roi_batch.
+
+    Args:
+        investment_amounts: 1-D array of check sizes
+        exit_years: 1-D array of candidate exit years
+        exit_valuations: Company valuation in each exit year
+        rounds: Round names to evaluate (default: every round of the cap table)
+        cap_table: CapTable used for entry prices and dilution
+            (default: built from the data directory)
+
+    Returns:
+        Dictionary with the grid axes ('rounds', 'investment_amounts',
+        'exit_years'), 'moic', 'irr' and 'exit_value' arrays of shape
+        (n_rounds, n_amounts, n_years) - NaN where the exit is not after
+        entry - and, per round and check size, the exit year and value of
+        the highest IRR ('best_irr_year', 'best_irr') and MOIC
+        ('best_moic_year', 'best_moic'); NaN when no exit year is after entry
+    """
+    if cap_table is None:
+        cap_table = default_cap_table()
+
+    rounds = list(cap_table.round_names if rounds is None else rounds)
+    index = [cap_table.round_index(name) for name in rounds]
+    investment_amounts = np.asarray(investment_amounts, dtype=float)
+    exit_years = np.asarray(exit_years)
+    exit_valuations = np.asarray(exit_valuations, dtype=float)
+
+    years_held = exit_years[None, :] - cap_table.round_years[index][:, None]
+    grid = calculate_roi_batch(
+        investment_amount=investment_amounts[None, :, None],
+        round_post_money_val=cap_table.post_money_valuation[index][:, None, None],
+        exit_valuation=exit_valuations[None, None, :],
+        years_held=years_held[:, None, :],
+        dilution_factor=cap_table.dilution_by_exit_year(exit_years)[index][:, None, :]
+    )
+
+    valid = np.broadcast_to((years_held > 0)[:, None, :], grid['moic'].shape)
+    result = {
+        'rounds': rounds,
+        'investment_amounts': investment_amounts,
+        'exit_years': exit_years,
+        **{key: np.where(valid, grid[key], np.nan) for key in ('moic', 'irr', 'exit_value')}
+    }
+
+    has_exit = valid.any(axis=-1)
+    for metric in ('irr', 'moic'):
+        best = np.where(valid, grid[metric], -np.inf).argmax(axis=-1)
+        result[f'best_{metric}_year'] = np.where(has_exit, exit_years[best], np.nan)
+        result[f'best_{metric}'] = np.where(
+            has_exit, np.take_along_axis(grid[metric], best[..., None], axis=-1)[..., 0], np.nan
+        )
+
+    return result
+
 def format_currency(value, decimals=0):
     """Format value as currency"""
     if abs(value) >= 1_000_000:
@@ -97,3 +286,100 @@ def format_percentage(value, decimals=1):
 def format_multiple(value, decimals=2):
     """Format value as multiple (e.g., 4.5x)"""
     return f"{value:.{decimals}f}x"
+
+# Scaled values beyond this may be off by one unit after np.rint; format those in Python
+_EXACT_FIXED_LIMIT = 1e9
+
+def _format_fixed(values, scaled, decimals, prefix, suffix, scalar_format, force_scalar=None):
+    """
+    Format a float array as prefix + fixed-point digits + suffix, element-wise
+
+    Digits come from integer arithmetic and are joined with Arrow string
+    kernels. Elements where that could differ from Python's formatting (ties
+    after scaling, non-finite or very large values, force_scalar) are passed
+    to scalar_format instead, so the output matches the scalar formatter.
+
+    Args:
+        values: Original values, passed to scalar_format
+        scaled: Values to print with the given number of decimals
+        decimals: Number of decimal places
+        prefix: String prepended to every element
+        suffix: String appended to every element, or a (choices, codes) pair
+            picking choices[codes[i]] for element i
+        scalar_format: Scalar formatter used for the elements above
+        force_scalar: Optional boolean mask of elements to format with scalar_format
+
+    Returns:
+        Arrow-backed string array, or a list of strings without pyarrow
+    """
+    if pa is None:
+        return [scalar_format(value) for value in values.tolist()]
+
+    unit = 10 ** decimals
+    with np.errstate(invalid='ignore', over='ignore'):
+        shifted = scaled * unit
+        tie_distance = np.abs(np.abs(shifted - np.trunc(shifted)) - 0.5)
+        exact = np.isfinite(shifted) & (np.abs(shifted) < _EXACT_FIXED_LIMIT) & (tie_distance > 1e-6)
+    if force_scalar is not None:
+        exact &= ~force_scalar
+
+    units = np.abs(np.rint(np.where(exact, shifted, 0))).astype(np.int64)
+    whole, fraction = np.divmod(units, unit)
+    pieces = [prefix, pc.if_else(pa.array(np.signbit(scaled) & exact), '-', ''), pc.cast(pa.array(whole), pa.string())]
+    if decimals:
+        pieces += ['.', pc.utf8_lpad(pc.cast(pa.array(fraction), pa.string()), decimals, '0')]
+    if isinstance(suffix, str):
+        pieces.append(suffix)
+    else:
+        choices, codes = suffix
+        pieces.append(pc.take(pa.array(choices, type=pa.string()), pa.array(codes)))
+    text = pc.binary_join_element_wise(*pieces, '')
+
+    if not exact.all():
+        fallback = pa.array([scalar_format(value) for value in values[~exact].tolist()], type=pa.string())
+        text = pc.replace_with_mask(text, pa.array(~exact), fallback)
+    return pd.arrays.ArrowStringArray(text)
+
+def _as_series(values, text):
+    """Wrap formatted strings in a Series, keeping the index of Series input"""
+    if isinstance(values, pd.Series):
+        return pd.Series(text, index=values.index, name=values.name)
+    return pd.Series(text)
+
+def format_currency_array(values, decimals=0):
+    """
+    Vectorized format_currency
+
+    Args:
+        values: Array or Series of amounts
+        decimals: Number of decimal places
+
+    Returns:
+        Series of strings, identical to applying format_currency to each value
+    """
+    array = np.asarray(values, dtype=float)
+    magnitude = np.abs(array)
+    millions = magnitude >= 1_000_000
+    thousands = (magnitude >= 1_000) & ~millions
+    scaled = np.where(millions, array / 1_000_000, np.where(thousands, array / 1_000, array))
+    suffix_codes = millions * 2 + thousands
+
+    # Small amounts that round up to 1,000 need a thousands separator
+    unit = 10 ** decimals
+    grouped = ~millions & ~thousands & (np.abs(np.rint(array * unit)) >= 1_000 * unit)
+
+    text = _format_fixed(array, scaled, decimals, '$', (['', 'K', 'M'], suffix_codes),
+                         lambda value: format_currency(value, decimals), force_scalar=grouped)
+    return _as_series(values, text)
+
+def format_percentage_array(values, decimals=1):
+    """Vectorized format_percentage; returns a Series of strings"""
+    array = np.asarray(values, dtype=float)
+    text = _format_fixed(array, array, decimals, '', '%', lambda value: format_percentage(value, decimals))
+    return _as_series(values, text)
+
+def format_multiple_array(values, decimals=2):
+    """Vectorized format_multiple; returns a Series of strings"""
+    array = np.asarray(values, dtype=float)
+    text = _format_fixed(array, array, decimals, '', 'x', lambda value: format_multiple(value, decimals))
+    return _as_series(values, text)
@@ -0,0 +1,227 @@
+"""
+Cap table and dilution engine built from the funding rounds data
+"""
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+DATA_PATH = Path(__file__).parent.parent / "data"
+
+DEFAULT_FOUNDER_SHARES = 10_000_000
+
+def _round_key(round_name):
+    """Normalize round labels ('Series B' and 'Series_B' name the same round)"""
+    return round_name.replace(' ', '_')
+
+class CapTable:
+    """
+    Array-backed share ledger of stakeholders across funding rounds
+
+    Ownership after each round is the cumulative product of the retention
+    (1 - equity sold) of every round so far. Individual holders are stored
+    as flat arrays, so ownership for tens of thousands of holders is a
+    handful of vectorized operations.
+    """
+
+    def __init__(self, round_names, round_years, amount_raised, post_money_valuation,
+                 founder_shares=DEFAULT_FOUNDER_SHARES):
+        """
+        Args:
+            round_names: Funding round names in chronological order
+            round_years: Year of each round
+            amount_raised: New money raised in each round
+            post_money_valuation: Post-money valuation of each round
+            founder_shares: Shares outstanding before the first round
+        """
+        self.round_names = [_round_key(name) for name in round_names]
+        self.round_years = np.asarray(round_years, dtype=int)
+        self.amount_raised = np.asarray(amount_raised, dtype=float).copy()
+        self.post_money_valuation = np.asarray(post_money_valuation, dtype=float).copy()
+        self.founder_shares = float(founder_shares)
+        self._index = {name: i for i, name in enumerate(self.round_names)}
+
+        n_rounds = len(self.round_names)
+        self.equity_sold = np.empty(n_rounds)
+        self.retention = np.empty(n_rounds)
+        self.shares_outstanding = np.empty(n_rounds)
+        self.shares_issued = np.empty(n_rounds)
+        self.price_per_share = np.empty(n_rounds)
+
+        self._holder_round = np.empty(0, dtype=np.intp)
+        self._holder_amount = np.empty(0)
+        self._holder_shares = np.empty(0)
+
+        self._recompute_from(0)
+
+    @classmethod
+    def from_funding_rounds(cls, funding_rounds, founder_shares=DEFAULT_FOUNDER_SHARES):
+        """
+        Build a cap table from a funding rounds DataFrame
+
+        Args:
+            funding_rounds: DataFrame with columns ['Round', 'Year', 'Amount_Raised',
+                'Post_Money_Valuation'] (as in funding_rounds_overview.csv)
+            founder_shares: Shares outstanding before the first round
+
+        Returns:
+            CapTable
+        """
+        ordered = funding_rounds.sort_values('Year', kind='stable')
+        return cls(
+            round_names=ordered['Round'].tolist(),
+            round_years=ordered['Year'].to_numpy(),
+            amount_raised=ordered['Amount_Raised'].to_numpy(),
+            post_money_valuation=ordered['Post_Money_Valuation'].to_numpy(),
+            founder_shares=founder_shares
+        )
+
+    @property
+    def stakeholders(self):
+        """Stakeholder groups: founders followed by each round's investors"""
+        return ['Founders'] + self.round_names
+
+    def round_index(self, round_name):
+        """Position of a round in chronological order"""
+        return self._index[_round_key(round_name)]
+
+    def _recompute_from(self, start):
+        """Recompute the ledger for rounds at or after start"""
+        self.equity_sold[start:] = self.amount_raised[start:] / self.post_money_valuation[start:]
+
+        previous_retention = self.retention[start - 1] if start > 0 else 1.0
+        self.retention[start:] = previous_retention * np.cumprod(1 - self.equity_sold[start:])
+
+        self.shares_outstanding[start:] = self.founder_shares / self.retention[start:]
+        previous_outstanding = self.shares_outstanding[start - 1] if start > 0 else self.founder_shares
+        self.shares_issued[start:] = np.diff(self.shares_outstanding[start:], prepend=previous_outstanding)
+        self.price_per_share[start:] = self.post_money_valuation[start:] / self.shares_outstanding[start:]
+
+        downstream = self._holder_round >= start
+        self._holder_shares[downstream] = (
+            self._holder_amount[downstream] / self.price_per_share[self._holder_round[downstream]]
+        )
+
+    def update_round(self, round_name, amount_raised=None, post_money_valuation=None):
+        """
+        Edit one round and recompute only that round and the rounds after it
+
+        Args:
+            round_name: Round to edit
+            amount_raised: New amount raised (unchanged if None)
+            post_money_valuation: New post-money valuation (unchanged if None)
+        """
+        i = self.round_index(round_name)
+        if amount_raised is not None:
+            self.amount_raised[i] = amount_raised
+        if post_money_valuation is not None:
+            self.post_money_valuation[i] = post_money_valuation
+        self._recompute_from(i)
+
+    def ownership_matrix(self):
+        """
+        Ownership of each stakeholder group after each round
+
+        Returns:
+            Array of shape (len(stakeholders), n_rounds) with fractions of the company
+        """
+        retention = self.retention
+        # Investors in round k own equity_sold[k] after round k, diluted by later rounds
+        later_dilution = retention[None, :] / retention[:, None]
+        investors = np.triu(self.equity_sold[:, None] * later_dilution)
+        return np.vstack([retention[None, :], investors])
+
+    def dilution_factor(self, round_name, through_round=None):
+        """
+        Ratio of ownership after through_round to ownership at entry
+
+        Args:
+            round_name: Round in which the stake was acquired
+            through_round: Last round to dilute through (default: final round)
+
+        Returns:
+            Dilution factor (1.0 means no dilution)
+        """
+        entry = self.round_index(round_name)
+        last = len(self.round_names) - 1 if through_round is None else self.round_index(through_round)
+        if last <= entry:
+            return 1.0
+        return float(self.retention[last] / self.retention[entry])
+
+    def dilution_by_exit_year(self, exit_years):
+        """
+        Dilution factor of every round's stake at each exit year
+
+        A stake is diluted by every later round that closes in or before the
+        exit year.
+
+        Args:
+            exit_years: 1-D array of exit years
+
+        Returns:
+            Array of shape (n_rounds, len(exit_years)); 1.0 where no later
+            round has closed yet
+        """
+        exit_years = np.asarray(exit_years)
+        last = np.searchsorted(self.round_years, exit_years, side='right') - 1
+        entry = np.arange(len(self.round_names))[:, None]
+        through = np.maximum(last[None, :], entry)
+        return self.retention[through] / self.retention[entry]
+
+    def dilution_factors(self):
+        """Dilution factor to the final round for every round"""
+        factors = self.retention[-1] / self.retention
+        return dict(zip(self.round_names, factors.tolist()))
+
+    def add_holders(self, round_name, amounts):
+        """
+        Register individual holders who invested in a round
+
+        Args:
+            round_name: Round the holders invested in
+            amounts: Array of amounts invested, one per holder
+
+        Returns:
+            Array of holder ids
+        """
+        amounts = np.asarray(amounts, dtype=float)
+        i = self.round_index(round_name)
+        first_id = len(self._holder_amount)
+
+        self._holder_round = np.concatenate([self._holder_round, np.full(len(amounts), i, dtype=np.intp)])
+        self._holder_amount = np.concatenate([self._holder_amount, amounts])
+        self._holder_shares = np.concatenate([self._holder_shares, amounts / self.price_per_share[i]])
+
+        return np.arange(first_id, first_id + len(amounts))
+
+    def holder_ownership(self, after_round=None):
+        """
+        Ownership of every registered holder after a round
+
+        Args:
+            after_round: Round after which to measure ownership (default: final round)
+
+        Returns:
+            Array of ownership fractions, zero for holders who had not yet invested
+        """
+        r = len(self.round_names) - 1 if after_round is None else self.round_index(after_round)
+        invested = self._holder_round <= r
+        return np.where(invested, self._holder_shares / self.shares_outstanding[r], 0.0)
+
+@lru_cache(maxsize=4)
+def _load_cap_table(mtime_ns):
+    from utils.data_store import load_dataset
+    return CapTable.from_funding_rounds(load_dataset('funding_rounds_overview'))
+
+def default_cap_table():
+    """
+    Shared cap table for data/funding_rounds_overview.csv
+
+    The rounds come from the data store, so they are validated once per
+    process, and the table is rebuilt when the file changes. It is shared
+    between callers, so edit a copy (CapTable.from_funding_rounds) rather
+    than this instance.
+    """
+    # Imported here so the calculation modules do not pull in streamlit
+    from utils.data_store import dataset_mtime
+    return _load_cap_table(dataset_mtime('funding_rounds_overview'))
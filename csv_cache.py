@@ -0,0 +1,125 @@
+"""
+Transparent binary columnar cache for CSV files
+"""
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:
+    pa = None
+
+CACHE_DIR_NAME = ".cache"
+CACHE_FORMAT_VERSION = 1
+
+def _file_digest(path, chunk_size=1 << 20):
+    """BLAKE2b digest of a file, read in chunks"""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _atomic_write(path, write):
+    """Write through a temp file in the same directory, then rename into place"""
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix='.tmp')
+    os.close(fd)
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+def cache_paths(csv_path, cache_dir=None):
+    """Locations of the Arrow file and its metadata sidecar for a CSV"""
+    csv_path = Path(csv_path)
+    cache_dir = Path(cache_dir) if cache_dir is not None else csv_path.parent / CACHE_DIR_NAME
+    return cache_dir / f"{csv_path.name}.arrow", cache_dir / f"{csv_path.name}.json"
+
+def _is_fresh(csv_path, meta_path, stat):
+    """
+    Check whether the cached copy still matches the CSV
+
+    Size and mtime are compared first; only when they differ is the file
+    hashed, so touching a file without changing it does not force a rebuild.
+    """
+    try:
+        meta = json.loads(meta_path.read_text())
+    except (OSError, ValueError):
+        return False
+
+    if meta.get('version') != CACHE_FORMAT_VERSION:
+        return False
+    if meta.get('size') == stat.st_size and meta.get('mtime_ns') == stat.st_mtime_ns:
+        return True
+    if meta.get('size') != stat.st_size or meta.get('digest') != _file_digest(csv_path):
+        return False
+
+    # Same content, new mtime: refresh the sidecar so the next check is a stat
+    meta['mtime_ns'] = stat.st_mtime_ns
+    _atomic_write(meta_path, lambda tmp: Path(tmp).write_text(json.dumps(meta)))
+    return True
+
+def read_csv_cached(csv_path, cache_dir=None, **read_csv_kwargs):
+    """
+    Read a CSV through a memory-mapped Arrow cache
+
+    The first read parses the CSV and writes an uncompressed Arrow (Feather v2)
+    copy next to it; later reads memory-map that copy, so numeric columns are
+    read-only zero-copy views and load time barely grows with file size.
+    The cache is rebuilt when the CSV's content changes. Without pyarrow this
+    falls back to pd.read_csv.
+
+    Args:
+        csv_path: Path to the CSV file
+        cache_dir: Directory for cache files (default: .cache next to the CSV)
+        **read_csv_kwargs: Passed to pd.read_csv when (re)building the cache;
+            part of the cache identity
+
+    Returns:
+        DataFrame
+    """
+    csv_path = Path(csv_path)
+    if pa is None:
+        return pd.read_csv(csv_path, **read_csv_kwargs)
+
+    arrow_path, meta_path = cache_paths(csv_path, cache_dir)
+    if read_csv_kwargs:
+        options = hashlib.blake2b(repr(sorted(read_csv_kwargs.items())).encode(), digest_size=6).hexdigest()
+        arrow_path = arrow_path.with_name(f"{csv_path.name}.{options}.arrow")
+        meta_path = meta_path.with_name(f"{csv_path.name}.{options}.json")
+
+    stat = csv_path.stat()
+    if arrow_path.exists() and _is_fresh(csv_path, meta_path, stat):
+        try:
+            return feather.read_table(arrow_path, memory_map=True).to_pandas(split_blocks=True)
+        except (OSError, pa.ArrowInvalid):
+            pass  # unreadable cache file: rebuild below
+
+    # Hash before parsing: if the file changes mid-read, the next check sees a mismatch
+    digest = _file_digest(csv_path)
+    frame = pd.read_csv(csv_path, **read_csv_kwargs)
+
+    try:
+        arrow_path.parent.mkdir(parents=True, exist_ok=True)
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        _atomic_write(arrow_path, lambda tmp: feather.write_feather(table, tmp, compression='uncompressed'))
+        meta = {
+            'version': CACHE_FORMAT_VERSION,
+            'source': csv_path.name,
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'digest': digest,
+        }
+        _atomic_write(meta_path, lambda tmp: Path(tmp).write_text(json.dumps(meta)))
+    except (OSError, pa.ArrowException):
+        pass  # read-only data directory or unsupported column types: serve the parsed CSV
+
+    return frame
@@ -0,0 +1,170 @@
+"""
+Shared, process-wide access to the dashboard datasets
+"""
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from utils.csv_cache import read_csv_cached
+
+DATA_PATH = Path(__file__).parent.parent / "data"
+
+# Expected columns and dtypes per dataset ('int', 'float' or 'str')
+SCHEMAS = {
+    'investor_roi_summary': {
+        'Round': 'str',
+        'Investment_Year': 'int',
+        'Status': 'str',
+        'Investment_Amount': 'float',
+        'Entry_Valuation': 'float',
+        'Initial_Ownership_%': 'float',
+        'Final_Ownership_%_at_IPO': 'float',
+        'Exit_Value_at_IPO': 'float',
+        'Absolute_Return': 'float',
+        'MOIC': 'float',
+        'IRR_%': 'float',
+        'Holding_Period_Years': 'int',
+    },
+    'funding_rounds_overview': {
+        'Round': 'str',
+        'Year': 'int',
+        'Date': 'str',
+        'Amount_Raised': 'float',
+        'Pre_Money_Valuation': 'float',
+        'Post_Money_Valuation': 'float',
+        'Equity_Sold_%': 'float',
+        'Primary_Investors': 'str',
+        'Liquidation_Preference': 'float',
+        'Participation': 'str',
+        'Participation_Cap': 'float',
+        'Seniority': 'int',
+    },
+    'financial_projections_2015_2030': {
+        'Year': 'int',
+        'Revenue': 'float',
+        'Net_Income': 'float',
+        'Net_Margin_%': 'float',
+        'Company_Valuation': 'float',
+        'Revenue_Multiple': 'float',
+        'Status': 'str',
+    },
+    'operational_metrics': {
+        'Year': 'int',
+        'Server_Count': 'int',
+        'GPU_Count': 'int',
+        'Datacenter_Space_SqFt': 'float',
+        'Power_Capacity_kW': 'float',
+        'Number_of_Customers': 'int',
+        'Employee_Count': 'int',
+        'Uptime_%': 'float',
+        'Power_Usage_Effectiveness_PUE': 'float',
+        'Avg_Revenue_Per_Customer': 'float',
+        'Revenue_Per_Employee': 'float',
+    },
+    'ownership_evolution': {
+        'Milestone': 'str',
+        'Founders': 'float',
+        'Seed_Investors': 'float',
+        'Series_A_Investors': 'float',
+    },
+    'balance_sheet': {
+        'Total_Current_Assets': 'float',
+        'Total_Current_Liabilities': 'float',
+        'Total_Liabilities': 'float',
+        'Total_Equity': 'float',
+        'Total_Assets': 'float',
+        'Cash_and_Equivalents': 'float',
+    },
+    'income_statement': {
+        'Gross_Margin_%': 'float',
+        'Operating_Margin_%': 'float',
+        'Net_Margin_%': 'float',
+    },
+    'key_metrics': {},
+    'series_b_exit_scenarios': {
+        'Exit_Scenario': 'str',
+        'Holding_Period': 'int',
+        'MOIC': 'float',
+        'IRR_%': 'float',
+        'Exit_Value': 'float',
+    },
+    'series_c_exit_scenarios': {
+        'Exit_Scenario': 'str',
+        'Holding_Period': 'int',
+        'MOIC': 'float',
+        'IRR_%': 'float',
+        'Exit_Value': 'float',
+    },
+}
+
+_NUMPY_DTYPES = {'int': np.int64, 'float': np.float64}
+
+class SchemaError(ValueError):
+    """Raised when a dataset does not match its declared schema"""
+
+def _validate(name, frame):
+    """Check columns and coerce dtypes against SCHEMAS[name]"""
+    schema = SCHEMAS[name]
+
+    missing = [column for column in schema if column not in frame.columns]
+    if missing:
+        raise SchemaError(f"{name}.csv is missing columns: {', '.join(missing)}")
+
+    columns = {}
+    for column in frame.columns:
+        kind = schema.get(column)
+        values = frame[column]
+
+        if kind in _NUMPY_DTYPES:
+            if not pd.api.types.is_numeric_dtype(values):
+                raise SchemaError(f"{name}.csv column {column!r} must be numeric, found {values.dtype}")
+            if kind == 'int' and not np.array_equal(values, values.round()):
+                raise SchemaError(f"{name}.csv column {column!r} must hold whole numbers")
+            # No copy when the dtype already matches (e.g. memory-mapped cache columns)
+            columns[column] = values.to_numpy(dtype=_NUMPY_DTYPES[kind], copy=False)
+        elif values.dtype == object:
+            columns[column] = values.to_numpy(copy=False)
+        else:
+            # Extension arrays (e.g. Arrow-backed strings) are immutable already
+            columns[column] = values.array
+
+        # Shared between every session: forbid in-place edits
+        if isinstance(columns[column], np.ndarray):
+            columns[column].flags.writeable = False
+
+    return pd.DataFrame(columns, copy=False)
+
+@st.cache_resource(max_entries=64, show_spinner=False)
+def _load(name, mtime_ns):
+    """Read and validate one dataset; keyed on mtime so edited files are reloaded"""
+    frame = read_csv_cached(DATA_PATH / f"{name}.csv")
+    return _validate(name, frame)
+
+def load_dataset(name):
+    """
+    Load a dataset shared by every session in this process
+
+    The first call per process reads and validates the CSV; later calls return
+    a zero-copy view. The underlying arrays are read-only, so adding or replacing
+    columns on the view is safe but in-place edits raise (or copy, with pandas
+    copy-on-write) instead of leaking into other sessions.
+
+    Args:
+        name: Dataset name, the CSV file name without extension
+
+    Returns:
+        DataFrame view of the dataset
+    """
+    return _load(name, dataset_mtime(name)).copy(deep=False)
+
+def dataset_mtime(name):
+    """Modification time of a dataset's CSV in ns, for keying results derived from it"""
+    if name not in SCHEMAS:
+        raise KeyError(f"Unknown dataset: {name}")
+    return (DATA_PATH / f"{name}.csv").stat().st_mtime_ns
+
+def load_datasets(*names):
+    """Load several datasets at once, in the order given"""
+    return tuple(load_dataset(name) for name in names)
@@ -0,0 +1,139 @@
+"""
+Process-wide cache of built Plotly figures, keyed by input fingerprints
+"""
+import functools
+import json
+import threading
+from collections import OrderedDict
+
+from utils.result_cache import stable_hash
+
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+def fingerprint(value):
+    """
+    Content hash of a builder argument
+
+    Uses the result cache's canonical encoding: arrays are hashed by their
+    raw bytes, pandas objects row-wise with pd.util.hash_pandas_object, and
+    tuples, lists and dicts element by element, so two inputs that differ
+    anywhere get different keys (repr() elides long arrays and rounds floats).
+
+    Args:
+        value: Argument passed to a figure builder
+
+    Returns:
+        Hex digest string
+
+    Raises:
+        TypeError: For arguments without a stable encoding
+    """
+    return stable_hash(value)
+
+class FigureCache:
+    """
+    Byte-bounded LRU of serialized figures
+
+    Entries are figure JSON strings; the least recently used entries are
+    evicted once their total size exceeds max_bytes. Safe to share between
+    the session threads of one Streamlit server.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """Cached JSON for key, or None (counted as a miss)"""
+        with self._lock:
+            spec = self._entries.get(key)
+            if spec is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return spec
+
+    def put(self, key, spec):
+        """Store JSON for key, evicting old entries to stay within max_bytes"""
+        size = len(spec)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= len(self._entries.pop(key))
+            self._entries[key] = spec
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+                self.evictions += 1
+
+    def clear(self):
+        """Drop every entry and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """Hit/miss counters and current size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes
+            }
+
+FIGURE_CACHE = FigureCache()
+
+def memoize_figure(builder=None, cache=None):
+    """
+    Decorator caching a figure builder's output by argument fingerprints
+
+    A hit rebuilds the Figure from cached JSON without Plotly's property
+    validation, which is what dominates building a chart from scratch. Every
+    call returns a new Figure, so callers may still modify it.
+
+    Args:
+        builder: Function returning a plotly Figure
+        cache: FigureCache to use (default: the shared FIGURE_CACHE)
+
+    Returns:
+        Wrapped builder with the same signature
+    """
+    if builder is None:
+        return functools.partial(memoize_figure, cache=cache)
+
+    @functools.wraps(builder)
+    def wrapper(*args, **kwargs):
+        store = FIGURE_CACHE if cache is None else cache
+        key = (
+            builder.__module__,
+            builder.__qualname__,
+            tuple(fingerprint(arg) for arg in args),
+            tuple((name, fingerprint(kwargs[name])) for name in sorted(kwargs))
+        )
+
+        import plotly.graph_objects as go
+        import plotly.io as pio
+
+        spec = store.get(key)
+        if spec is None:
+            fig = builder(*args, **kwargs)
+            store.put(key, pio.to_json(fig, validate=False))
+            return fig
+        return go.Figure(json.loads(spec), _validate=False)
+
+    wrapper.uncached = builder
+    return wrapper
@@ -0,0 +1,111 @@
+"""
+Pro-rata follow-on strategies across later funding rounds
+
+An investor who takes their pro-rata allocation in a later round buys that
+round's equity in proportion to the stake they hold going in, so a full
+follow-on keeps their ownership through the round and a partial one keeps
+part of it. Every combination of participation levels across the later
+rounds is enumerated as one (n_strategies, n_rounds) array, and ownership,
+capital deployed, dated cash flows and XIRR come out for all of them at once.
+
+Every check buys a slice of its round's share class, so with a liquidation
+preference waterfall the exit proceeds are the sum of those slices of each
+class's payout rather than a pro-rata share of the exit valuation.
+"""
+import numpy as np
+import pandas as pd
+
+from utils.xirr import xirr_batch
+
+# Share of the pro-rata allocation taken in a later round: none, partial, full
+PARTICIPATION_LEVELS = (0.0, 0.5, 1.0)
+
+def enumerate_follow_ons(cap_table, round_name, investment_amount, round_dates,
+                         exit_valuation, levels=PARTICIPATION_LEVELS, exit_round=None, waterfall=None):
+    """
+    Returns of every pro-rata participation strategy
+
+    The rounds between entry and exit offer pro-rata rights. The exit round
+    itself (e.g. the IPO) dilutes the stake but takes no follow-on. Exit
+    proceeds are the pro-rata share of exit_valuation, or with a waterfall
+    each check's slice of its round's class payout.
+
+    Args:
+        cap_table: CapTable with the rounds' amounts and valuations
+        round_name: Round of the initial check
+        investment_amount: Initial check
+        round_dates: Dictionary of round name (as in the cap table) to date of its cash flows
+        exit_valuation: Company valuation at exit
+        levels: Participation levels offered in each later round, as fractions
+            of the full pro-rata allocation
+        exit_round: Round at which the stake is sold (default: final round)
+        waterfall: Waterfall of the cap table as of the exit round; by default
+            exit proceeds are pro rata to ownership
+
+    Returns:
+        Dictionary with 'rounds' (the follow-on rounds), 'participation'
+        (n_strategies, n_rounds), 'follow_on' ($ per round, same shape),
+        'deployed', 'ownership' (% at exit), 'exit_value', 'moic', 'irr' (XIRR %)
+        and 'irr_status' arrays of shape (n_strategies,), the dated cash
+        flows 'amounts' and 'dates' (n_strategies, n_rounds + 2), and 'best',
+        the strategy with the highest XIRR
+    """
+    entry = cap_table.round_index(round_name)
+    last = len(cap_table.round_names) - 1 if exit_round is None else cap_table.round_index(exit_round)
+    rounds = cap_table.round_names[entry + 1:last]
+    k = len(rounds)
+
+    # Every combination of levels, one strategy per row
+    grid = np.meshgrid(*[np.asarray(levels, dtype=float)] * k, indexing='ij')
+    participation = np.stack(grid, axis=-1).reshape(-1, k) if k else np.zeros((1, 0))
+
+    # Each later round sells equity_sold[j]; taking fraction f of the pro-rata
+    # allocation keeps f of the stake that round would have diluted away
+    equity_sold = cap_table.equity_sold[entry + 1:last + 1]
+    kept = 1 - equity_sold * (1 - np.pad(participation, ((0, 0), (0, 1))))
+    ownership = investment_amount / cap_table.post_money_valuation[entry] * np.cumprod(kept, axis=1)
+    before = np.concatenate([
+        np.full((len(participation), 1), investment_amount / cap_table.post_money_valuation[entry]),
+        ownership[:, :-1]
+    ], axis=1)[:, :k]
+
+    follow_on = participation * before * cap_table.amount_raised[entry + 1:last]
+    deployed = investment_amount + follow_on.sum(axis=1)
+    if waterfall is None:
+        exit_value = ownership[:, -1] * exit_valuation
+    else:
+        # Fraction of each round's class bought by the initial check and the follow-ons
+        class_fraction = np.concatenate([
+            np.full((len(participation), 1), investment_amount / cap_table.amount_raised[entry]),
+            follow_on / cap_table.amount_raised[entry + 1:last]
+        ], axis=1)
+        classes = [waterfall.class_index(name) for name in cap_table.round_names[entry:last]]
+        exit_value = class_fraction @ waterfall.payouts(float(exit_valuation))[classes]
+
+    amounts = np.concatenate([
+        np.full((len(participation), 1), -float(investment_amount)),
+        -follow_on,
+        exit_value[:, None]
+    ], axis=1)
+    names = cap_table.round_names
+    flow_dates = np.array(
+        [np.datetime64(pd.Timestamp(round_dates[name]), 'D') for name in [names[entry], *rounds, names[last]]],
+        dtype='datetime64[D]'
+    )
+    dates = np.broadcast_to(flow_dates, amounts.shape)
+    solved = xirr_batch(amounts, dates)
+
+    return {
+        'rounds': rounds,
+        'participation': participation,
+        'follow_on': follow_on,
+        'deployed': deployed,
+        'ownership': ownership[:, -1] * 100,
+        'exit_value': exit_value,
+        'moic': exit_value / deployed,
+        'irr': solved['irr'],
+        'irr_status': solved['status'],
+        'amounts': amounts,
+        'dates': dates,
+        'best': int(np.nanargmax(solved['irr'])) if np.isfinite(solved['irr']).any() else 0
+    }
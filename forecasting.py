@@ -0,0 +1,223 @@
+"""
+Revenue forecasts fitted to historical rows
+
+Three model families are fitted in log space, each reduced to two-parameter
+linear least squares so every candidate is solved in one batched pass:
+
+    log_linear    log y = a + b*t                        (constant growth)
+    damped_trend  log y = a + b*S(t), S(t) = sum phi^k   (growth fading by phi per period)
+    logistic      log(K/y - 1) = a + b*t                 (growth saturating at K)
+
+The damping factor phi and the saturation level K are chosen per series by
+grid search on the least-squares fit, and the families are compared by AICc.
+Values are (n_series, n_periods) arrays of equally spaced observations, so
+monthly history for many business units is fitted in the same batched pass
+as a single annual series.
+"""
+from statistics import NormalDist
+
+import numpy as np
+
+from utils.memory_cache import memory_cached
+
+MODELS = ('log_linear', 'damped_trend', 'logistic')
+
+# Candidate damping factors per period, and saturation levels as multiples of the largest observation;
+# the saturation level is refined between the neighbours of the best coarse candidate
+DAMPING_GRID = np.linspace(0.50, 0.99, 50)
+SATURATION_GRID = np.geomspace(1.01, 20.0, 16)
+SATURATION_REFINE = 13
+
+# Central prediction intervals, in %
+DEFAULT_LEVELS = (50, 80, 95)
+
+MIN_PERIODS = 5
+
+def _damped_steps(t, phi):
+    """S(t) = phi + phi^2 + ... + phi^t for every phi (rows) and t (columns)"""
+    phi = np.asarray(phi, dtype=float)[:, None]
+    return phi * (1 - phi ** t) / (1 - phi)
+
+def _batched_lstsq(designs, log_y):
+    """
+    Least squares of every series on every candidate design
+
+    Each design's first column must be the intercept, so the responses are
+    centred first and the sums of squares are read off the normal equations
+    without forming the fitted values of every candidate.
+
+    Args:
+        designs: Designs of shape (n_candidates, n_periods, n_params)
+        log_y: Responses of shape (n_series, n_periods)
+
+    Returns:
+        Tuple of (coefficients (n_series, n_candidates, n_params),
+        residual sums of squares (n_series, n_candidates))
+    """
+    n_candidates, n, n_params = designs.shape
+    mean = log_y.mean(axis=1, keepdims=True)
+    centred = log_y - mean
+
+    pinv = np.linalg.pinv(designs).reshape(-1, n)
+    coef = (centred @ pinv.T).reshape(len(log_y), n_candidates, n_params)
+    xty = (centred @ designs.transpose(0, 2, 1).reshape(-1, n).T).reshape(coef.shape)
+    sse = (centred ** 2).sum(axis=1, keepdims=True) - (coef * xty).sum(axis=-1)
+
+    coef[..., 0] += mean
+    return coef, np.maximum(sse, 0)
+
+def _logistic_fits(log_y, saturation):
+    """
+    Logistic fits of every series for each of its candidate saturation levels
+
+    The response log(K/y - 1) depends on K but the design [1, t] does not,
+    so one pseudo-inverse serves every series and candidate.
+
+    Args:
+        log_y: Log observations of shape (n_series, n_periods)
+        saturation: Candidate levels K of shape (n_series, n_candidates)
+
+    Returns:
+        Tuple of (coefficients (n_series, n_candidates, 2), fitted log values
+        (n_series, n_candidates, n_periods), residual sums of squares in log space)
+    """
+    n = log_y.shape[1]
+    design = np.stack([np.ones(n), np.arange(n, dtype=float)], axis=-1)
+    log_k = np.log(saturation)[:, :, None]
+    coef = np.log(np.expm1(log_k - log_y[:, None, :])) @ np.linalg.pinv(design).T
+    # Every candidate K exceeds the data, so z stays moderate and exp() cannot overflow
+    fitted = log_k - np.log1p(np.exp(coef @ design.T))
+    return coef, fitted, ((fitted - log_y[:, None, :]) ** 2).sum(axis=-1)
+
+def _aicc(sse, n, k):
+    """Small-sample Akaike information criterion of a least-squares fit"""
+    return n * np.log(np.maximum(sse, 1e-300) / n) + 2 * k + 2 * k * (k + 1) / (n - k - 1)
+
+def _leverage(X, x_new):
+    """x' (X'X)^-1 x for forecast rows x_new of shape (..., horizon, n_params) given designs X (..., n, n_params)"""
+    xtx_inv = np.linalg.pinv(np.einsum('...np,...nq->...pq', X, X))
+    return np.einsum('...hp,...pq,...hq->...h', x_new, xtx_inv, x_new)
+
+def fit_models(values):
+    """
+    Fit every model family to each series
+
+    Args:
+        values: Positive observations, shape (n_series, n_periods) or (n_periods,)
+
+    Returns:
+        Dictionary per model name with arrays over series: 'coef' (n_series, 2),
+        'param' (phi or K; NaN for log_linear), 'fitted' (log values),
+        'sigma' (residual std in log space), 'aicc', plus 'n_periods'
+    """
+    log_y = np.log(np.atleast_2d(np.asarray(values, dtype=float)))
+    n_series, n = log_y.shape
+    if n < MIN_PERIODS:
+        raise ValueError(f"Need at least {MIN_PERIODS} periods to fit a forecast, got {n}")
+    if not np.isfinite(log_y).all():
+        raise ValueError("Forecast inputs must be positive and finite")
+
+    t = np.arange(n, dtype=float)
+    rows = np.arange(n_series)
+    fits = {'n_periods': n}
+
+    # Log-linear and damped trend share the form a + b*S(t); phi = 1 gives S(t) = t
+    designs = np.stack([np.ones((len(DAMPING_GRID), n)), _damped_steps(t, DAMPING_GRID)], axis=-1)
+    designs = np.concatenate([np.stack([np.ones(n), t], axis=-1)[None], designs])
+    coef, sse = _batched_lstsq(designs, log_y)
+
+    best = 1 + sse[:, 1:].argmin(axis=1)
+    for name, candidate, param, k in (
+        ('log_linear', np.zeros(n_series, dtype=int), np.full(n_series, np.nan), 2),
+        ('damped_trend', best, DAMPING_GRID[best - 1], 3)
+    ):
+        fits[name] = {
+            'coef': coef[rows, candidate],
+            'param': param,
+            'fitted': np.einsum('snp,sp->sn', designs[candidate], coef[rows, candidate]),
+            'sigma': np.sqrt(sse[rows, candidate] / (n - k)),
+            'aicc': _aicc(sse[rows, candidate], n, k),
+            'design': designs[candidate]
+        }
+
+    # Logistic: coarse grid of K, then a finer one between the best candidate's neighbours
+    peak = np.exp(log_y.max(axis=1))[:, None]
+    _, _, coarse_sse = _logistic_fits(log_y, peak * SATURATION_GRID)
+    best = coarse_sse.argmin(axis=1)
+    low = SATURATION_GRID[np.maximum(best - 1, 0)][:, None]
+    high = SATURATION_GRID[np.minimum(best + 1, len(SATURATION_GRID) - 1)][:, None]
+    saturation = peak * low * (high / low) ** np.linspace(0, 1, SATURATION_REFINE)
+    z_coef, logistic_fitted, logistic_sse = _logistic_fits(log_y, saturation)
+
+    best = logistic_sse.argmin(axis=1)
+    fits['logistic'] = {
+        'coef': z_coef[rows, best],
+        'param': saturation[rows, best],
+        'fitted': logistic_fitted[rows, best],
+        'sigma': np.sqrt(logistic_sse[rows, best] / (n - 3)),
+        'aicc': _aicc(logistic_sse[rows, best], n, 3),
+        'design': np.broadcast_to(np.stack([np.ones(n), t], axis=-1), (n_series, n, 2))
+    }
+    return fits
+
+@memory_cached
+def forecast_revenue(values, horizon, levels=DEFAULT_LEVELS):
+    """
+    Fit every model and project it with prediction intervals
+
+    Results are cached by a fingerprint of the data, so refits only happen
+    when the history changes.
+
+    Intervals are approximate: the residual scatter in log space, widened by
+    the regression leverage of each forecast period, with normal quantiles.
+
+    Args:
+        values: Positive observations, shape (n_series, n_periods) or (n_periods,)
+        horizon: Number of periods to forecast
+        levels: Central interval coverages in %
+
+    Returns:
+        Dictionary with, per model name, 'mean' (n_series, horizon), 'lower'
+        and 'upper' ({level: (n_series, horizon)}), 'fitted', 'param' and
+        'aicc'; and 'best', the model name with the lowest AICc per series
+    """
+    fits = fit_models(values)
+    n = fits['n_periods']
+    t_new = np.arange(n, n + horizon, dtype=float)
+    result = {}
+
+    for name in MODELS:
+        fit = fits[name]
+        if name == 'logistic':
+            x_new = np.stack([np.ones(horizon), t_new], axis=-1)
+            z_new = x_new @ fit['coef'].T
+            log_mean = np.log(fit['param'])[:, None] - np.logaddexp(0, z_new.T)
+        else:
+            # log_linear has no phi: its S(t) is t itself
+            phi = fit['param'][:, None]
+            damped = np.nan_to_num(phi) * (1 - np.nan_to_num(phi) ** t_new) / (1 - np.nan_to_num(phi))
+            steps = np.where(np.isnan(phi), t_new, damped)
+            x_new = np.stack([np.ones_like(steps), steps], axis=-1)
+            log_mean = np.einsum('shp,sp->sh', x_new, fit['coef'])
+
+        x_new = np.broadcast_to(x_new, fit['design'].shape[:1] + (horizon, 2))
+        spread = fit['sigma'][:, None] * np.sqrt(1 + _leverage(fit['design'], x_new))
+        quantiles = {level: NormalDist().inv_cdf(0.5 + level / 200) for level in levels}
+
+        result[name] = {
+            'mean': np.exp(log_mean),
+            'lower': {level: np.exp(log_mean - q * spread) for level, q in quantiles.items()},
+            'upper': {level: np.exp(log_mean + q * spread) for level, q in quantiles.items()},
+            'fitted': np.exp(fit['fitted']),
+            'param': fit['param'],
+            'aicc': fit['aicc']
+        }
+
+    aicc = np.stack([result[name]['aicc'] for name in MODELS])
+    result['best'] = [MODELS[i] for i in aicc.argmin(axis=0)]
+    return result
+
+def growth_rate(values, periods):
+    """Compound growth per period between the first and last value, in %"""
+    values = np.asarray(values, dtype=float)
+    return ((values[-1] / values[0]) ** (1 / periods) - 1) * 100
@@ -0,0 +1,287 @@
+"""
+In-process result cache with a global memory budget
+
+Every cached function in the process shares one byte budget. Each entry's
+size is measured when it is stored and its compute time is recorded, so the
+cache can report the time saved by every hit. Eviction is either
+least-recently used, least-frequently used, or cost-aware (the default):
+results that are expensive to recompute and small to keep outlive large,
+cheap ones.
+"""
+import functools
+import inspect
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.result_cache import code_salt, stable_hash
+
+DEFAULT_MAX_BYTES = int(float(os.environ.get('DASHBOARD_MEMORY_CACHE_MB', 256)) * 1024 * 1024)
+
+POLICIES = ('lru', 'lfu', 'cost')
+
+def sizeof(value):
+    """
+    Approximate memory held by a value, in bytes
+
+    NumPy arrays count their buffers, pandas objects their deep memory usage,
+    and containers are walked recursively (objects shared within the value
+    are counted once).
+    """
+    seen = set()
+
+    def walk(item):
+        if id(item) in seen:
+            return 0
+        seen.add(id(item))
+        if isinstance(item, np.ndarray):
+            # Views of an array already counted share its buffer
+            base = item
+            while isinstance(base.base, np.ndarray):
+                base = base.base
+            if base is not item:
+                if id(base) in seen:
+                    return sys.getsizeof(item)
+                seen.add(id(base))
+            return sys.getsizeof(item) + item.nbytes
+        if isinstance(item, pd.DataFrame):
+            return int(item.memory_usage(index=True, deep=True).sum())
+        if isinstance(item, (pd.Series, pd.Index)):
+            return int(item.memory_usage(deep=True))
+        size = sys.getsizeof(item)
+        if isinstance(item, dict):
+            size += sum(walk(key) + walk(child) for key, child in item.items())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            size += sum(walk(child) for child in item)
+        return size
+
+    return walk(value)
+
+def _readonly(values):
+    """A pandas column's values with NumPy buffers locked (extension arrays are left as they are)"""
+    if isinstance(values, np.ndarray):
+        values.flags.writeable = False
+    return values
+
+def _freeze(value):
+    """
+    Make the NumPy arrays in a result read-only, since every session shares it
+
+    DataFrames and Series are rebuilt on read-only column arrays, as the data
+    store does, so in-place edits raise instead of changing the shared copy.
+    """
+    if isinstance(value, np.ndarray):
+        value.flags.writeable = False
+    elif isinstance(value, pd.DataFrame):
+        columns = {i: _readonly(value.iloc[:, i].to_numpy(copy=False) if isinstance(value.dtypes.iloc[i], np.dtype)
+                                else value.iloc[:, i].array)
+                   for i in range(value.shape[1])}
+        frozen = pd.DataFrame(columns, index=value.index, copy=False)
+        frozen.columns = value.columns
+        return frozen
+    elif isinstance(value, pd.Series):
+        values = value.to_numpy(copy=False) if isinstance(value.dtype, np.dtype) else value.array
+        return pd.Series(_readonly(values), index=value.index, name=value.name, copy=False)
+    elif isinstance(value, dict):
+        for key, child in value.items():
+            value[key] = _freeze(child)
+    elif isinstance(value, list):
+        value[:] = [_freeze(child) for child in value]
+    elif isinstance(value, tuple):
+        return type(value)(*map(_freeze, value)) if hasattr(value, '_fields') else tuple(map(_freeze, value))
+    return value
+
+def _view(value):
+    """A shallow copy of a pandas result per caller, so adding columns does not touch the shared one"""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy(deep=False)
+    return value
+
+class _Entry:
+    __slots__ = ('value', 'size', 'compute_s', 'hits', 'last_used', 'priority', 'function')
+
+    def __init__(self, value, size, compute_s, function):
+        self.value = value
+        self.size = size
+        self.compute_s = compute_s
+        self.function = function
+        self.hits = 0
+        self.last_used = 0
+        self.priority = 0.0
+
+class MemoryCache:
+    """
+    Byte-budgeted cache of results shared by all sessions of a process
+
+    Policies:
+        'lru'   evict the least recently used entry
+        'lfu'   evict the entry with the fewest hits (oldest first on ties)
+        'cost'  GreedyDual-Size-Frequency: evict the lowest
+                (hits + 1) * compute time / size, aged by the priority of
+                the last eviction so idle entries eventually go too
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, policy='cost'):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown eviction policy: {policy!r} (expected one of {POLICIES})")
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self._entries = {}
+        self._bytes = 0
+        self._tick = 0
+        self._inflation = 0.0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.time_saved_s = 0.0
+
+    def _touch(self, entry):
+        self._tick += 1
+        entry.last_used = self._tick
+        if self.policy == 'cost':
+            entry.priority = self._inflation + (entry.hits + 1) * entry.compute_s / max(entry.size, 1)
+
+    def _victim_order(self, entry):
+        if self.policy == 'lru':
+            return entry.last_used
+        if self.policy == 'lfu':
+            return (entry.hits, entry.last_used)
+        return (entry.priority, entry.last_used)
+
+    def get(self, key):
+        """Cached entry for key, or None (counted as a miss)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            entry.hits += 1
+            self.hits += 1
+            self.time_saved_s += entry.compute_s
+            self._touch(entry)
+            return entry
+
+    def put(self, key, value, compute_s, function=''):
+        """
+        Store a result and evict entries until the cache fits its budget
+
+        Args:
+            key: Cache key
+            value: Result to store
+            compute_s: Seconds the result took to compute
+            function: Name of the function that produced it, for entry_stats()
+
+        Returns:
+            The stored entry, or None when the result alone exceeds the budget
+        """
+        size = sizeof(value)
+        if size > self.max_bytes:
+            return None
+        entry = _Entry(value, size, compute_s, function)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.size
+            self._touch(entry)
+            self._entries[key] = entry
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                victim_key = min(
+                    (k for k in self._entries if k != key),
+                    key=lambda k: self._victim_order(self._entries[k])
+                )
+                victim = self._entries.pop(victim_key)
+                self._bytes -= victim.size
+                self.evictions += 1
+                if self.policy == 'cost':
+                    self._inflation = victim.priority
+        return entry
+
+    def clear(self):
+        """Drop every entry and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._tick = 0
+            self._inflation = 0.0
+            self.hits = self.misses = self.evictions = 0
+            self.time_saved_s = 0.0
+
+    def stats(self):
+        """Hit/miss counters, current size and compute time saved by hits"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'time_saved_s': self.time_saved_s
+            }
+
+    def entry_stats(self):
+        """Per-entry size, compute time, hits and time saved, most valuable first"""
+        with self._lock:
+            rows = [
+                {
+                    'function': entry.function,
+                    'bytes': entry.size,
+                    'compute_ms': entry.compute_s * 1000,
+                    'hits': entry.hits,
+                    'saved_ms': entry.hits * entry.compute_s * 1000
+                }
+                for entry in self._entries.values()
+            ]
+        return sorted(rows, key=lambda row: row['saved_ms'], reverse=True)
+
+MEMORY_CACHE = MemoryCache()
+
+def memory_cached(func=None, cache=None):
+    """
+    Decorator caching a function's results in a MemoryCache
+
+    Arguments are bound to the signature and hashed with stable_hash, so
+    positional and keyword calls share entries; the function's source is part
+    of the key. Results are shared between
+    sessions: their NumPy arrays, including the columns of DataFrames and
+    Series, are made read-only.
+
+    Args:
+        func: Function to cache
+        cache: MemoryCache to use (default: the shared MEMORY_CACHE)
+
+    Returns:
+        Wrapped function with the same signature
+    """
+    if func is None:
+        return functools.partial(memory_cached, cache=cache)
+
+    signature = inspect.signature(func)
+    # Editing the function (e.g. a page script in development) starts fresh entries
+    salt = code_salt(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        store = MEMORY_CACHE if cache is None else cache
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        key = (salt, stable_hash(dict(bound.arguments)))
+
+        entry = store.get(key)
+        if entry is not None:
+            return _view(entry.value)
+        start = time.perf_counter()
+        result = _freeze(func(*args, **kwargs))
+        store.put(key, result, time.perf_counter() - start, function=func.__qualname__)
+        return _view(result)
+
+    wrapper.uncached = func
+    return wrapper
@@ -0,0 +1,197 @@
+"""
+On-demand profiling of a single page run
+
+Pages call start_profile() right after start_page() and profile_panel(state)
+at the end, passing the widget values the run used. With ?profile=1 in the
+URL (or DASHBOARD_PROFILE=1 for every run) the run in between is profiled
+twice over: cProfile for the call tree, and a sampling thread that walks the
+script thread's stack for flame graphs.
+Results are saved to PROFILE_DIR and offered for download in the sidebar.
+Fragment reruns are profiled through timing.instrumented_fragment().
+
+    ?profile=1        both profilers
+    ?profile=trace    cProfile only (exact call counts, ~2x slower run)
+    ?profile=sample   stack sampling only (low overhead)
+"""
+import cProfile
+import io
+import json
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+import streamlit as st
+
+ENV_VAR = 'DASHBOARD_PROFILE'
+QUERY_PARAM = 'profile'
+PROFILE_DIR = Path(os.environ.get('DASHBOARD_PROFILE_DIR',
+                                  Path(__file__).parent.parent / "data" / ".cache" / "profiles"))
+
+# Seconds between stack samples; the sampler needs the GIL, so much lower buys nothing
+SAMPLE_INTERVAL = 0.002
+
+MODES = {'1': ('trace', 'sample'), 'true': ('trace', 'sample'), 'trace': ('trace',), 'sample': ('sample',)}
+
+_run = threading.local()
+
+def requested_modes():
+    """Profilers requested for this run, from the query string or the env var"""
+    value = st.query_params.get(QUERY_PARAM) or os.environ.get(ENV_VAR, '')
+    return MODES.get(value.lower(), ())
+
+def _frame_label(code):
+    return f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+class StackSampler:
+    """
+    Periodically record the stack of one thread as collapsed stacks
+
+    Stacks are cut at root_frame (the page script) so every sample starts at
+    the page rather than in Streamlit's script runner.
+    """
+
+    def __init__(self, thread_id, root_frame, interval=SAMPLE_INTERVAL):
+        self.thread_id = thread_id
+        self.root_frame = root_frame
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                return  # The script thread has exited (e.g. after st.stop)
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame.f_code))
+                if frame is self.root_frame:
+                    break
+                frame = frame.f_back
+            self.stacks[';'.join(reversed(stack))] += 1
+            self.samples += 1
+
+    def collapsed(self):
+        """Stacks in the collapsed format read by flamegraph.pl and speedscope"""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+def start_profile(page):
+    """
+    Start profiling the calling page script if requested
+
+    Args:
+        page: Page name, used in the saved file names
+
+    Returns:
+        Whether a profile is being captured
+    """
+    modes = requested_modes()
+    _run.profiler = _run.sampler = None
+    if not modes:
+        return False
+
+    _run.page = page
+    _run.started = time.perf_counter()
+    if 'sample' in modes:
+        _run.sampler = StackSampler(threading.get_ident(), sys._getframe(1)).start()
+    if 'trace' in modes:
+        _run.profiler = cProfile.Profile()
+        _run.profiler.enable()
+    return True
+
+def _file_stem(page, state):
+    """Timestamp, page and widget state as a file name"""
+    stamp = datetime.now().strftime('%Y%m%d-%H%M%S-%f')[:-3]
+    parts = [page] + [f"{name}={value}" for name, value in (state or {}).items()]
+    slug = re.sub(r'[^A-Za-z0-9.=+-]+', '_', '__'.join(str(part) for part in parts)).strip('_')
+    return f"{stamp}_{slug[:150]}"
+
+def finish_profile(state=None):
+    """
+    Stop the profilers started by start_profile() and save their output
+
+    Writes <stem>.prof (cProfile, for pstats or snakeviz), <stem>.txt (call
+    tree sorted by cumulative time), <stem>.collapsed (sampled stacks) and
+    <stem>.json (page, widget state, wall time) to PROFILE_DIR.
+
+    Args:
+        state: Dict of widget values this run used, included in the file name
+
+    Returns:
+        List of written paths (empty when not profiling)
+    """
+    profiler, sampler = getattr(_run, 'profiler', None), getattr(_run, 'sampler', None)
+    if profiler is None and sampler is None:
+        return []
+    if profiler is not None:
+        profiler.disable()
+    if sampler is not None:
+        sampler.stop()
+    _run.profiler = _run.sampler = None
+    elapsed = time.perf_counter() - _run.started
+
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    stem = PROFILE_DIR / _file_stem(_run.page, state)
+    paths = []
+
+    if profiler is not None:
+        profiler.dump_stats(f"{stem}.prof")
+        report = io.StringIO()
+        pstats.Stats(profiler, stream=report).strip_dirs().sort_stats('cumulative').print_stats(60)
+        Path(f"{stem}.txt").write_text(report.getvalue(), encoding='utf-8')
+        paths += [Path(f"{stem}.prof"), Path(f"{stem}.txt")]
+
+    if sampler is not None:
+        Path(f"{stem}.collapsed").write_text(sampler.collapsed(), encoding='utf-8')
+        paths.append(Path(f"{stem}.collapsed"))
+
+    meta = {
+        'page': _run.page,
+        'state': state or {},
+        'wall_s': elapsed,
+        'samples': sampler.samples if sampler is not None else None,
+        'files': [path.name for path in paths]
+    }
+    Path(f"{stem}.json").write_text(json.dumps(meta, indent=2, default=str), encoding='utf-8')
+    return paths + [Path(f"{stem}.json")]
+
+def profile_panel(state=None, location=None):
+    """
+    Finish the run's profile, if any, and link its files from the sidebar
+
+    Args:
+        state: Dict of widget values this run used
+        location: Where to draw the panel instead of the sidebar (e.g. st
+            inside a fragment, which cannot write to the sidebar)
+    """
+    paths = finish_profile(state)
+    if not paths:
+        return
+
+    location = st.sidebar if location is None else location
+    with location.expander("🔬 Profile", expanded=True):
+        st.caption(f"Saved to {PROFILE_DIR}")
+        for path in paths:
+            st.download_button(
+                path.suffix.lstrip('.'),
+                data=path.read_bytes(),
+                file_name=path.name,
+                key=f"profile_download_{path.name}",
+                use_container_width=True
+            )
@@ -0,0 +1,140 @@
+"""
+Driver-based financial projections
+
+Projected years are derived from three drivers per year instead of being
+read as fixed numbers: revenue growth, net margin and the revenue multiple
+the company is valued at. Drivers are arrays of shape (n_years,) for one
+assumption set or (n_scenarios, n_years) for a batch, and every output is
+computed for all scenarios and years at once.
+"""
+import numpy as np
+import pandas as pd
+
+PROJECTION_COLUMNS = ['Year', 'Revenue', 'Net_Income', 'Net_Margin_%',
+                      'Company_Valuation', 'Revenue_Multiple', 'Status']
+
+def baseline_drivers(financials):
+    """
+    Recover the drivers behind the projected rows of a projections dataset
+
+    Args:
+        financials: DataFrame like financial_projections_2015_2030.csv
+
+    Returns:
+        Dictionary with 'years', 'base_revenue' (last historical revenue),
+        'growth' (fraction per year), 'net_margin' (%) and 'revenue_multiple'
+    """
+    historical = financials[financials['Status'] == 'Historical']
+    projected = financials[financials['Status'] == 'Projected']
+
+    base_revenue = float(historical['Revenue'].iloc[-1])
+    revenue = projected['Revenue'].to_numpy(dtype=float)
+    previous = np.concatenate(([base_revenue], revenue[:-1]))
+
+    return {
+        'years': projected['Year'].to_numpy(),
+        'base_revenue': base_revenue,
+        'growth': revenue / previous - 1,
+        'net_margin': projected['Net_Margin_%'].to_numpy(dtype=float),
+        'revenue_multiple': projected['Revenue_Multiple'].to_numpy(dtype=float)
+    }
+
+def project_financials(base_revenue, growth, net_margin, revenue_multiple):
+    """
+    Project revenue, earnings and valuation from driver arrays
+
+    All drivers broadcast against each other along the last (year) axis, so
+    a (n_scenarios, n_years) array in any of them projects every scenario in
+    one pass; the others may stay per-year or scalar.
+
+    Args:
+        base_revenue: Revenue of the year before the first projected year
+        growth: Revenue growth per year, as a fraction (0.25 = 25%)
+        net_margin: Net margin per year, in %
+        revenue_multiple: Valuation / revenue per year
+
+    Returns:
+        Dictionary of equally shaped arrays: 'revenue', 'net_income',
+        'net_margin', 'valuation', 'revenue_multiple'
+    """
+    base_revenue, growth, net_margin, revenue_multiple = np.broadcast_arrays(
+        np.asarray(base_revenue, dtype=float)[..., None],
+        np.asarray(growth, dtype=float),
+        np.asarray(net_margin, dtype=float),
+        np.asarray(revenue_multiple, dtype=float)
+    )
+
+    revenue = base_revenue * np.cumprod(1 + growth, axis=-1)
+
+    return {
+        'revenue': revenue,
+        'net_income': revenue * net_margin / 100,
+        'net_margin': net_margin.copy(),
+        'valuation': revenue * revenue_multiple,
+        'revenue_multiple': revenue_multiple.copy()
+    }
+
+def adjust_drivers(drivers, growth_shift=0.0, margin_shift=0.0, multiple_scale=1.0):
+    """
+    Shift baseline drivers by one or many assumption sets
+
+    Args:
+        drivers: Result of baseline_drivers
+        growth_shift: Percentage points added to every year's growth
+        margin_shift: Percentage points added to every year's net margin
+        multiple_scale: Factor applied to every year's revenue multiple
+
+    Each adjustment may be a scalar or an array of shape (n_scenarios,).
+
+    Returns:
+        Tuple of (growth, net_margin, revenue_multiple) arrays ready for
+        project_financials
+    """
+    growth_shift = np.asarray(growth_shift, dtype=float)[..., None]
+    margin_shift = np.asarray(margin_shift, dtype=float)[..., None]
+    multiple_scale = np.asarray(multiple_scale, dtype=float)[..., None]
+
+    return (
+        drivers['growth'] + growth_shift / 100,
+        drivers['net_margin'] + margin_shift,
+        drivers['revenue_multiple'] * multiple_scale
+    )
+
+def sample_assumptions(n_scenarios, growth_shift=0.0, margin_shift=0.0, multiple_scale=1.0,
+                       growth_spread=5.0, margin_spread=3.0, multiple_spread=0.25, seed=0):
+    """
+    Draw a batch of assumption sets around a central one
+
+    Adjustments are uniform within +/- spread of the central values
+    (multiple_spread is relative).
+
+    Returns:
+        Tuple of (growth_shift, margin_shift, multiple_scale) arrays of shape (n_scenarios,)
+    """
+    rng = np.random.default_rng(seed)
+    return (
+        growth_shift + rng.uniform(-growth_spread, growth_spread, n_scenarios),
+        margin_shift + rng.uniform(-margin_spread, margin_spread, n_scenarios),
+        multiple_scale * (1 + rng.uniform(-multiple_spread, multiple_spread, n_scenarios))
+    )
+
+def projection_frame(years, projection):
+    """
+    Projected rows in the layout of financial_projections_2015_2030.csv
+
+    Args:
+        years: Projected years
+        projection: Result of project_financials for a single scenario
+
+    Returns:
+        DataFrame with PROJECTION_COLUMNS
+    """
+    return pd.DataFrame({
+        'Year': years,
+        'Revenue': projection['revenue'],
+        'Net_Income': projection['net_income'],
+        'Net_Margin_%': projection['net_margin'],
+        'Company_Valuation': projection['valuation'],
+        'Revenue_Multiple': projection['revenue_multiple'],
+        'Status': 'Projected'
+    })[PROJECTION_COLUMNS]
@@ -0,0 +1,159 @@
+"""
+Reserve allocation across the open funding rounds
+
+A fund commits a fixed budget to the company and splits it between checks
+in the rounds still open to it, e.g. a Series B check now and a reserve for
+Series C. Every allocation on a grid of discretized amounts is evaluated at
+once: proceeds per dollar are fixed per round and exit scenario, so the
+proceeds of all candidates are one matrix product, and their IRRs come from
+one vectorized Halley solve.
+
+Budget left unallocated is held in reserve from the first round to the exit
+and returned unused, so capital that is never deployed drags both MOIC and
+IRR.
+"""
+import numpy as np
+
+OBJECTIVES = ('moic', 'irr')
+
+def payout_multiples(waterfall, rounds, amount_raised, exit_valuations):
+    """
+    Proceeds per dollar invested in each round at each exit valuation
+
+    A check in a round is a slice of that round's share class, so its
+    proceeds are the class's waterfall payout in proportion to the check.
+
+    Args:
+        waterfall: Waterfall of the cap table
+        rounds: Round names
+        amount_raised: Amount raised by each round
+        exit_valuations: 1-D array of exit valuations
+
+    Returns:
+        Array of shape (len(rounds), len(exit_valuations))
+    """
+    classes = [waterfall.class_index(name) for name in rounds]
+    payouts = waterfall.payouts(np.asarray(exit_valuations, dtype=float))[classes]
+    return payouts / np.asarray(amount_raised, dtype=float)[:, None]
+
+def _irr(outflows, years_held, proceeds, tol=1e-10, max_iter=50):
+    """
+    Annual IRR of many positions with outflows in several rounds and one exit
+
+    Solves g(y) = sum(outflow * exp(y * years_held)) - proceeds = 0 for
+    y = log(1 + r) with Halley steps, starting from the exact answer for a
+    single outflow at the capital-weighted holding period. g is a sum of
+    exponentials, so three or four steps usually reach machine precision.
+    The arrays are large (every allocation times every scenario), so each
+    step is computed in place.
+
+    Args:
+        outflows: Array (n_positions, n_rounds), non-negative
+        years_held: Years from each round to the exit, shape (n_rounds,)
+        proceeds: Array (n_positions, n_scenarios)
+
+    Returns:
+        IRR % of shape (n_positions, n_scenarios); -100 when nothing is returned
+    """
+    invested = outflows.sum(axis=1)[:, None]
+    duration = (outflows @ years_held)[:, None] / invested
+    with np.errstate(divide='ignore'):
+        y = np.log(proceeds / invested) / duration
+    lost = ~np.isfinite(y)
+    y[lost] = 0.0
+
+    columns = [np.ascontiguousarray(outflows[:, k])[:, None] for k in range(len(years_held))]
+    for _ in range(max_iter):
+        # g and its first two derivatives in y
+        g, d1, d2 = -proceeds, np.zeros_like(y), np.zeros_like(y)
+        for outflow, years in zip(columns, years_held):
+            term = np.exp(y * years)
+            term *= outflow
+            g += term
+            term *= years
+            d1 += term
+            term *= years
+            d2 += term
+
+        # Halley step 2*g*d1 / (2*d1^2 - g*d2)
+        d2 *= g
+        step = g
+        step *= 2 * d1
+        d1 *= d1
+        d1 *= 2
+        d1 -= d2
+        step /= d1
+        step[lost] = 0.0
+        y -= step
+        if np.abs(step).max(initial=0.0) < tol:
+            break
+
+    return np.where(lost, -100.0, np.expm1(y) * 100)
+
+def optimize_reserves(budget, multiples, years_held, probabilities, max_checks,
+                      n_steps=1000, objective='moic'):
+    """
+    Best split of a budget across rounds on a grid of discretized amounts
+
+    Args:
+        budget: Capital committed to the company
+        multiples: Proceeds per dollar, shape (n_rounds, n_scenarios), from payout_multiples
+        years_held: Years from each round to the exit, shape (n_rounds,)
+        probabilities: Weight of each exit scenario (normalized here)
+        max_checks: Largest check each round can take (e.g. its amount raised)
+        n_steps: Grid points per round from $0 to the budget; the grid has
+            n_steps ** n_rounds candidates
+        objective: 'moic' or 'irr', both probability-weighted over the scenarios
+
+    Returns:
+        Dictionary with 'amounts' (the per-round grid, (n_steps,)), 'feasible'
+        and the expected 'moic' and 'irr' over the grid (shape (n_steps,) * n_rounds,
+        NaN where infeasible), 'allocation' (best check per round), 'reserve'
+        (budget left unallocated), 'best' (grid index), and the best candidate's
+        'expected_moic', 'expected_irr' and per-scenario 'scenario_moic' and 'scenario_irr'
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"Unknown objective: {objective!r} (expected one of {OBJECTIVES})")
+
+    multiples = np.asarray(multiples, dtype=float)
+    years_held = np.asarray(years_held, dtype=float)
+    probabilities = np.asarray(probabilities, dtype=float)
+    probabilities = probabilities / probabilities.sum()
+    n_rounds = len(multiples)
+
+    amounts = np.linspace(0.0, budget, n_steps)
+    grid = np.stack(np.meshgrid(*[amounts] * n_rounds, indexing='ij'), axis=-1).reshape(-1, n_rounds)
+    # Tolerances keep grid points that land on the budget or a round's size up to rounding
+    feasible = ((grid.sum(axis=1) <= budget * (1 + 1e-12))
+                & (grid <= np.asarray(max_checks, dtype=float) * (1 + 1e-12)).all(axis=1))
+    checks = grid[feasible]
+
+    # Unallocated budget sits in reserve from the earliest round and comes back at exit
+    reserve = budget - checks.sum(axis=1)
+    outflows = checks.copy()
+    outflows[:, years_held.argmax()] += reserve
+    proceeds = checks @ multiples + reserve[:, None]
+
+    scenario_moic = proceeds / budget
+    scenario_irr = _irr(outflows, years_held, proceeds)
+    expected = {'moic': scenario_moic @ probabilities, 'irr': scenario_irr @ probabilities}
+
+    best = int(np.argmax(expected[objective]))
+    surfaces = {}
+    for metric, values in expected.items():
+        surface = np.full(len(grid), np.nan)
+        surface[feasible] = values
+        surfaces[metric] = surface.reshape((n_steps,) * n_rounds)
+
+    return {
+        'amounts': amounts,
+        'feasible': feasible.reshape((n_steps,) * n_rounds),
+        **surfaces,
+        'allocation': checks[best],
+        'reserve': reserve[best],
+        'best': np.unravel_index(np.flatnonzero(feasible)[best], (n_steps,) * n_rounds),
+        'expected_moic': expected['moic'][best],
+        'expected_irr': expected['irr'][best],
+        'scenario_moic': scenario_moic[best],
+        'scenario_irr': scenario_irr[best]
+    }
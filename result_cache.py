@@ -0,0 +1,339 @@
+"""
+Persistent result cache shared by every Streamlit worker process
+
+Expensive results (sensitivity surfaces, simulations) are pickled into a
+SQLite database in WAL mode, so any number of processes can read while one
+writes, every write is an atomic transaction and entries survive restarts.
+Entries are keyed by a stable hash of the call's arguments salted with the
+source code of the function and the modules it depends on, so editing the
+calculations invalidates old results instead of serving them.
+The database is bounded by total entry bytes with least-recently-used eviction.
+"""
+import functools
+import hashlib
+import importlib
+import inspect
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+CACHE_FORMAT_VERSION = 1
+
+DEFAULT_PATH = Path(os.environ.get('DASHBOARD_RESULT_CACHE',
+                                   Path(__file__).parent.parent / "data" / ".cache" / "results.sqlite"))
+DEFAULT_MAX_BYTES = int(float(os.environ.get('DASHBOARD_RESULT_CACHE_MB', 256)) * 1024 * 1024)
+
+# Seconds a process waits for another process's write to finish
+BUSY_TIMEOUT = 30
+
+# Seconds between writes of lookup bookkeeping (access times and hit/miss counts)
+ACCESS_FLUSH_INTERVAL = 1.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+def _update_hash(digest, value):
+    """Feed a type-tagged canonical encoding of value into digest"""
+    if value is None or isinstance(value, (bool, int, float, complex, str, np.generic)):
+        digest.update(f"{type(value).__name__}:{value!r};".encode())
+    elif isinstance(value, bytes):
+        digest.update(b"bytes:%d;" % len(value))
+        digest.update(value)
+    elif isinstance(value, np.ndarray):
+        if value.dtype == object:
+            digest.update(f"object-array:{value.shape};".encode())
+            _update_hash(digest, value.tolist())
+        else:
+            digest.update(f"array:{value.dtype.str}:{value.shape};".encode())
+            digest.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, (pd.DataFrame, pd.Series)):
+        if isinstance(value, pd.DataFrame):
+            digest.update(f"frame:{[(str(c), str(t)) for c, t in value.dtypes.items()]};".encode())
+        else:
+            digest.update(f"series:{value.name!r}:{value.dtype};".encode())
+        digest.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, (tuple, list)):
+        digest.update(f"{type(value).__name__}:{len(value)};".encode())
+        for item in value:
+            _update_hash(digest, item)
+    elif isinstance(value, dict):
+        items = sorted((stable_hash(key), item) for key, item in value.items())
+        digest.update(f"dict:{len(items)};".encode())
+        for key_hash, item in items:
+            digest.update(key_hash.encode())
+            _update_hash(digest, item)
+    elif isinstance(value, range):
+        digest.update(f"range:{value.start}:{value.stop}:{value.step};".encode())
+    else:
+        raise TypeError(f"Cannot hash {type(value).__name__} stably for the result cache")
+
+def stable_hash(value):
+    """
+    Hash of a value that is the same in every process and across restarts
+
+    Unlike hash() and repr(), the encoding does not depend on object
+    addresses or hash randomization. Scalars, strings, bytes, NumPy arrays,
+    pandas objects and (nested) tuples, lists, dicts and ranges are supported.
+
+    Args:
+        value: Value to hash
+
+    Returns:
+        Hex digest string
+
+    Raises:
+        TypeError: For values without a stable encoding
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    _update_hash(digest, value)
+    return digest.hexdigest()
+
+def code_salt(func, depends_on=()):
+    """
+    Digest of a function's source and the source files of the modules it uses
+
+    Args:
+        func: Function whose results are cached
+        depends_on: Names of modules the results depend on, e.g. 'utils.calculations'
+
+    Returns:
+        Hex digest string
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(f"{CACHE_FORMAT_VERSION}:{func.__module__}.{func.__qualname__};".encode())
+    try:
+        digest.update(inspect.getsource(func).encode())
+    except (OSError, TypeError):
+        pass  # No source available (e.g. an interactive session): the name has to do
+    for name in depends_on:
+        module = importlib.import_module(name)
+        digest.update(f"{name};".encode())
+        digest.update(Path(module.__file__).read_bytes())
+    return digest.hexdigest()
+
+class ResultCache:
+    """
+    Byte-bounded LRU of pickled results in a SQLite database
+
+    Every process and thread opens its own connection; SQLite's locking
+    makes concurrent use safe. Hit, miss and eviction counters are stored in
+    the database, so they cover every process using it. When the database
+    cannot be opened or written (e.g. a read-only deployment) the cache
+    reports misses and results are simply recomputed.
+
+    Lookups are plain reads, which never wait for other processes. Their
+    access times and hit/miss counts are kept in memory and written in
+    batches by a write that gives up at once when the database is locked,
+    so recency and counters may lag behind the lookups by a moment.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._pending_lock = threading.Lock()
+        self._reset_pending()
+
+    def _reset_pending(self):
+        self._pending_accessed = {}
+        self._pending_counts = {}
+        self._pending_pid = os.getpid()
+        self._last_flush = time.monotonic()
+
+    def _connect(self):
+        """This thread's connection, reopened after a fork"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_SCHEMA)
+        self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    @staticmethod
+    def _count(conn, name, amount=1):
+        conn.execute(
+            "INSERT INTO counters (name, value) VALUES (?, ?) "
+            "ON CONFLICT (name) DO UPDATE SET value = value + excluded.value",
+            (name, amount)
+        )
+
+    def _record(self, key, hit):
+        """Queue a lookup's bookkeeping; a forked process starts with an empty queue"""
+        with self._pending_lock:
+            if self._pending_pid != os.getpid():
+                self._reset_pending()
+            name = 'hits' if hit else 'misses'
+            self._pending_counts[name] = self._pending_counts.get(name, 0) + 1
+            if hit:
+                self._pending_accessed[key] = time.time()
+
+    def _flush(self, conn, force=False):
+        """
+        Write queued access times and counters without waiting for a lock
+
+        Bookkeeping that cannot be written now (another process holds the
+        write lock) stays queued for the next attempt.
+        """
+        with self._pending_lock:
+            if self._pending_pid != os.getpid():
+                self._reset_pending()
+            due = force or time.monotonic() - self._last_flush >= ACCESS_FLUSH_INTERVAL
+            if not due or not (self._pending_accessed or self._pending_counts):
+                return
+            accessed, counts = self._pending_accessed, self._pending_counts
+            self._pending_accessed, self._pending_counts = {}, {}
+            self._last_flush = time.monotonic()
+
+        try:
+            conn.execute("PRAGMA busy_timeout = 0")
+            try:
+                with conn:
+                    conn.execute("BEGIN IMMEDIATE")
+                    conn.executemany("UPDATE entries SET accessed = MAX(accessed, ?) WHERE key = ?",
+                                     [(stamp, key) for key, stamp in accessed.items()])
+                    for name, amount in counts.items():
+                        self._count(conn, name, amount)
+            finally:
+                conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT * 1000}")
+        except sqlite3.Error:
+            # Locked (or unwritable): put the bookkeeping back for a later flush
+            with self._pending_lock:
+                for key, stamp in accessed.items():
+                    self._pending_accessed[key] = max(stamp, self._pending_accessed.get(key, stamp))
+                for name, amount in counts.items():
+                    self._pending_counts[name] = self._pending_counts.get(name, 0) + amount
+
+    def get(self, key):
+        """Cached bytes for key, or None (counted as a miss)"""
+        try:
+            conn = self._connect()
+            row = conn.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+        except (OSError, sqlite3.Error):
+            return None
+
+        self._record(key, row is not None)
+        self._flush(conn)
+        return None if row is None else row[0]
+
+    def put(self, key, value):
+        """Store bytes for key, evicting least recently used entries to stay within max_bytes"""
+        size = len(value)
+        if size > self.max_bytes:
+            return
+        try:
+            conn = self._connect()
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.execute(
+                    "INSERT OR REPLACE INTO entries (key, value, size, accessed) VALUES (?, ?, ?, ?)",
+                    (key, value, size, time.time())
+                )
+                excess = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0] - self.max_bytes
+                if excess <= 0:
+                    return
+                evicted = []
+                for old_key, old_size in conn.execute(
+                        "SELECT key, size FROM entries WHERE key != ? ORDER BY accessed", (key,)):
+                    if excess <= 0:
+                        break
+                    evicted.append((old_key,))
+                    excess -= old_size
+                conn.executemany("DELETE FROM entries WHERE key = ?", evicted)
+                self._count(conn, 'evictions', len(evicted))
+        except (OSError, sqlite3.Error):
+            pass  # Unwritable cache: the result is still returned to the caller
+
+    def clear(self):
+        """Drop every entry and reset the counters"""
+        with self._pending_lock:
+            self._reset_pending()
+        try:
+            conn = self._connect()
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.execute("DELETE FROM entries")
+                conn.execute("DELETE FROM counters")
+        except (OSError, sqlite3.Error):
+            pass  # Locked or unwritable cache: entries stay until they are evicted
+
+    def stats(self):
+        """Hit/miss/eviction counters of all processes and current size"""
+        try:
+            conn = self._connect()
+            self._flush(conn, force=True)
+            counters = dict(conn.execute("SELECT name, value FROM counters"))
+            entries, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        except (OSError, sqlite3.Error):
+            counters, entries, total = {}, 0, 0
+        hits, misses = counters.get('hits', 0), counters.get('misses', 0)
+        lookups = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / lookups if lookups else 0.0,
+            'evictions': counters.get('evictions', 0),
+            'entries': entries,
+            'bytes': total,
+            'max_bytes': self.max_bytes
+        }
+
+RESULT_CACHE = ResultCache()
+
+def disk_cached(func=None, cache=None, depends_on=()):
+    """
+    Decorator caching a function's results in a ResultCache
+
+    Arguments are bound to the signature (defaults applied) before hashing,
+    so positional and keyword calls share entries. Results must be picklable.
+
+    Args:
+        func: Function to cache
+        cache: ResultCache to use (default: the shared RESULT_CACHE)
+        depends_on: Names of modules whose source is part of the key
+
+    Returns:
+        Wrapped function with the same signature
+    """
+    if func is None:
+        return functools.partial(disk_cached, cache=cache, depends_on=depends_on)
+
+    signature = inspect.signature(func)
+    salt = code_salt(func, depends_on)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        store = RESULT_CACHE if cache is None else cache
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        key = f"{salt}:{stable_hash(dict(bound.arguments))}"
+
+        blob = store.get(key)
+        if blob is not None:
+            return pickle.loads(blob)
+        result = func(*args, **kwargs)
+        store.put(key, pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL))
+        return result
+
+    wrapper.uncached = func
+    return wrapper
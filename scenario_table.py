@@ -0,0 +1,183 @@
+"""
+Precomputed results for every state of the Investment Scenarios calculator
+
+The calculator's inputs have a small discrete domain: a funding round, an
+investment amount in $100K slider steps and one of three exit scenarios.
+ScenarioTable evaluates every reachable combination in one broadcast pass
+per round and keeps the results as arrays indexed by slider position, so a
+rerun only slices the table.
+
+Exit proceeds follow the liquidation preference waterfall of the funding
+rounds data: a check in a round receives its slice of that round's class.
+"""
+import numpy as np
+
+from utils.calculations import calculate_roi_batch
+from utils.waterfall import Waterfall
+
+# Investment amount slider per round: (min, max, default)
+SLIDER_DOMAINS = {
+    'Series B': (500_000, 8_000_000, 2_000_000),
+    'Series C': (1_000_000, 20_000_000, 5_000_000)
+}
+AMOUNT_STEP = 100_000
+
+EXIT_YEAR = 2030
+EXIT_SCENARIOS = {
+    'IPO (2030)': 240_000_000,
+    'Conservative (80% of IPO)': 192_000_000,
+    'Optimistic (120% of IPO)': 288_000_000
+}
+
+# Exit valuations of the sensitivity analysis
+SENSITIVITY_VALUATIONS = (160_000_000, 200_000_000, 240_000_000, 280_000_000, 320_000_000)
+
+METRICS = ('exit_value', 'absolute_return', 'moic', 'irr')
+
+class ScenarioTable:
+    """
+    Calculator results for every (round, amount, exit scenario)
+
+    Per round, with n slider positions, s exit scenarios, v sensitivity
+    valuations and r comparison rounds:
+
+        amounts              (n,)       investment amount at each position
+        ownership_at_exit    (n,)       diluted ownership %
+        roi[metric]          (s, n)     returns of the round itself
+        sensitivity[metric]  (v, n)     returns across SENSITIVITY_VALUATIONS
+        comparison[metric]   (r, s, n)  the same check in each comparison round,
+                                        capped at that round's size
+    """
+
+    def __init__(self, funding_rounds, cap_table, rounds=tuple(SLIDER_DOMAINS)):
+        """
+        Args:
+            funding_rounds: DataFrame as in funding_rounds_overview.csv, with the
+                preference terms read by Waterfall.from_funding_rounds
+            cap_table: CapTable used to dilute stakes to exit
+            rounds: Rounds offered by the calculator, also the comparison rounds
+        """
+        self.rounds = list(rounds)
+        self.scenarios = list(EXIT_SCENARIOS)
+
+        round_data = funding_rounds.set_index('Round').loc[[name.replace(' ', '_') for name in self.rounds]]
+        self.round_years = round_data['Year'].to_numpy()
+        self.post_money_valuation = round_data['Post_Money_Valuation'].to_numpy(dtype=float)
+        self.amount_raised = round_data['Amount_Raised'].to_numpy(dtype=float)
+        self.dilution = np.array([cap_table.dilution_factor(name) for name in self.rounds])
+        self.years_held = EXIT_YEAR - self.round_years
+        self.waterfall = Waterfall.from_funding_rounds(funding_rounds, cap_table)
+
+        scenario_valuations = np.array(list(EXIT_SCENARIOS.values()), dtype=float)
+        valuations = np.concatenate([scenario_valuations, SENSITIVITY_VALUATIONS])
+        n_scenarios = len(scenario_valuations)
+
+        # Share of the proceeds each round's class receives at every valuation,
+        # relative to its stake at entry: the waterfall's counterpart of dilution
+        classes = [self.waterfall.class_index(name) for name in self.rounds]
+        entry_stake = self.amount_raised / self.post_money_valuation
+        payout_dilution = self.waterfall.proceeds_share(valuations)[classes] / entry_stake[:, None]
+
+        self._tables = {}
+        for i, round_name in enumerate(self.rounds):
+            low, high, _ = SLIDER_DOMAINS[round_name]
+            amounts = np.arange(low, high + AMOUNT_STEP, AMOUNT_STEP, dtype=float)
+
+            # Valuations x amounts: exit scenarios first, then the sensitivity points
+            grid = calculate_roi_batch(
+                investment_amount=amounts[None, :],
+                round_post_money_val=self.post_money_valuation[i],
+                exit_valuation=valuations[:, None],
+                years_held=self.years_held[i],
+                dilution_factor=payout_dilution[i][:, None]
+            )
+
+            # Comparison rounds x exit scenarios x amounts
+            compare_investment = np.minimum(amounts[None, :], self.amount_raised[:, None])
+            comparison = calculate_roi_batch(
+                investment_amount=compare_investment[:, None, :],
+                round_post_money_val=self.post_money_valuation[:, None, None],
+                exit_valuation=scenario_valuations[None, :, None],
+                years_held=self.years_held[:, None, None],
+                dilution_factor=payout_dilution[:, :n_scenarios, None]
+            )
+
+            self._tables[round_name] = {
+                'amounts': amounts,
+                'ownership_at_exit': amounts / self.post_money_valuation[i] * self.dilution[i] * 100,
+                'roi': {metric: grid[metric][:n_scenarios].copy() for metric in METRICS},
+                'sensitivity': {metric: grid[metric][n_scenarios:].copy() for metric in METRICS},
+                'compare_investment': compare_investment,
+                'comparison': {metric: comparison[metric].copy() for metric in METRICS}
+            }
+
+    @property
+    def nbytes(self):
+        """Memory held by the table's arrays"""
+        total = 0
+        for table in self._tables.values():
+            for value in table.values():
+                arrays = value.values() if isinstance(value, dict) else [value]
+                total += sum(array.nbytes for array in arrays)
+        return total
+
+    def amounts(self, round_name):
+        """Investment amount at every slider position of a round"""
+        return self._tables[round_name]['amounts']
+
+    def position(self, round_name, investment_amount):
+        """Slider position of an amount, clamped to the round's domain"""
+        low, high, _ = SLIDER_DOMAINS[round_name]
+        return int(round((min(max(investment_amount, low), high) - low) / AMOUNT_STEP))
+
+    def lookup(self, round_name, investment_amount, exit_scenario):
+        """
+        Returns of one calculator state
+
+        Args:
+            round_name: Round the check is written in
+            investment_amount: Amount on the slider
+            exit_scenario: Key of EXIT_SCENARIOS
+
+        Returns:
+            Dictionary with the same keys as calculate_custom_investment_roi
+        """
+        table = self._tables[round_name]
+        n = self.position(round_name, investment_amount)
+        s = self.scenarios.index(exit_scenario)
+        return {
+            'investment': investment_amount,
+            **{metric: table['roi'][metric][s, n].item() for metric in METRICS},
+            'years_held': int(self.years_held[self.rounds.index(round_name)]),
+            'ownership_at_exit': table['ownership_at_exit'][n].item()
+        }
+
+    def comparison(self, round_name, investment_amount, exit_scenario):
+        """
+        The same check written in every comparison round
+
+        Returns:
+            Dictionary of per-round arrays: 'round', 'investment',
+            'entry_valuation', 'years_held' and the METRICS
+        """
+        table = self._tables[round_name]
+        n = self.position(round_name, investment_amount)
+        s = self.scenarios.index(exit_scenario)
+        return {
+            'round': self.rounds,
+            'investment': table['compare_investment'][:, n],
+            'entry_valuation': self.post_money_valuation,
+            'years_held': self.years_held,
+            **{metric: table['comparison'][metric][:, s, n] for metric in METRICS}
+        }
+
+    def sensitivity(self, round_name, investment_amount):
+        """Returns at each of SENSITIVITY_VALUATIONS, as arrays per metric"""
+        table = self._tables[round_name]
+        n = self.position(round_name, investment_amount)
+        return {metric: table['sensitivity'][metric][:, n] for metric in METRICS}
+
+    def curves(self, round_name, metric='absolute_return'):
+        """One metric across every slider position, per exit scenario"""
+        table = self._tables[round_name]
+        return dict(zip(self.scenarios, table['roi'][metric]))
@@ -0,0 +1,179 @@
+"""
+Monte Carlo exit simulation for investor returns
+"""
+import numpy as np
+
+from utils.calculations import calculate_roi_batch
+
+# Histogram grids used to summarize simulated returns without keeping every path
+MOIC_BIN_EDGES = np.concatenate(([0.0], np.logspace(-3, 3, 4801)))
+IRR_BIN_EDGES = np.linspace(-100.0, 500.0, 6001)
+
+DEFAULT_PERCENTILES = (5, 10, 25, 50, 75, 90, 95)
+
+def lognormal(median, sigma):
+    """
+    Lognormal distribution parameterized by its median
+
+    Args:
+        median: Median of the distribution
+        sigma: Standard deviation of the underlying normal (log-space volatility)
+
+    Returns:
+        Sampler taking (rng, size) and returning an array of draws
+    """
+    def sample(rng, size):
+        return median * np.exp(sigma * rng.standard_normal(size))
+    return sample
+
+def triangular(low, mode, high):
+    """Triangular distribution between low and high peaking at mode"""
+    def sample(rng, size):
+        return rng.triangular(low, mode, high, size)
+    return sample
+
+def uniform(low, high):
+    """Uniform distribution between low and high"""
+    def sample(rng, size):
+        return rng.uniform(low, high, size)
+    return sample
+
+def discrete(values, probabilities=None):
+    """
+    Discrete distribution over a fixed set of values
+
+    Args:
+        values: Possible outcomes (e.g. exit years)
+        probabilities: Optional weights, normalized to sum to 1
+
+    Returns:
+        Sampler taking (rng, size) and returning an array of draws
+    """
+    values = np.asarray(values)
+    if probabilities is not None:
+        probabilities = np.asarray(probabilities, dtype=float)
+        probabilities = probabilities / probabilities.sum()
+
+    def sample(rng, size):
+        return rng.choice(values, size=size, p=probabilities)
+    return sample
+
+def constant(value):
+    """Degenerate distribution that always returns value"""
+    def sample(rng, size):
+        return np.full(size, value, dtype=float)
+    return sample
+
+def _histogram_percentiles(bin_edges, counts, percentiles):
+    """Interpolate percentiles from binned counts"""
+    cumulative = np.cumsum(counts)
+    total = cumulative[-1]
+    if total == 0:
+        return {p: float('nan') for p in percentiles}
+
+    targets = np.asarray(percentiles, dtype=float) / 100 * total
+    bins = np.searchsorted(cumulative, targets, side='left')
+    bins = np.minimum(bins, len(counts) - 1)
+
+    below = np.where(bins > 0, cumulative[bins - 1], 0)
+    in_bin = np.maximum(counts[bins], 1)
+    fraction = np.clip((targets - below) / in_bin, 0, 1)
+    values = bin_edges[bins] + fraction * (bin_edges[bins + 1] - bin_edges[bins])
+
+    return {p: float(v) for p, v in zip(percentiles, values)}
+
+def simulate_exit_returns(investment_amount, round_post_money_val, round_year,
+                          exit_valuation, exit_year, dilution_factor,
+                          n_paths=1_000_000, chunk_size=250_000, seed=42,
+                          benchmark_moic=3.0, percentiles=DEFAULT_PERCENTILES, payout=None):
+    """
+    Simulate the distribution of investor returns over uncertain exits
+
+    Draws are generated in fixed-size chunks and folded into histograms, so
+    memory use depends on chunk_size rather than n_paths.
+
+    Args:
+        investment_amount: Amount invested
+        round_post_money_val: Post-money valuation of the round
+        round_year: Year of investment
+        exit_valuation: Sampler for the company valuation at exit
+        exit_year: Sampler for the exit year
+        dilution_factor: Sampler for the exit/entry ownership ratio
+        n_paths: Number of simulated exits
+        chunk_size: Number of paths evaluated per vectorized pass
+        seed: Seed for the random generator (same seed, same results)
+        benchmark_moic: MOIC hurdle used for prob_beat_benchmark (default 3x)
+        percentiles: Percentiles to report for MOIC and IRR
+        payout: Optional function of the sampled exit valuations whose result
+            multiplies dilution_factor, e.g. a round's Waterfall.payout_factor
+            so proceeds follow the liquidation preferences
+
+    Returns:
+        Dictionary with MOIC/IRR percentiles, loss and benchmark probabilities
+        and the MOIC histogram
+    """
+    rng = np.random.default_rng(seed)
+
+    moic_counts = np.zeros(len(MOIC_BIN_EDGES) - 1, dtype=np.int64)
+    irr_counts = np.zeros(len(IRR_BIN_EDGES) - 1, dtype=np.int64)
+    moic_sum = 0.0
+    irr_sum = 0.0
+    exit_value_sum = 0.0
+    losses = 0
+    beats_benchmark = 0
+
+    log_lo = np.log10(MOIC_BIN_EDGES[1])
+    log_step = np.log10(MOIC_BIN_EDGES[2]) - log_lo
+    irr_lo = IRR_BIN_EDGES[0]
+    irr_step = IRR_BIN_EDGES[1] - IRR_BIN_EDGES[0]
+
+    remaining = n_paths
+    while remaining > 0:
+        size = min(chunk_size, remaining)
+        remaining -= size
+
+        valuations = exit_valuation(rng, size)
+        years_held = exit_year(rng, size) - round_year
+        dilution = dilution_factor(rng, size)
+        if payout is not None:
+            dilution = dilution * payout(valuations)
+
+        roi = calculate_roi_batch(
+            investment_amount=investment_amount,
+            round_post_money_val=round_post_money_val,
+            exit_valuation=valuations,
+            years_held=years_held,
+            dilution_factor=dilution
+        )
+        moic = roi['moic']
+        irr = roi['irr']
+
+        # Bin 0 holds MOIC below 0.001x; the log grid starts at bin 1
+        with np.errstate(divide='ignore'):
+            moic_bins = np.floor((np.log10(moic) - log_lo) / log_step) + 1
+        moic_bins = np.clip(np.nan_to_num(moic_bins, neginf=0), 0, len(moic_counts) - 1)
+        moic_counts += np.bincount(moic_bins.astype(np.intp), minlength=len(moic_counts))
+
+        irr_bins = np.clip(np.floor((irr - irr_lo) / irr_step), 0, len(irr_counts) - 1)
+        irr_counts += np.bincount(irr_bins.astype(np.intp), minlength=len(irr_counts))
+
+        moic_sum += moic.sum()
+        irr_sum += irr.sum()
+        exit_value_sum += roi['exit_value'].sum()
+        losses += np.count_nonzero(moic < 1)
+        beats_benchmark += np.count_nonzero(moic > benchmark_moic)
+
+    return {
+        'n_paths': n_paths,
+        'seed': seed,
+        'mean_moic': float(moic_sum / n_paths),
+        'mean_irr': float(irr_sum / n_paths),
+        'mean_exit_value': float(exit_value_sum / n_paths),
+        'moic_percentiles': _histogram_percentiles(MOIC_BIN_EDGES, moic_counts, percentiles),
+        'irr_percentiles': _histogram_percentiles(IRR_BIN_EDGES, irr_counts, percentiles),
+        'prob_loss': int(losses) / n_paths,
+        'prob_beat_benchmark': int(beats_benchmark) / n_paths,
+        'benchmark_moic': benchmark_moic,
+        'moic_bin_edges': MOIC_BIN_EDGES,
+        'moic_counts': moic_counts
+    }
@@ -0,0 +1,53 @@
+"""
+Display formatting for dashboard tables
+"""
+import streamlit as st
+
+from utils.calculations import format_currency_array, format_percentage_array, format_multiple_array
+
+# Tables longer than this keep numeric columns and let the grid format them
+NUMERIC_TABLE_ROWS = 10_000
+
+# Column kind -> (vectorized formatter, default decimals, printf template for st.column_config)
+COLUMN_FORMATS = {
+    'currency': (format_currency_array, 0, "$%,.{}f"),
+    'percentage': (format_percentage_array, 1, "%.{}f%%"),
+    'multiple': (format_multiple_array, 2, "%.{}fx"),
+}
+
+def format_table(df, columns, numeric=None):
+    """
+    Prepare a DataFrame for st.dataframe
+
+    Either converts the listed columns to display strings in one vectorized
+    pass per column, or leaves them numeric and returns a column_config that
+    formats them in the browser (no string copy of the data, and columns sort
+    by value). Currency is shown in full ("$8,000,000") in numeric mode.
+
+    Args:
+        df: DataFrame to display
+        columns: Dict of column name -> kind ('currency', 'percentage' or
+            'multiple'), or -> (kind, decimals) to override the decimals
+        numeric: Keep columns numeric; by default only for tables longer
+            than NUMERIC_TABLE_ROWS
+
+    Returns:
+        Tuple of (DataFrame, column_config) for st.dataframe
+    """
+    if numeric is None:
+        numeric = len(df) > NUMERIC_TABLE_ROWS
+
+    column_config = {} if numeric else None
+    display_df = df if numeric else df.copy(deep=False)
+
+    for column, kind in columns.items():
+        kind, decimals = kind if isinstance(kind, tuple) else (kind, None)
+        formatter, default_decimals, template = COLUMN_FORMATS[kind]
+        decimals = default_decimals if decimals is None else decimals
+
+        if numeric:
+            column_config[column] = st.column_config.NumberColumn(format=template.format(decimals))
+        else:
+            display_df[column] = formatter(df[column], decimals)
+
+    return display_df, column_config
@@ -0,0 +1,31 @@
+"""
+Tests for the exit-year return grid
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.calculations import calculate_exit_year_returns
+from utils.cap_table import CapTable, DATA_PATH
+
+def test_round_after_every_exit_year_has_no_best_year():
+    cap_table = CapTable.from_funding_rounds(pd.read_csv(DATA_PATH / "funding_rounds_overview.csv"))
+    exit_years = np.array([2020, 2021, 2022])
+    result = calculate_exit_year_returns(
+        [1_000_000], exit_years, [80e6, 100e6, 120e6], rounds=['Seed', 'Series C'], cap_table=cap_table
+    )
+
+    # Seed (2015) can exit in every year; Series C (2028) in none
+    assert result['best_irr_year'][0, 0] in exit_years
+    assert np.isnan(result['best_irr_year'][1, 0])
+    assert np.isnan(result['best_moic_year'][1, 0])
+    assert np.isnan(result['moic'][1]).all()
+
+    # What the ROI Analysis exit year table does with those years
+    years = pd.array(result['best_irr_year'][:, 0], dtype='Int64')
+    assert years[0] in exit_years
+    assert years[1] is pd.NA
@@ -0,0 +1,47 @@
+"""
+Tests for the pro-rata follow-on strategies
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.cap_table import CapTable, DATA_PATH
+from utils.follow_on import enumerate_follow_ons
+from utils.waterfall import Waterfall
+from utils.xirr import quarter_midpoint
+
+@pytest.fixture(scope='module')
+def setup():
+    funding_rounds = pd.read_csv(DATA_PATH / "funding_rounds_overview.csv")
+    cap_table = CapTable.from_funding_rounds(funding_rounds)
+    dates = dict(zip(funding_rounds['Round'], funding_rounds['Date'].map(quarter_midpoint)))
+    return cap_table, dates, Waterfall.from_funding_rounds(funding_rounds, cap_table)
+
+def test_ipo_valuation_pays_follow_ons_pro_rata(setup):
+    cap_table, dates, waterfall = setup
+    pro_rata = enumerate_follow_ons(cap_table, 'Seed', 250_000, dates, 240e6)
+    preferred = enumerate_follow_ons(cap_table, 'Seed', 250_000, dates, 240e6, waterfall=waterfall)
+    np.testing.assert_allclose(preferred['exit_value'], pro_rata['exit_value'], rtol=1e-9)
+
+def test_low_exit_pays_each_check_from_its_class(setup):
+    cap_table, dates, waterfall = setup
+    exit_valuation = 30e6
+    result = enumerate_follow_ons(cap_table, 'Series_A', 1_000_000, dates, exit_valuation, waterfall=waterfall)
+
+    payouts = waterfall.payouts(exit_valuation)
+    a, b, c = (waterfall.class_index(name) for name in ('Series_A', 'Series_B', 'Series_C'))
+    raised = dict(zip(cap_table.round_names, cap_table.amount_raised))
+    expected = (1_000_000 / raised['Series_A'] * payouts[a]
+                + result['follow_on'][:, 0] / raised['Series_B'] * payouts[b]
+                + result['follow_on'][:, 1] / raised['Series_C'] * payouts[c])
+    np.testing.assert_allclose(result['exit_value'], expected)
+
+    # Below the preference stack the senior follow-ons are paid ahead of the pro-rata split
+    pro_rata = enumerate_follow_ons(cap_table, 'Series_A', 1_000_000, dates, exit_valuation)
+    full = np.all(result['participation'] == 1.0, axis=1)
+    assert (result['exit_value'][full] > pro_rata['exit_value'][full]).all()
@@ -0,0 +1,78 @@
+"""
+Tests for the vectorized display formatters
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils import calculations
+from utils.calculations import (
+    format_currency, format_percentage, format_multiple,
+    format_currency_array, format_percentage_array, format_multiple_array
+)
+from utils.tables import format_table
+
+VALUES = [
+    0.0, -0.0, 1.0, -1.0, 0.004, 0.005, 0.015, 0.125, 2.675, 12.345, -12.345,
+    999.4, 999.5, 999.995, -999.995, 999.9999, 1_000.0, 1_234.5, 999_499.0, 999_500.0,
+    999_999.5, -999_999.5, 1_000_000.0, 2_500_000.0, 240_000_000.0, 1e12, -1e12, 1e18, 1.5e20,
+    np.nan, np.inf, -np.inf,
+]
+
+PAIRS = [
+    (format_currency_array, format_currency, (0, 1, 2)),
+    (format_percentage_array, format_percentage, (0, 1, 2)),
+    (format_multiple_array, format_multiple, (0, 1, 2)),
+]
+
+@pytest.fixture(params=[True, False], ids=['arrow', 'fallback'])
+def arrow(request, monkeypatch):
+    if not request.param:
+        monkeypatch.setattr(calculations, 'pa', None)
+    elif calculations.pa is None:
+        pytest.skip("pyarrow is not installed")
+    return request.param
+
+@pytest.mark.parametrize('vectorized, scalar, decimal_options', PAIRS)
+def test_array_formatters_match_scalar_formatters(arrow, vectorized, scalar, decimal_options):
+    for decimals in decimal_options:
+        expected = [scalar(value, decimals) for value in VALUES]
+        assert vectorized(np.array(VALUES), decimals).tolist() == expected
+
+def test_series_input_keeps_index_and_name():
+    values = pd.Series([1_500.0, np.nan], index=['a', 'b'], name='Exit')
+    text = format_currency_array(values)
+    assert text.index.tolist() == ['a', 'b']
+    assert text.name == 'Exit'
+    assert text.tolist() == ['$2K', '$nan']
+
+def test_format_table_matches_scalar_formatters(arrow):
+    df = pd.DataFrame({
+        'Investment': VALUES,
+        'IRR': VALUES,
+        'MOIC': VALUES,
+        'Label': [str(i) for i in range(len(VALUES))],
+    })
+    display_df, column_config = format_table(
+        df, {'Investment': ('currency', 1), 'IRR': 'percentage', 'MOIC': 'multiple'}, numeric=False
+    )
+
+    assert column_config is None
+    assert display_df['Investment'].tolist() == [format_currency(value, 1) for value in VALUES]
+    assert display_df['IRR'].tolist() == [format_percentage(value) for value in VALUES]
+    assert display_df['MOIC'].tolist() == [format_multiple(value) for value in VALUES]
+    assert display_df['Label'].tolist() == df['Label'].tolist()
+    # The input frame keeps its numbers
+    assert df['IRR'].dtype == float
+
+def test_format_table_numeric_mode_leaves_values_alone():
+    df = pd.DataFrame({'IRR': [12.345, np.nan]})
+    display_df, column_config = format_table(df, {'IRR': 'percentage'}, numeric=True)
+
+    assert display_df['IRR'].dtype == float
+    assert set(column_config) == {'IRR'}
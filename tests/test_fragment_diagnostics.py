@@ -0,0 +1,62 @@
+"""
+Tests for diagnostics of fragment reruns on the Investment Scenarios page
+"""
+import functools
+import json
+import sys
+from pathlib import Path
+
+from streamlit.runtime.scriptrunner import RerunData
+from streamlit.testing.v1 import AppTest, local_script_runner
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils import timing
+
+PAGE = Path(__file__).parent.parent / "pages" / "4_🎯_Investment_Scenarios.py"
+
+def _logged(path):
+    if not path.exists():
+        return []
+    return [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines()]
+
+def _run_fragment(at, widget, value, fragment_id, monkeypatch):
+    """
+    Change a widget and rerun only the fragment it belongs to
+
+    AppTest reruns the whole script after every widget change, while the
+    browser asks for a rerun of the widget's fragment. The rerun request is
+    scoped to the fragment here, as the browser's would be.
+    """
+    with monkeypatch.context() as patch:
+        patch.setattr(local_script_runner, 'RerunData',
+                      functools.partial(RerunData, fragment_id_queue=[fragment_id]))
+        widget.set_value(value).run()
+
+def test_slider_rerun_is_logged_as_a_fragment_run(tmp_path, monkeypatch):
+    log_path = tmp_path / "timings.jsonl"
+    monkeypatch.setattr(timing, 'LOG_PATH', log_path)
+
+    at = AppTest.from_file(str(PAGE), default_timeout=120)
+    at.query_params['diagnostics'] = '1'
+    at.run()
+    assert not at.exception
+    full_run = _logged(log_path)
+    assert {record['page'] for record in full_run} == {"Investment Scenarios"}
+    assert "sensitivity" in {record['section'] for record in full_run}
+
+    # The investment section is the first fragment the page registers
+    fragments = at._fragment_storage
+    fragment_id = min((i for i, parent in fragments._parent_by_id.items() if parent is None),
+                      key=fragments._registration_sequence_by_id.get)
+
+    amount = next(slider for slider in at.slider if slider.label == "Investment Amount ($)")
+    _run_fragment(at, amount, 4_000_000, fragment_id, monkeypatch)
+    assert not at.exception
+
+    rerun = _logged(log_path)[len(full_run):]
+    assert {record['page'] for record in rerun} == {"Investment Scenarios: investment_section"}
+    sections = {record['section'] for record in rerun}
+    assert {"sensitivity", "ROI", "chart: check size"} <= sections
+    assert "data load" not in sections
+    assert any(expander.label == "⏱️ Diagnostics" for expander in at.main.expander)
@@ -0,0 +1,101 @@
+"""
+Tests for the precomputed Investment Scenarios table
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.calculations import calculate_roi_batch
+from utils.cap_table import CapTable, DATA_PATH
+from utils.scenario_table import (
+    ScenarioTable, SLIDER_DOMAINS, AMOUNT_STEP, EXIT_SCENARIOS, EXIT_YEAR, SENSITIVITY_VALUATIONS, METRICS
+)
+
+AMOUNTS = {
+    'Series B': [500_000, 2_000_000, 3_700_000, 8_000_000],
+    'Series C': [1_000_000, 5_000_000, 12_300_000, 20_000_000],
+}
+
+@pytest.fixture(scope='module')
+def funding_rounds():
+    return pd.read_csv(DATA_PATH / "funding_rounds_overview.csv")
+
+@pytest.fixture(scope='module')
+def table(funding_rounds):
+    return ScenarioTable(funding_rounds, CapTable.from_funding_rounds(funding_rounds))
+
+def _direct(funding_rounds, table, round_name, investment_amount, exit_valuation):
+    """Returns of one check computed straight from the waterfall"""
+    row = funding_rounds.set_index('Round').loc[round_name.replace(' ', '_')]
+    entry_stake = row['Amount_Raised'] / row['Post_Money_Valuation']
+    result = calculate_roi_batch(
+        investment_amount=investment_amount,
+        round_post_money_val=row['Post_Money_Valuation'],
+        exit_valuation=exit_valuation,
+        years_held=EXIT_YEAR - row['Year'],
+        dilution_factor=table.waterfall.payout_factor(round_name, entry_stake, exit_valuation)
+    )
+
+    # The check's slice of its class's payout
+    payout = table.waterfall.payouts(exit_valuation)[table.waterfall.class_index(round_name)]
+    np.testing.assert_allclose(result['exit_value'], payout * investment_amount / row['Amount_Raised'])
+    return result
+
+@pytest.mark.parametrize('round_name', SLIDER_DOMAINS)
+def test_lookup_matches_direct_calculation(funding_rounds, table, round_name):
+    for investment_amount in AMOUNTS[round_name]:
+        for scenario, exit_valuation in EXIT_SCENARIOS.items():
+            expected = _direct(funding_rounds, table, round_name, investment_amount, exit_valuation)
+            result = table.lookup(round_name, investment_amount, scenario)
+
+            assert result['investment'] == investment_amount
+            assert result['years_held'] == expected['years_held']
+            for metric in METRICS:
+                assert result[metric] == pytest.approx(expected[metric].item(), rel=1e-12), metric
+
+@pytest.mark.parametrize('round_name', SLIDER_DOMAINS)
+def test_sensitivity_matches_direct_calculation(funding_rounds, table, round_name):
+    valuations = np.array(SENSITIVITY_VALUATIONS, dtype=float)
+    for investment_amount in AMOUNTS[round_name]:
+        expected = _direct(funding_rounds, table, round_name, investment_amount, valuations)
+        result = table.sensitivity(round_name, investment_amount)
+        for metric in METRICS:
+            np.testing.assert_allclose(result[metric], expected[metric], rtol=1e-12)
+
+@pytest.mark.parametrize('round_name', SLIDER_DOMAINS)
+def test_comparison_caps_the_check_at_each_round_size(funding_rounds, table, round_name):
+    raised = funding_rounds.set_index('Round')['Amount_Raised']
+    for investment_amount in AMOUNTS[round_name]:
+        for scenario, exit_valuation in EXIT_SCENARIOS.items():
+            result = table.comparison(round_name, investment_amount, scenario)
+            assert result['round'] == list(SLIDER_DOMAINS)
+
+            for i, compare_round in enumerate(result['round']):
+                check = min(investment_amount, raised[compare_round.replace(' ', '_')])
+                expected = _direct(funding_rounds, table, compare_round, check, exit_valuation)
+                assert result['investment'][i] == check
+                for metric in METRICS:
+                    assert result[metric][i] == pytest.approx(expected[metric].item(), rel=1e-12), metric
+
+@pytest.mark.parametrize('round_name', SLIDER_DOMAINS)
+def test_curves_follow_every_slider_position(funding_rounds, table, round_name):
+    low, high, _ = SLIDER_DOMAINS[round_name]
+    amounts = table.amounts(round_name)
+    np.testing.assert_array_equal(amounts, np.arange(low, high + AMOUNT_STEP, AMOUNT_STEP))
+
+    curves = table.curves(round_name, 'moic')
+    assert list(curves) == list(EXIT_SCENARIOS)
+    for scenario, exit_valuation in EXIT_SCENARIOS.items():
+        expected = _direct(funding_rounds, table, round_name, amounts, exit_valuation)
+        np.testing.assert_allclose(curves[scenario], expected['moic'], rtol=1e-12)
+
+def test_position_clamps_to_the_slider_domain(table):
+    low, high, _ = SLIDER_DOMAINS['Series B']
+    assert table.position('Series B', low - AMOUNT_STEP) == 0
+    assert table.position('Series B', high + AMOUNT_STEP) == len(table.amounts('Series B')) - 1
+    assert table.amounts('Series B')[table.position('Series B', 3_700_000)] == 3_700_000
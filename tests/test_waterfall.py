@@ -0,0 +1,156 @@
+"""
+Tests for the liquidation preference waterfall
+"""
+import itertools
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.cap_table import CapTable, DATA_PATH
+from utils.waterfall import Waterfall
+
+# Common first; (shares, preference, participation, cap, seniority) per class
+TERM_SHEETS = {
+    'non_participating': dict(
+        classes=['Common', 'A', 'B'],
+        shares=[6e6, 2e6, 2e6],
+        preference=[0.0, 2e6, 6e6],
+        participation=['none', 'none', 'none'],
+        cap=[0.0, 0.0, 0.0],
+        seniority=[0, 1, 2],
+    ),
+    'participating': dict(
+        classes=['Common', 'A', 'B'],
+        shares=[6e6, 2e6, 2e6],
+        preference=[0.0, 2e6, 6e6],
+        participation=['none', 'full', 'none'],
+        cap=[0.0, 0.0, 0.0],
+        seniority=[0, 1, 2],
+    ),
+    'capped': dict(
+        classes=['Common', 'A', 'B', 'C'],
+        shares=[6e6, 2e6, 2e6, 1e6],
+        preference=[0.0, 2e6, 6e6, 3e6],
+        participation=['none', 'capped', 'capped', 'none'],
+        cap=[0.0, 6e6, 9e6, 0.0],
+        seniority=[0, 1, 1, 2],
+    ),
+}
+
+def _distribute(terms, exit_value, converted):
+    """Payouts when the classes in converted give up their preference for common"""
+    shares = np.asarray(terms['shares'])
+    preference = np.asarray(terms['preference'])
+    seniority = np.asarray(terms['seniority'])
+    participation = terms['participation']
+    n = len(shares)
+    payout = np.zeros(n)
+    remaining = exit_value
+
+    holding = [i for i in range(n) if preference[i] > 0 and i not in converted]
+    for rank in sorted({seniority[i] for i in holding}, reverse=True):
+        level = [i for i in holding if seniority[i] == rank]
+        total = preference[level].sum()
+        paid = min(remaining, total)
+        payout[level] += preference[level] * paid / total
+        remaining -= paid
+
+    # The rest goes per share to common, participating and converted classes,
+    # with capped classes topped out at their cap
+    headroom = {}
+    for i in range(n):
+        if i in converted or preference[i] == 0:
+            headroom[i] = np.inf
+        elif participation[i] == 'full':
+            headroom[i] = np.inf
+        elif participation[i] == 'capped':
+            headroom[i] = terms['cap'][i] - preference[i]
+    while headroom:
+        price = remaining / sum(shares[i] for i in headroom)
+        full = [i for i in headroom if shares[i] * price > headroom[i]]
+        if not full:
+            for i in headroom:
+                payout[i] += shares[i] * price
+            break
+        for i in full:
+            payout[i] += headroom[i]
+            remaining -= headroom.pop(i)
+    return payout
+
+def brute_force_payouts(terms, exit_value):
+    """
+    Payouts of every conversion choice no class would change on its own
+
+    Tries every subset of convertible classes and keeps the ones where no
+    class is paid more by flipping its own choice.
+    """
+    convertible = [i for i, kind in enumerate(terms['participation'])
+                   if kind in ('none', 'capped') and terms['preference'][i] > 0]
+    equilibria = []
+    for choice in itertools.product([False, True], repeat=len(convertible)):
+        converted = {i for i, flag in zip(convertible, choice) if flag}
+        payout = _distribute(terms, exit_value, converted)
+        stable = all(
+            _distribute(terms, exit_value, converted ^ {i})[i] <= payout[i] * (1 + 1e-12) + 1e-6
+            for i in convertible
+        )
+        if stable:
+            equilibria.append(payout)
+    return equilibria
+
+def _exit_values(waterfall):
+    """Exit values at, between and well past the waterfall's kinks"""
+    kinks = waterfall.breakpoints
+    between = (kinks[:-1] + kinks[1:]) / 2
+    return np.unique(np.concatenate([[0.0, 1.0], kinks, between, kinks[-1] * np.array([1.5, 4.0, 100.0])]))
+
+@pytest.mark.parametrize('name', TERM_SHEETS)
+def test_payouts_match_brute_force_conversion(name):
+    terms = TERM_SHEETS[name]
+    waterfall = Waterfall(**terms)
+    exit_values = _exit_values(waterfall)
+    payouts = waterfall.payouts(exit_values)
+
+    for k, exit_value in enumerate(exit_values):
+        equilibria = brute_force_payouts(terms, exit_value)
+        assert equilibria, f"no stable conversion at {exit_value}"
+        for expected in equilibria:
+            np.testing.assert_allclose(payouts[:, k], expected, rtol=1e-9, atol=1e-3)
+
+@pytest.mark.parametrize('name', TERM_SHEETS)
+def test_payouts_add_up_to_the_exit_value(name):
+    waterfall = Waterfall(**TERM_SHEETS[name])
+    exit_values = np.linspace(0, 50e6, 501)
+    np.testing.assert_allclose(waterfall.payouts(exit_values).sum(axis=0), exit_values, rtol=1e-12, atol=1e-6)
+
+def test_exit_below_total_preference_pays_by_seniority():
+    # $8M of preferences; B is senior
+    waterfall = Waterfall(**TERM_SHEETS['non_participating'])
+    np.testing.assert_allclose(waterfall.payouts(4e6), [0.0, 0.0, 4e6])
+    np.testing.assert_allclose(waterfall.payouts(7e6), [0.0, 1e6, 6e6])
+
+def test_equal_seniority_shares_pro_rata_to_preference():
+    # C ($3M) is senior; A ($2M) and B ($6M) rank equally below it
+    waterfall = Waterfall(**TERM_SHEETS['capped'])
+    np.testing.assert_allclose(waterfall.payouts(7e6), [0.0, 1e6, 3e6, 3e6])
+
+def test_ipo_valuation_pays_every_round_pro_rata():
+    funding_rounds = pd.read_csv(DATA_PATH / "funding_rounds_overview.csv")
+    cap_table = CapTable.from_funding_rounds(funding_rounds)
+    waterfall = Waterfall.from_funding_rounds(funding_rounds, cap_table)
+    exit_valuation = 240e6
+
+    payouts = waterfall.payouts(exit_valuation)
+    pro_rata = waterfall.shares / waterfall.shares.sum() * exit_valuation
+    np.testing.assert_allclose(payouts, pro_rata, rtol=1e-9)
+
+    # Headline MOICs of the ROI summary
+    summary = pd.read_csv(DATA_PATH / "investor_roi_summary.csv")
+    for round_name, moic in zip(summary['Round'], summary['MOIC']):
+        index = waterfall.class_index(round_name)
+        assert round(payouts[index] / cap_table.amount_raised[index - 1], 2) == moic
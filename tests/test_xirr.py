@@ -0,0 +1,28 @@
+"""
+Tests for the vectorized XIRR solver
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.xirr import xirr_batch, CONVERGED, TOTAL_LOSS, NO_SIGN_CHANGE
+
+def test_single_investment_and_exit():
+    result = xirr_batch([[-100.0, 121.0]], [[0.0, 2.0]])
+    assert result['status'][0] == CONVERGED
+    assert np.isclose(result['irr'][0], 10.0)
+
+def test_nothing_returned_is_a_total_loss():
+    result = xirr_batch([[-100.0, -50.0, 0.0]], [[0.0, 1.0, 2.0]])
+    assert result['status'][0] == TOTAL_LOSS
+    assert result['irr'][0] == -100.0
+
+def test_unbracketed_stream_with_proceeds_is_not_a_total_loss():
+    # Roots at 10% and 20%, but the NPV is negative at both ends of the search range
+    result = xirr_batch([[-100.0, 230.0, -132.0]], [[0.0, 1.0, 2.0]])
+    assert result['status'][0] == NO_SIGN_CHANGE
+    assert np.isnan(result['irr'][0])
+    assert not result['converged'][0]
@@ -0,0 +1,240 @@
+"""
+Per-section rerun timings and the hidden diagnostics panel
+
+Pages call start_page() after st.set_page_config(), wrap each logical section
+in `with section("...")` (or decorate a function with @timed()), and call
+diagnostics_panel() at the end. Nothing is measured unless diagnostics are on
+for the session - via ?diagnostics=1 or DASHBOARD_DIAGNOSTICS=1 - so the
+disabled cost of a section is one attribute lookup.
+
+A widget inside an @st.fragment reruns only that function, on a new script
+thread, so the page's start_page() and diagnostics_panel() do not run.
+Decorating the fragment body with @instrumented_fragment() (under
+@st.fragment) times and profiles those reruns as runs of their own.
+"""
+import contextlib
+import functools
+import json
+import os
+import statistics
+import threading
+import time
+from collections import defaultdict, deque
+from datetime import datetime, timezone
+from pathlib import Path
+
+import streamlit as st
+
+from utils.profiling import start_profile, profile_panel
+
+ENV_VAR = 'DASHBOARD_DIAGNOSTICS'
+QUERY_PARAM = 'diagnostics'
+LOG_PATH = Path(os.environ.get('DASHBOARD_DIAGNOSTICS_LOG',
+                               Path(__file__).parent.parent / "data" / ".cache" / "timings.jsonl"))
+
+# Samples kept per section for the rolling statistics
+WINDOW = 200
+
+_ON = {'1', 'true', 'yes', 'on'}
+
+_run = threading.local()  # Script runs get their own thread
+_samples = defaultdict(lambda: deque(maxlen=WINDOW))
+_lock = threading.Lock()
+_log_lock = threading.Lock()
+_disabled = contextlib.nullcontext()
+
+def diagnostics_requested():
+    """True when the env var or the session's query string turns diagnostics on"""
+    if os.environ.get(ENV_VAR, '').lower() in _ON:
+        return True
+    return st.query_params.get(QUERY_PARAM, '').lower() in _ON
+
+def start_page(page):
+    """
+    Begin timing one run of a page script
+
+    Args:
+        page: Page name recorded with every section
+
+    Returns:
+        Whether diagnostics are on for this run
+    """
+    _run.enabled = diagnostics_requested()
+    _run.page = page
+    _run.records = []
+    return _run.enabled
+
+def _record(name, elapsed):
+    with _lock:
+        _samples[name].append(elapsed)
+    _run.records.append((name, elapsed))
+
+@contextlib.contextmanager
+def _timed_section(name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _record(name, time.perf_counter() - start)
+
+def section(name):
+    """Context manager timing a block as section name (a no-op when disabled)"""
+    if not getattr(_run, 'enabled', False):
+        return _disabled
+    return _timed_section(name)
+
+def timed(name=None):
+    """Decorator timing every call as section name (default: the function name)"""
+    def decorate(func):
+        label = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not getattr(_run, 'enabled', False):
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _record(label, time.perf_counter() - start)
+
+        return wrapper
+    return decorate
+
+def section_stats():
+    """Rolling statistics per section over its last WINDOW samples, in ms"""
+    with _lock:
+        samples = {name: sorted(values) for name, values in _samples.items()}
+    return {
+        name: {
+            'count': len(values),
+            'mean_ms': statistics.fmean(values) * 1000,
+            'p50_ms': values[len(values) // 2] * 1000,
+            'p95_ms': values[min(len(values) - 1, int(0.95 * len(values)))] * 1000,
+            'max_ms': values[-1] * 1000,
+        }
+        for name, values in samples.items()
+    }
+
+def reset_stats():
+    with _lock:
+        _samples.clear()
+
+def _write_log(page, records):
+    """Append this run's sections to LOG_PATH, one JSON object per line"""
+    timestamp = datetime.now(timezone.utc).isoformat(timespec='milliseconds')
+    lines = "".join(
+        json.dumps({'ts': timestamp, 'page': page, 'section': name, 'ms': round(elapsed * 1000, 3)}) + "\n"
+        for name, elapsed in records
+    )
+    try:
+        LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with _log_lock, open(LOG_PATH, 'a', encoding='utf-8') as log:
+            log.write(lines)
+    except OSError:
+        pass  # Read-only deployments still get the panel
+
+def diagnostics_panel(location=None):
+    """
+    Log this run's sections and show them, with rolling stats, in the sidebar
+
+    Args:
+        location: Where to draw the panel instead of the sidebar (e.g. st
+            inside a fragment, which cannot write to the sidebar)
+    """
+    if not getattr(_run, 'enabled', False):
+        return
+    records = _run.records
+    _write_log(_run.page, records)
+
+    location = st.sidebar if location is None else location
+    with location.expander("⏱️ Diagnostics", expanded=True):
+        total = sum(elapsed for name, elapsed in records)
+        st.caption(f"{_run.page}: {len(records)} sections, {total * 1000:.1f} ms timed this run")
+        st.dataframe(
+            {'Section': [name for name, _ in records],
+             'ms': [round(elapsed * 1000, 2) for _, elapsed in records]},
+            hide_index=True, use_container_width=True
+        )
+        st.caption(f"Rolling statistics (last {WINDOW} runs per section, all sessions)")
+        stats = section_stats()
+        st.dataframe(
+            {'Section': list(stats), **{
+                column: [round(row[column], 2) for row in stats.values()]
+                for column in ('count', 'mean_ms', 'p50_ms', 'p95_ms', 'max_ms')
+            }},
+            hide_index=True, use_container_width=True
+        )
+        st.caption("Caches (this process; the result cache counts all processes)")
+        st.dataframe(cache_stats(), hide_index=True, use_container_width=True)
+        st.caption(f"Logged to {LOG_PATH}")
+
+def _fragment_rerun():
+    """True when this script run reruns fragments rather than the whole page"""
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx()
+    return ctx is not None and bool(ctx.fragment_ids_this_run)
+
+def instrumented_fragment(page, state=None):
+    """
+    Decorator timing and profiling the reruns of a fragment
+
+    On a full page run the function is called as is, inside the page's own
+    run. When a widget reruns the fragment alone, the call is a run of its
+    own, recorded as "<page>: <function name>": timing and profiling start
+    before the body, and the profile and diagnostics panels are drawn at the
+    end of the fragment. A fragment called from another fragment's rerun is
+    part of that run.
+
+    Args:
+        page: Page name, as passed to start_page()
+        state: Dict of widget values passed to profile_panel(); fragments
+            may update it as they run
+
+    Usage:
+        @st.fragment
+        @instrumented_fragment("Investment Scenarios", profile_state)
+        def returns_section(...):
+    """
+    def decorate(func):
+        label = f"{page}: {func.__name__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if getattr(_run, 'in_fragment', False) or not _fragment_rerun():
+                return func(*args, **kwargs)
+
+            start_page(label)
+            start_profile(label)
+            _run.in_fragment = True
+            try:
+                result = func(*args, **kwargs)
+            finally:
+                _run.in_fragment = False
+            profile_panel(state, location=st)
+            diagnostics_panel(location=st)
+            return result
+
+        return wrapper
+    return decorate
+
+def cache_stats():
+    """One row of hit/size statistics per project cache"""
+    from utils.figure_cache import FIGURE_CACHE
+    from utils.memory_cache import MEMORY_CACHE
+    from utils.result_cache import RESULT_CACHE
+
+    rows = []
+    for name, cache in (('memory', MEMORY_CACHE), ('disk results', RESULT_CACHE), ('figures', FIGURE_CACHE)):
+        stats = cache.stats()
+        rows.append({
+            'Cache': name,
+            'hit %': round(stats['hit_rate'] * 100, 1),
+            'hits': stats['hits'],
+            'evictions': stats['evictions'],
+            'entries': stats['entries'],
+            'MiB': round(stats['bytes'] / 2**20, 2),
+            'saved s': round(stats.get('time_saved_s', 0.0), 2)
+        })
+    return rows
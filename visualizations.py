@@ -1,11 +1,12 @@
 """
 Plotly visualization functions for the investor dashboard
+
+Plotly is imported inside the builders, so importing this module for its
+helpers does not load the charting stack.
 """
-import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
-import pandas as pd
+from utils.figure_cache import memoize_figure
 
+@memoize_figure
 def create_roi_comparison_chart(roi_data):
     """
     Create bar chart comparing MOIC across funding rounds
@@ -16,6 +17,8 @@ def create_roi_comparison_chart(roi_data):
     Returns:
         Plotly figure
     """
+    import plotly.graph_objects as go
+
     colors = ['#0066CC', '#0052A3', '#003D7A', '#002952']
 
     fig = go.Figure()
@@ -45,6 +48,7 @@ def create_roi_comparison_chart(roi_data):
 
     return fig
 
+@memoize_figure
 def create_valuation_revenue_chart(financials_df):
     """
     Create dual-axis chart with valuation and revenue
@@ -55,6 +59,9 @@ def create_valuation_revenue_chart(financials_df):
     Returns:
         Plotly figure
     """
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
     fig = make_subplots(specs=[[{"secondary_y": True}]])
 
     # Split into historical and projected
@@ -140,6 +147,7 @@ def create_valuation_revenue_chart(financials_df):
 
     return fig
 
+@memoize_figure
 def create_ownership_chart(ownership_df):
     """
     Create stacked bar chart showing ownership evolution
@@ -150,6 +158,8 @@ def create_ownership_chart(ownership_df):
     Returns:
         Plotly figure
     """
+    import plotly.graph_objects as go
+
     fig = go.Figure()
 
     stakeholders = ['Founders', 'Seed_Investors', 'Series_A_Investors', 
@@ -210,6 +220,8 @@ def create_metric_card_figure(value, label, delta=None, prefix="", suffix=""):
     Returns:
         Plotly figure
     """
+    import plotly.graph_objects as go
+
     fig = go.Figure()
 
     display_text = f"{prefix}{value:,.2f}{suffix}"
@@ -256,6 +268,7 @@ def create_metric_card_figure(value, label, delta=None, prefix="", suffix=""):
 
     return fig
 
+@memoize_figure
 def create_irr_comparison_chart(roi_data):
     """
     Create chart comparing IRR across rounds
@@ -266,6 +279,8 @@ def create_irr_comparison_chart(roi_data):
     Returns:
         Plotly figure
     """
+    import plotly.graph_objects as go
+
     colors = ['#0066CC', '#0052A3', '#003D7A', '#002952']
 
     fig = go.Figure()
@@ -294,3 +309,447 @@ def create_irr_comparison_chart(roi_data):
     )
 
     return fig
+
+def create_moic_distribution_chart(simulation, bins_per_bar=40):
+    """
+    Create histogram of simulated MOIC outcomes
+
+    Args:
+        simulation: Result dictionary from simulate_exit_returns
+        bins_per_bar: Number of fine histogram bins merged into each bar
+
+    Returns:
+        Plotly figure
+    """
+    import plotly.graph_objects as go
+
+    edges = simulation['moic_bin_edges'][1:]
+    counts = simulation['moic_counts'][1:]
+
+    # Merge the fine log-spaced bins into displayable bars
+    n_bars = len(counts) // bins_per_bar
+    bar_counts = counts[:n_bars * bins_per_bar].reshape(n_bars, bins_per_bar).sum(axis=1)
+    bar_edges = edges[::bins_per_bar][:n_bars + 1]
+    bar_centers = (bar_edges[:-1] * bar_edges[1:]) ** 0.5
+    share = bar_counts / max(simulation['n_paths'], 1) * 100
+
+    visible = share > 0
+    colors = ['#CC0066' if x < 1 else '#0066CC' for x in bar_centers[visible]]
+
+    fig = go.Figure()
+
+    fig.add_trace(go.Bar(
+        x=bar_centers[visible],
+        y=share[visible],
+        width=(bar_edges[1:] - bar_edges[:-1])[visible],
+        marker_color=colors,
+        name='Share of Paths'
+    ))
+
+    fig.add_vline(x=1.0, line_dash="dot", line_color="#CC0066",
+                  annotation_text="Break-even (1x)",
+                  annotation_position="top left")
+    fig.add_vline(x=simulation['benchmark_moic'], line_dash="dash", line_color="gray",
+                  annotation_text=f"VC Benchmark ({simulation['benchmark_moic']:g}x)",
+                  annotation_position="top right")
+
+    fig.update_layout(
+        title=f"Distribution of Simulated MOIC ({simulation['n_paths']:,} paths)",
+        xaxis_title="Multiple on Invested Capital (MOIC, log scale)",
+        yaxis_title="Share of Paths (%)",
+        xaxis_type="log",
+        height=400,
+        showlegend=False,
+        bargap=0
+    )
+
+    return fig
+
+def create_sensitivity_heatmap(surface, metric='moic', style='heatmap'):
+    """
+    Create heatmap or contour plot of a returns sensitivity surface
+
+    Args:
+        surface: Result dictionary from calculate_sensitivity_surface
+        metric: 'moic' or 'irr'
+        style: 'heatmap' or 'contour'
+
+    Returns:
+        Plotly figure
+    """
+    import plotly.graph_objects as go
+
+    if metric == 'moic':
+        z = surface['moic']
+        colorbar_title = "MOIC"
+        hover_value = "%{z:.2f}x"
+    else:
+        z = surface['irr']
+        colorbar_title = "IRR (%)"
+        hover_value = "%{z:.1f}%"
+
+    trace_type = go.Contour if style == 'contour' else go.Heatmap
+    extra = dict(contours=dict(showlabels=True)) if style == 'contour' else {}
+
+    fig = go.Figure(trace_type(
+        x=surface['exit_years'],
+        y=surface['exit_valuations'] / 1_000_000,
+        z=z,
+        colorscale='Blues',
+        colorbar=dict(title=colorbar_title),
+        hovertemplate="Exit Year: %{x}<br>Exit Valuation: $%{y:.0f}M<br>" + colorbar_title + ": " + hover_value + "<extra></extra>",
+        **extra
+    ))
+
+    fig.update_layout(
+        title=f"{colorbar_title} by Exit Valuation and Exit Year",
+        xaxis_title="Exit Year",
+        yaxis_title="Exit Valuation ($M CAD)",
+        xaxis=dict(dtick=1),
+        height=500
+    )
+
+    return fig
+
+@memoize_figure
+def create_check_size_chart(amounts, curves, selected_amount):
+    """
+    Create line chart of net return against investment amount
+
+    Args:
+        amounts: Array of investment amounts (the x axis)
+        curves: Dictionary of exit scenario name to net return at each amount
+        selected_amount: Amount to mark on the chart
+
+    Returns:
+        Plotly figure
+    """
+    import plotly.graph_objects as go
+
+    colors = ['#0066CC', '#CC0066', '#00CC66']
+
+    fig = go.Figure()
+
+    for (scenario, returns), color in zip(curves.items(), colors):
+        fig.add_trace(go.Scatter(
+            x=amounts,
+            y=returns,
+            mode='lines',
+            name=scenario,
+            line=dict(color=color, width=3),
+            hovertemplate="Investment: $%{x:,.0f}<br>Net Return: $%{y:,.0f}<extra>" + scenario + "</extra>"
+        ))
+
+    fig.add_vline(x=selected_amount, line_dash="dash", line_color="gray",
+                  annotation_text="Your Investment",
+                  annotation_position="top left")
+
+    fig.update_layout(
+        title="Net Return by Investment Amount",
+        xaxis_title="Investment Amount ($)",
+        yaxis_title="Net Return at Exit ($)",
+        height=400,
+        hovermode='x unified',
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+    )
+
+    return fig
+
+@memoize_figure
+def create_projection_fan_chart(years, bands, selected, title, yaxis_title,
+                                selected_name="Selected Assumptions", history=None):
+    """
+    Create fan chart of a projected metric across a batch of scenarios
+
+    Args:
+        years: Projected years (the x axis)
+        bands: Dictionary of percentile to per-year values, e.g. {10: ..., 50: ..., 90: ...}
+        selected: Per-year values of the selected assumption set
+        title: Chart title
+        yaxis_title: Y axis title
+        selected_name: Legend name of the selected line
+        history: Optional (years, values) of actuals drawn before the projection
+
+    Returns:
+        Plotly figure
+    """
+    import plotly.graph_objects as go
+
+    percentiles = sorted(bands)
+    fig = go.Figure()
+
+    # Shade nested bands from the outside in, e.g. P10-P90 then P25-P75
+    for low, high, opacity in zip(percentiles, reversed(percentiles), (0.15, 0.3)):
+        if low >= high:
+            break
+        fig.add_trace(go.Scatter(
+            x=list(years) + list(years)[::-1],
+            y=list(bands[high]) + list(bands[low])[::-1],
+            fill='toself',
+            fillcolor=f'rgba(0, 102, 204, {opacity})',
+            line=dict(width=0),
+            hoverinfo='skip',
+            name=f"P{low}–P{high}"
+        ))
+
+    median = percentiles[len(percentiles) // 2]
+    fig.add_trace(go.Scatter(
+        x=years,
+        y=bands[median],
+        name=f"P{median}",
+        line=dict(color='#0066CC', width=2, dash='dot'),
+        mode='lines'
+    ))
+
+    fig.add_trace(go.Scatter(
+        x=years,
+        y=selected,
+        name=selected_name,
+        line=dict(color='#CC0066', width=3),
+        mode='lines+markers'
+    ))
+
+    if history is not None:
+        fig.add_trace(go.Scatter(
+            x=history[0],
+            y=history[1],
+            name="Historical",
+            line=dict(color='#333333', width=3),
+            mode='lines+markers'
+        ))
+
+    fig.update_layout(
+        title=title,
+        xaxis_title="Year",
+        yaxis_title=yaxis_title,
+        xaxis=dict(dtick=1),
+        height=400,
+        hovermode='x unified',
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+    )
+
+    return fig
+
+@memoize_figure
+def create_exit_year_chart(exit_years, moic, irr, best_irr_year, best_moic_year, title):
+    """
+    Create dual-axis chart of returns against the year a stake is sold
+
+    Args:
+        exit_years: Candidate exit years (the x axis)
+        moic: MOIC for each exit year (NaN where the exit is not after entry)
+        irr: IRR % for each exit year
+        best_irr_year: Exit year with the highest IRR
+        best_moic_year: Exit year with the highest MOIC
+        title: Chart title
+
+    Returns:
+        Plotly figure
+    """
+    import numpy as np
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
+    valid = ~np.isnan(moic)
+    years = np.asarray(exit_years)[valid]
+
+    fig = make_subplots(specs=[[{"secondary_y": True}]])
+
+    fig.add_trace(
+        go.Bar(
+            x=years,
+            y=np.asarray(moic)[valid],
+            name="MOIC",
+            marker_color=['#0066CC' if year == best_moic_year else '#99CCFF' for year in years],
+            text=[f"{value:.2f}x" for value in np.asarray(moic)[valid]],
+            textposition='outside'
+        ),
+        secondary_y=False
+    )
+
+    fig.add_trace(
+        go.Scatter(
+            x=years,
+            y=np.asarray(irr)[valid],
+            name="IRR",
+            line=dict(color='#CC0066', width=3),
+            mode='lines+markers'
+        ),
+        secondary_y=True
+    )
+
+    fig.add_vline(x=best_irr_year, line_dash="dash", line_color="#CC0066",
+                  annotation_text=f"Best IRR ({best_irr_year:.0f})",
+                  annotation_position="top left")
+    if best_moic_year != best_irr_year:
+        fig.add_vline(x=best_moic_year, line_dash="dash", line_color="#0066CC",
+                      annotation_text=f"Best MOIC ({best_moic_year:.0f})",
+                      annotation_position="top right")
+
+    fig.update_xaxes(title_text="Exit Year", dtick=1)
+    fig.update_yaxes(title_text="Multiple on Invested Capital (MOIC)", secondary_y=False)
+    fig.update_yaxes(title_text="IRR (%)", secondary_y=True)
+
+    fig.update_layout(
+        title=title,
+        height=450,
+        hovermode='x unified',
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+    )
+
+    return fig
+
+@memoize_figure
+def create_waterfall_chart(exit_values, payouts, classes, highlight, markers):
+    """
+    Create line chart of each share class's proceeds against the exit value
+
+    Args:
+        exit_values: Exit values in $ (the x axis)
+        payouts: Array of shape (len(classes), len(exit_values)) with proceeds in $
+        classes: Share class names
+        highlight: Class drawn in bold
+        markers: Dictionary of label to exit value drawn as vertical lines
+
+    Returns:
+        Plotly figure
+    """
+    import plotly.graph_objects as go
+
+    colors = ['#666666', '#00CC66', '#0099CC', '#0066CC', '#CC0066', '#FF9900']
+
+    fig = go.Figure()
+
+    for i, name in enumerate(classes):
+        label = name.replace('_', ' ')
+        fig.add_trace(go.Scatter(
+            x=exit_values / 1_000_000,
+            y=payouts[i] / 1_000_000,
+            name=label,
+            line=dict(color=colors[i % len(colors)], width=4 if label == highlight else 2),
+            mode='lines',
+            hovertemplate="%{y:$,.1f}M<extra>" + label + "</extra>"
+        ))
+
+    for label, value in markers.items():
+        fig.add_vline(x=value / 1_000_000, line_dash="dot", line_color="gray",
+                      annotation_text=label, annotation_position="top left")
+
+    fig.update_layout(
+        title="Proceeds by Share Class",
+        xaxis_title="Exit Value ($M)",
+        yaxis_title="Proceeds ($M)",
+        height=450,
+        hovermode='x unified',
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+    )
+
+    return fig
+
+@memoize_figure
+def create_follow_on_chart(deployed, irr, moic, labels, best):
+    """
+    Create scatter chart of follow-on strategies by capital deployed and XIRR
+
+    Args:
+        deployed: Total capital deployed by each strategy
+        irr: XIRR % of each strategy
+        moic: MOIC of each strategy (marker color)
+        labels: Description of each strategy, shown on hover
+        best: Index of the strategy to highlight
+
+    Returns:
+        Plotly figure
+    """
+    import plotly.graph_objects as go
+
+    fig = go.Figure()
+
+    fig.add_trace(go.Scatter(
+        x=deployed / 1_000_000,
+        y=irr,
+        mode='markers',
+        name="Strategies",
+        text=labels,
+        marker=dict(size=11, color=moic, colorscale='Blues', showscale=True,
+                    colorbar=dict(title="MOIC"), line=dict(width=1, color='#003D7A')),
+        hovertemplate="%{text}<br>Deployed: $%{x:.2f}M<br>XIRR: %{y:.1f}%<extra></extra>"
+    ))
+
+    fig.add_trace(go.Scatter(
+        x=[deployed[best] / 1_000_000],
+        y=[irr[best]],
+        mode='markers',
+        name="Best XIRR",
+        text=[labels[best]],
+        marker=dict(size=22, symbol='star', color='#CC0066'),
+        hovertemplate="Best: %{text}<br>Deployed: $%{x:.2f}M<br>XIRR: %{y:.1f}%<extra></extra>"
+    ))
+
+    fig.update_layout(
+        title="Follow-On Strategies: Capital Deployed vs XIRR",
+        xaxis_title="Capital Deployed ($M)",
+        yaxis_title="XIRR (%)",
+        height=450,
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+    )
+
+    return fig
+
+@memoize_figure
+def create_reserve_heatmap(amounts, surface, best, rounds, metric='moic', max_points=201):
+    """
+    Create heatmap of an expected return over a two-round allocation grid
+
+    Args:
+        amounts: Grid of check sizes shared by both rounds
+        surface: Expected MOIC or IRR, shape (len(amounts), len(amounts)); NaN where infeasible
+        best: Grid index (first round, second round) of the best allocation
+        rounds: Names of the two rounds, in surface axis order
+        metric: 'moic' or 'irr'
+        max_points: Largest number of grid points drawn per axis
+
+    Returns:
+        Plotly figure
+    """
+    import plotly.graph_objects as go
+
+    if metric == 'moic':
+        colorbar_title = "Expected MOIC"
+        hover_value = "%{z:.2f}x"
+    else:
+        colorbar_title = "Expected IRR (%)"
+        hover_value = "%{z:.1f}%"
+
+    # A fine grid is thinned for drawing; the marker shows the exact optimum
+    stride = -(-len(amounts) // max_points)
+    shown = amounts[::stride] / 1_000_000
+
+    fig = go.Figure(go.Heatmap(
+        x=shown,
+        y=shown,
+        z=surface[::stride, ::stride],
+        colorscale='Blues',
+        colorbar=dict(title=colorbar_title),
+        hovertemplate=f"{rounds[0]}: $%{{y:.2f}}M<br>{rounds[1]}: $%{{x:.2f}}M<br>"
+                      + colorbar_title + ": " + hover_value + "<extra></extra>"
+    ))
+
+    fig.add_trace(go.Scatter(
+        x=[amounts[best[1]] / 1_000_000],
+        y=[amounts[best[0]] / 1_000_000],
+        mode='markers',
+        name="Best Allocation",
+        marker=dict(size=18, symbol='star', color='#CC0066'),
+        hovertemplate=f"Best: {rounds[0]} $%{{y:.2f}}M, {rounds[1]} $%{{x:.2f}}M<extra></extra>"
+    ))
+
+    fig.update_layout(
+        title=f"{colorbar_title} by Allocation",
+        xaxis_title=f"{rounds[1]} Check ($M CAD)",
+        yaxis_title=f"{rounds[0]} Check ($M CAD)",
+        height=500,
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+    )
+
+    return fig
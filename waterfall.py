@@ -0,0 +1,182 @@
+"""
+Liquidation preference waterfall over share classes
+
+Each funding round is a share class with a liquidation preference (a
+multiple of the amount raised), a participation right and a seniority.
+Exit proceeds first pay preferences from the most senior class down (classes
+of equal seniority share pro rata to their preferences), and the rest is
+split per share between common stock, participating preferred and preferred
+that is better off converting to common.
+
+Every class's payout is a piecewise-linear function of the exit value, so
+the kinks are found once when the waterfall is built and any number of exit
+values are then priced with one search and one interpolation.
+"""
+import numpy as np
+
+PARTICIPATION = ('none', 'full', 'capped')
+
+class Waterfall:
+    """
+    Payouts of every share class as a function of the exit value
+
+    Participation:
+        'none'    1x-style preference, converts to common when that pays more
+        'full'    preference plus a per-share part of the remainder
+        'capped'  as 'full' until the total reaches the cap, then converts
+                  to common once that pays more than the cap
+
+    Below the total preference the common price per share is zero. Above it,
+    every class's payout is a function of that price p:
+
+        common     N*p
+        none       max(L, N*p)
+        full       L + N*p
+        capped     max(min(L + N*p, C), N*p)
+
+    and the exit value is their sum, so the kinks sit at the prices where
+    a class converts (L/N), reaches its cap ((C - L)/N) or converts past the
+    cap (C/N).
+    """
+
+    def __init__(self, classes, shares, preference, participation, cap, seniority):
+        """
+        Args:
+            classes: Share class names
+            shares: As-converted shares of each class
+            preference: Liquidation preference of each class, in $ (0 for common)
+            participation: One of PARTICIPATION per class
+            cap: Total payout cap of each 'capped' class, in $ (ignored otherwise)
+            seniority: Rank of each class; higher ranks are paid first
+        """
+        unknown = set(participation) - set(PARTICIPATION)
+        if unknown:
+            raise ValueError(f"Unknown participation: {sorted(unknown)} (expected one of {PARTICIPATION})")
+
+        self.classes = list(classes)
+        self.shares = np.asarray(shares, dtype=float)
+        self.preference = np.asarray(preference, dtype=float)
+        self.participation = np.asarray(participation)
+        self.cap = np.where(self.participation == 'capped', np.asarray(cap, dtype=float), np.inf)
+        self.seniority = np.asarray(seniority)
+        self._index = {name: i for i, name in enumerate(self.classes)}
+
+        self.breakpoints, self._values = self._kinks()
+        self._slopes = np.empty_like(self._values)
+        self._slopes[:, :-1] = np.diff(self._values, axis=1) / np.diff(self.breakpoints)
+        # Past the last kink every class is paid per share (full participation keeps its preference)
+        self._slopes[:, -1] = self.shares / self.shares.sum()
+
+    @classmethod
+    def from_funding_rounds(cls, funding_rounds, cap_table, common='Founders'):
+        """
+        Build the waterfall of a cap table with terms from the funding rounds data
+
+        Args:
+            funding_rounds: DataFrame as in funding_rounds_overview.csv, with the
+                term columns 'Liquidation_Preference' (multiple of the amount
+                raised, 0 for common), 'Participation', 'Participation_Cap'
+                (multiple of the amount raised) and 'Seniority'
+            cap_table: CapTable the rounds' shares are taken from
+            common: Name of the founders' common class
+
+        Returns:
+            Waterfall with the common class first, then every round in cap table order
+        """
+        terms = funding_rounds.set_index('Round').loc[cap_table.round_names]
+        raised = cap_table.amount_raised
+        return cls(
+            classes=[common] + cap_table.round_names,
+            shares=np.concatenate([[cap_table.founder_shares], cap_table.shares_issued]),
+            preference=np.concatenate([[0.0], terms['Liquidation_Preference'].to_numpy(dtype=float) * raised]),
+            participation=['none'] + terms['Participation'].tolist(),
+            cap=np.concatenate([[np.inf], terms['Participation_Cap'].to_numpy(dtype=float) * raised]),
+            seniority=np.concatenate([[0], terms['Seniority'].to_numpy()])
+        )
+
+    def class_index(self, name):
+        """Position of a share class ('Series B' and 'Series_B' name the same class)"""
+        return self._index[name.replace(' ', '_')]
+
+    def _payouts_at_price(self, price):
+        """Payout of every class (rows) once preferences are paid, at common prices (columns)"""
+        n, pref, cap = self.shares[:, None], self.preference[:, None], self.cap[:, None]
+        as_converted = n * price
+        participating = np.minimum(pref + as_converted, cap)
+        return np.where(self.participation[:, None] == 'none',
+                        np.maximum(pref, as_converted),
+                        np.maximum(participating, as_converted))
+
+    def _kinks(self):
+        """Exit values where any payout changes slope, and every class's payout there"""
+        # Preference stack: most senior first, equal ranks pro rata to their preferences
+        stacked = [np.zeros(len(self.classes))]
+        for rank in np.unique(self.seniority[self.preference > 0])[::-1]:
+            level = (self.seniority == rank) & (self.preference > 0)
+            stacked.append(stacked[-1] + np.where(level, self.preference, 0.0))
+        preference_points = np.stack(stacked, axis=1)
+
+        # Past the stack: prices where a class converts or reaches its cap
+        n = self.shares
+        thresholds = np.concatenate([
+            np.where(self.participation == 'none', self.preference / n, 0.0),
+            np.where(self.participation == 'capped', (self.cap - self.preference) / n, 0.0),
+            np.where(self.participation == 'capped', self.cap / n, 0.0)
+        ])
+        prices = np.unique(thresholds[np.isfinite(thresholds) & (thresholds > 0)])
+        price_points = self._payouts_at_price(prices)
+
+        values = np.concatenate([preference_points, price_points], axis=1)
+        breakpoints = values.sum(axis=0)
+        return breakpoints, values
+
+    def payouts(self, exit_values):
+        """
+        Proceeds of every share class at each exit value
+
+        Args:
+            exit_values: Array of exit values (any shape)
+
+        Returns:
+            Array of shape (n_classes,) + exit_values.shape
+        """
+        exit_values = np.maximum(np.asarray(exit_values, dtype=float), 0.0)
+        segment = np.clip(np.searchsorted(self.breakpoints, exit_values, side='right') - 1,
+                          0, len(self.breakpoints) - 1)
+        offset = exit_values - self.breakpoints[segment]
+        return self._values[:, segment] + self._slopes[:, segment] * offset
+
+    def proceeds_share(self, exit_values):
+        """Fraction of the exit proceeds paid to every class at each exit value"""
+        exit_values = np.asarray(exit_values, dtype=float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(exit_values > 0, self.payouts(exit_values) / exit_values,
+                            (self.shares / self.shares.sum()).reshape((-1,) + (1,) * exit_values.ndim))
+
+    def payout_factor(self, name, entry_stake, exit_values):
+        """
+        Proceeds share of a class at each exit value relative to its stake at entry
+
+        The waterfall's counterpart of a dilution factor: a check that bought
+        ownership o of the company in this class is paid o * payout_factor of
+        the exit value.
+
+        Args:
+            name: Share class (round) name
+            entry_stake: Fraction of the company the class owned when it was issued
+            exit_values: Array of exit values (any shape)
+
+        Returns:
+            Array of exit_values' shape
+        """
+        return self.proceeds_share(exit_values)[self.class_index(name)] / entry_stake
+
+    def breakpoint_table(self):
+        """
+        Kinks of the waterfall
+
+        Returns:
+            Dictionary with 'exit_value' (n_breakpoints,) and 'payouts'
+            (n_classes, n_breakpoints)
+        """
+        return {'exit_value': self.breakpoints.copy(), 'payouts': self._values.copy()}
@@ -0,0 +1,180 @@
+"""
+Vectorized XIRR solver for dated, multi-cash-flow investor positions
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+# Per-position solver status codes
+CONVERGED = 0
+TOTAL_LOSS = 1
+NO_SIGN_CHANGE = 2
+MAX_ITERATIONS = 3
+
+STATUS_LABELS = {
+    CONVERGED: 'converged',
+    TOTAL_LOSS: 'total loss',
+    NO_SIGN_CHANGE: 'no solution',
+    MAX_ITERATIONS: 'not converged',
+}
+
+# Search range for the rate, as log(1 + rate): just above -100% to +10,000% a year
+_LOG_RATE_MIN = np.log(1e-12)
+_LOG_RATE_MAX = np.log(101.0)
+
+DAYS_PER_YEAR = 365.0
+
+def quarter_midpoint(label):
+    """
+    Convert a funding round date label to a timestamp
+
+    Args:
+        label: Label such as 'Q2 2026 (Planned)'
+
+    Returns:
+        pandas Timestamp at the middle of the quarter
+    """
+    match = re.search(r'Q([1-4])\s*(\d{4})', label)
+    if match is None:
+        raise ValueError(f"Unrecognized quarter label: {label!r}")
+    quarter, year = int(match.group(1)), int(match.group(2))
+    return pd.Timestamp(year=year, month=3 * quarter - 1, day=15)
+
+def pad_cash_flows(positions):
+    """
+    Stack ragged per-position cash flows into padded 2-D arrays
+
+    Args:
+        positions: Sequence of positions, each a sequence of (date, amount) pairs
+
+    Returns:
+        Tuple of (amounts, dates) arrays of shape (n_positions, max_flows); padding
+        has zero amount and repeats the position's first date
+    """
+    n_flows = max((len(flows) for flows in positions), default=0)
+    amounts = np.zeros((len(positions), n_flows))
+    dates = np.empty((len(positions), n_flows), dtype='datetime64[D]')
+
+    for i, flows in enumerate(positions):
+        flow_dates = np.array([np.datetime64(pd.Timestamp(d), 'D') for d, _ in flows], dtype='datetime64[D]')
+        amounts[i, :len(flows)] = [amount for _, amount in flows]
+        dates[i, :len(flows)] = flow_dates
+        dates[i, len(flows):] = flow_dates[0] if len(flows) else np.datetime64(0, 'D')
+
+    return amounts, dates
+
+def _year_offsets(dates):
+    """Years elapsed since each position's first cash flow"""
+    dates = np.asarray(dates)
+    if np.issubdtype(dates.dtype, np.datetime64):
+        days = dates.astype('datetime64[D]').astype(np.int64).astype(float)
+        return (days - days.min(axis=1, keepdims=True)) / DAYS_PER_YEAR
+    years = dates.astype(float)
+    return years - years.min(axis=1, keepdims=True)
+
+def xirr_batch(amounts, dates, tol=1e-10, max_iter=100):
+    """
+    Solve the annualized IRR of many dated cash-flow streams at once
+
+    Each position's rate satisfies sum(amount / (1 + rate) ** years) = 0, with
+    years measured from its first cash flow on an actual/365 basis. The root is
+    found with Newton steps in log(1 + rate), guarded by a per-position bracket
+    that falls back to bisection whenever a Newton step leaves it.
+
+    Args:
+        amounts: Array (n_positions, n_flows); negative for capital invested,
+            positive for proceeds (zero for padding)
+        dates: Array of the same shape with datetime64 dates or fractional years
+        tol: Convergence tolerance on log(1 + rate)
+        max_iter: Maximum number of solver iterations
+
+    Returns:
+        Dictionary with 'irr' (annualized %, NaN when unsolved), 'status'
+        (see STATUS_LABELS), 'converged' and 'iterations' arrays
+    """
+    amounts = np.atleast_2d(np.asarray(amounts, dtype=float))
+    years = _year_offsets(np.atleast_2d(dates))
+    n_positions = amounts.shape[0]
+
+    # Weight each flow by exp(x * (t_max - t)) instead of exp(-x * t); same roots, no overflow
+    horizon = years.max(axis=1, keepdims=True) - years
+
+    def npv(x, rows=slice(None)):
+        weights = np.exp(x[:, None] * horizon[rows])
+        flows = amounts[rows] * weights
+        return flows.sum(axis=1), (flows * horizon[rows]).sum(axis=1)
+
+    invested = -np.where(amounts < 0, amounts, 0).sum(axis=1)
+    returned = np.where(amounts > 0, amounts, 0).sum(axis=1)
+
+    lo = np.full(n_positions, _LOG_RATE_MIN)
+    hi = np.full(n_positions, _LOG_RATE_MAX)
+    f_lo, _ = npv(lo)
+    f_hi, _ = npv(hi)
+
+    # Without a sign change over the search range there is no bracketed root;
+    # only a position that returns nothing at all is a total loss
+    status = np.full(n_positions, MAX_ITERATIONS)
+    status[np.sign(f_lo) == np.sign(f_hi)] = NO_SIGN_CHANGE
+    status[(invested > 0) & (returned == 0)] = TOTAL_LOSS
+    active = status == MAX_ITERATIONS
+
+    # Start from the simple-multiple rate over the cash-weighted holding period
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t_in = -(np.where(amounts < 0, amounts, 0) * years).sum(axis=1) / invested
+        t_out = (np.where(amounts > 0, amounts, 0) * years).sum(axis=1) / returned
+        x = np.log(returned / invested) / np.abs(t_out - t_in)
+    x = np.where(np.isfinite(x) & (x > lo) & (x < hi), x, (lo + hi) / 2)
+
+    iterations = np.zeros(n_positions, dtype=int)
+    for _ in range(max_iter):
+        if not active.any():
+            break
+
+        idx = np.flatnonzero(active)
+        f, df = npv(x[idx], idx)
+        iterations[idx] += 1
+
+        # Keep the root bracketed: replace whichever end shares the sign of f
+        same_as_lo = np.sign(f) == np.sign(f_lo[idx])
+        lo[idx] = np.where(same_as_lo, x[idx], lo[idx])
+        f_lo[idx] = np.where(same_as_lo, f, f_lo[idx])
+        hi[idx] = np.where(same_as_lo, hi[idx], x[idx])
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            newton = x[idx] - f / df
+        inside = np.isfinite(newton) & (newton >= lo[idx]) & (newton <= hi[idx])
+        x_new = np.where(inside, newton, (lo[idx] + hi[idx]) / 2)
+        x_new = np.where(f == 0, x[idx], x_new)
+
+        done = (np.abs(x_new - x[idx]) < tol) | (f == 0) | (hi[idx] - lo[idx] < tol)
+        x[idx] = x_new
+        status[idx[done]] = CONVERGED
+        active[idx[done]] = False
+
+    irr = np.full(n_positions, np.nan)
+    solved = status == CONVERGED
+    irr[solved] = np.expm1(x[solved]) * 100
+    irr[status == TOTAL_LOSS] = -100.0
+
+    return {
+        'irr': irr,
+        'status': status,
+        'converged': (status == CONVERGED) | (status == TOTAL_LOSS),
+        'iterations': iterations
+    }
+
+def xirr(cash_flows, tol=1e-10, max_iter=100):
+    """
+    Annualized IRR (%) of a single position
+
+    Args:
+        cash_flows: Sequence of (date, amount) pairs; negative amounts are
+            capital invested, positive amounts are proceeds
+
+    Returns:
+        IRR in percent, -100.0 for a total loss, NaN if no rate solves the flows
+    """
+    amounts, dates = pad_cash_flows([cash_flows])
+    return float(xirr_batch(amounts, dates, tol=tol, max_iter=max_iter)['irr'][0])